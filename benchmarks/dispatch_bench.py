@@ -0,0 +1,114 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Loopback throughput from a DispatcherThread reader to the Qt main thread:
+# samples delivered per second and the queued signals it takes.
+#
+#   python benchmarks/dispatch_bench.py [seconds] [domain id]
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dataclasses import dataclass
+from loguru import logger
+from PySide6.QtCore import QCoreApplication, QObject, Qt, QTimer, Slot
+from cyclonedds.core import Policy, Qos
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.idl import IdlStruct
+from cyclonedds.pub import DataWriter
+from cyclonedds.topic import Topic
+
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dispatcher import DispatcherThread
+
+
+@dataclass
+class Msg(IdlStruct, typename="bench::Msg"):
+    id: int
+    value: float
+    text: str
+
+
+class Counter(QObject):
+
+    def __init__(self):
+        super().__init__()
+        self.samples = 0
+        self.signals = 0
+
+    @Slot(str, object)
+    def onData(self, _id, samples):
+        self.samples += len(samples)
+        self.signals += 1
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    domainId = int(sys.argv[2]) if len(sys.argv) > 2 else 37
+    logger.remove()
+
+    app = QCoreApplication([])
+    qos = Qos(Policy.Reliability.BestEffort, Policy.History.KeepLast(1000))
+    counter = Counter()
+    dispatcher = DispatcherThread("bench", domainId, "bench_topic", Msg, (None, None, None, qos), EntityType.READER)
+    dispatcher.onData.connect(counter.onData, Qt.ConnectionType.QueuedConnection)
+    dispatcher.start()
+    while not dispatcher.isSetUpDone():
+        time.sleep(0.01)
+
+    written = [0]
+    stopWriting = threading.Event()
+
+    def publish():
+        participant = DomainParticipant(domainId)
+        writer = DataWriter(participant, Topic(participant, "bench_topic", Msg), qos=qos)
+        time.sleep(1.0) # matched
+        msg = Msg(1, 2.5, "hello world")
+        while not stopWriting.is_set():
+            for _ in range(100):
+                writer.write(msg)
+            written[0] += 100
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+
+    start = []
+
+    def begin():
+        start.extend([time.monotonic(), counter.samples, counter.signals, written[0]])
+
+    def end():
+        (t, samples, signals, writes) = start
+        elapsed = time.monotonic() - t
+        print(f"written {(written[0] - writes) / elapsed:,.0f}/s, delivered {(counter.samples - samples) / elapsed:,.0f} samples/s "
+              f"in {(counter.signals - signals) / elapsed:,.0f} signals/s")
+        stopWriting.set()
+        app.quit()
+
+    QTimer.singleShot(1500, begin)
+    QTimer.singleShot(int(1500 + seconds * 1000), end)
+    app.exec()
+    publisher.join()
+    dispatcher.stop()
+    dispatcher.wait()
+    # after a flood of samples the interpreter may crash while it frees the
+    # dds entities and qt objects on shutdown, leave without that
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
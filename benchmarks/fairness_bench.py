@@ -0,0 +1,110 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Latency of a quiet topic while another topic of the same DispatcherThread
+# is flooded, from the reader timings of the dispatcher.
+#
+#   python benchmarks/fairness_bench.py [quiet samples] [quiet period ms]
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dataclasses import dataclass
+from loguru import logger
+from PySide6.QtCore import QCoreApplication, QEventLoop, Qt, QTimer
+from cyclonedds.core import Policy, Qos
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.idl import IdlStruct
+from cyclonedds.pub import DataWriter
+from cyclonedds.topic import Topic
+
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dispatcher import DispatcherThread
+
+
+DOMAIN_ID = 45
+
+
+@dataclass
+class Msg(IdlStruct, typename="bench::Msg"):
+    id: int
+
+
+def spin(ms: int):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    periodMs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    logger.remove()
+
+    app = QCoreApplication([])
+    qos = Qos(Policy.Reliability.Reliable(1_000_000_000), Policy.History.KeepAll)
+    dispatcher = DispatcherThread("busy", DOMAIN_ID, "Busy", Msg, (None, qos, Qos(), qos), EntityType.READER)
+    received = {"busy": 0, "quiet": 0}
+    timings = {}
+    dispatcher.onData.connect(lambda _id, s: received.__setitem__(_id, received[_id] + len(s)), Qt.ConnectionType.QueuedConnection)
+    dispatcher.onTimings.connect(timings.update, Qt.ConnectionType.QueuedConnection)
+    dispatcher.start()
+    while not dispatcher.isSetUpDone():
+        time.sleep(0.01)
+    dispatcher.addEndpoint("quiet", "Quiet", Msg, (None, qos, Qos(), qos), EntityType.READER)
+
+    participant = DomainParticipant(DOMAIN_ID)
+    busyWriter = DataWriter(participant, Topic(participant, "Busy", Msg), qos=qos)
+    quietWriter = DataWriter(participant, Topic(participant, "Quiet", Msg), qos=qos)
+    spin(1000) # matched
+
+    flooding = threading.Event()
+    flooding.set()
+
+    def flood():
+        i = 0
+        while flooding.is_set():
+            busyWriter.write(Msg(i))
+            i += 1
+
+    flooder = threading.Thread(target=flood)
+    flooder.start()
+    for i in range(samples):
+        quietWriter.write(Msg(i))
+        time.sleep(periodMs / 1000.0)
+        spin(0)
+    flooding.clear()
+    flooder.join()
+    while received["quiet"] < samples:
+        spin(20)
+    spin(1500) # the last timings
+
+    def latency(readerId):
+        return " / ".join(f"{v:.1f}" for v in timings[readerId]["latency"])
+
+    print(f"busy: {received['busy']} samples, latency p50 / p99 / p99.9 {latency('busy')} ms")
+    print(f"quiet: {received['quiet']} samples every {periodMs} ms, latency p50 / p99 / p99.9 {latency('quiet')} ms")
+
+    dispatcher.stop()
+    dispatcher.wait()
+    # after a flood of samples the interpreter may crash while it frees the
+    # dds entities and qt objects on shutdown, leave without that
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Steps per second of the node view force layout and the time until it is
+# stable, for a graph of processes on hosts talking over topics.
+#
+#   python benchmarks/force_layout_bench.py [nodes] [edges per node] [max seconds] [width] [height]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.force_layout import ForceLayout
+
+
+NODES_PER_HOST = 25
+NODE_SIZE = 30.0
+
+
+def makeLayout(nodes: int, edgesPerNode: int, width: float, height: float) -> ForceLayout:
+    rnd = random.Random(1)
+    layout = ForceLayout()
+    layout.setArea(width, height, NODE_SIZE, 1.0)
+    for i in range(nodes):
+        layout.addNode(f"n{i}", f"host{i // NODES_PER_HOST}", rnd.uniform(0, width), rnd.uniform(0, height))
+    # most traffic stays close: a node talks to nodes of its own and of the neighbouring hosts
+    for i in range(nodes):
+        for _ in range(edgesPerNode):
+            j = min(nodes - 1, max(0, i + rnd.randint(-2 * NODES_PER_HOST, 2 * NODES_PER_HOST)))
+            if i != j:
+                layout.addEdge(f"n{i}", f"n{j}")
+    return layout
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    edgesPerNode = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    maxSeconds = float(sys.argv[3]) if len(sys.argv) > 3 else 300.0
+    # the layout area is the size of the node view
+    width = float(sys.argv[4]) if len(sys.argv) > 4 else 1920.0
+    height = float(sys.argv[5]) if len(sys.argv) > 5 else 1080.0
+
+    layout = makeLayout(nodes, edgesPerNode, width, height)
+    print(f"{len(layout)} nodes, {len(layout.edges)} edges")
+
+    steps = 0
+    slowest = 0.0
+    start = time.perf_counter()
+    while not layout.isStable() and time.perf_counter() - start < maxSeconds:
+        t = time.perf_counter()
+        layout.step()
+        slowest = max(slowest, time.perf_counter() - t)
+        steps += 1
+    elapsed = time.perf_counter() - start
+
+    state = "stable" if layout.isStable() else "not stable"
+    print(f"{state} after {steps} steps in {elapsed:.1f} s, {steps / elapsed:.1f} steps/s, slowest step {slowest * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Time and peak memory to parse a large synthetic debug monitor document,
+# json.loads of the whole response against the streaming extractor fed in
+# 64 KiB chunks.
+#
+#   python benchmarks/json_stream_bench.py [endpoints]
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dds_access.debug_monitor import DOCUMENT_SPEC
+from utils.json_stream import JsonStreamExtractor
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def makeEntity(kind: str, p: int, e: int) -> dict:
+    entity = {
+        "guid": f"110f3c4e:{p:x}:1:{e:x}02",
+        "topic": f"topic_{e % 50}",
+        "type": "bench::Msg",
+        "qos": {"reliability": "reliable", "durability": "volatile", "history": {"kind": "keep_last", "depth": 1}},
+        "addresses": [f"udp/10.0.{p % 256}.{e % 256}:7410", "udp/239.255.0.1:7401"]
+    }
+    if kind == "writer":
+        entity.update({"sent_bytes": e * 1000, "rexmit_bytes": e, "ack": {"n_acks_received": e, "n_nacks_received": 0},
+                       "heartbeat": {"seq": e, "n_hb_sent": e}, "whc": {"size": 0, "hwm": 0, "min_seq": 1, "max_seq": e}})
+    else:
+        entity.update({"received_bytes": e * 1000, "proxy_writers": [{"guid": f"0.0.0.{e:x}", "last_seq": e}]})
+    return entity
+
+
+def makeDocument(endpoints: int) -> bytes:
+    participants = []
+    perParticipant = 100
+    for p in range(max(1, endpoints // perParticipant)):
+        participants.append({
+            "guid": f"110f3c4e:{p:x}:1:1c1",
+            "writers": [makeEntity("writer", p, e) for e in range(perParticipant // 2)],
+            "readers": [makeEntity("reader", p, e) for e in range(perParticipant // 2)]
+        })
+    proxies = [{"guid": f"220f3c4e:{p:x}:1:1c1", "addresses": ["udp/10.1.0.1:7410"] * 4} for p in range(endpoints // 100)]
+    return json.dumps({"participants": participants, "proxy_participants": proxies}, indent=1).encode()
+
+
+def measure(label: str, parse, data: bytes):
+    # timed without tracing, the peak is taken from a second run
+    start = time.perf_counter()
+    result = parse(data)
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = parse(data)
+    (retained, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {elapsed:6.2f} s  peak {peak / 1e6:6.1f} MB  result {retained / 1e6:6.1f} MB")
+    return result
+
+
+def loads(data: bytes):
+    return json.loads(data)
+
+
+def stream(data: bytes):
+    extractor = JsonStreamExtractor(DOCUMENT_SPEC)
+    view = memoryview(data)
+    for i in range(0, len(data), CHUNK_SIZE):
+        extractor.feed(view[i:i + CHUNK_SIZE])
+    return extractor.close()
+
+
+def main():
+    endpoints = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = makeDocument(endpoints)
+    print(f"{len(data) / 1e6:.0f} MB document with {endpoints} endpoints")
+    measure("json.loads", loads, data)
+    result = measure("JsonStreamExtractor", stream, data)
+    writers = sum(len(p["writers"]) for p in result["participants"])
+    print(f"extracted {len(result['participants'])} participants, {writers} writers")
+
+
+if __name__ == "__main__":
+    main()
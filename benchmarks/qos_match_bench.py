@@ -0,0 +1,91 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Throughput of the qos matching of one new endpoint against all endpoints
+# of the opposite kind on its topic, in reader/writer pairs per second.
+#
+#   python benchmarks/qos_match_bench.py [endpoints] [distinct qos]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cyclonedds import qos
+from cyclonedds.util import duration
+
+from dds_access.dds_qos import QosProfile, qos_match, qos_match_profiles, qos_match_many
+
+
+class Endpoint:
+    def __init__(self, topic_name, type_name, q):
+        self.topic_name = topic_name
+        self.type_name = type_name
+        self.qos = q
+
+
+def makeQos(variant: int) -> qos.Qos:
+    policies = [
+        qos.Policy.Reliability.Reliable(duration(milliseconds=100)) if variant % 2 else qos.Policy.Reliability.BestEffort,
+        qos.Policy.Durability.TransientLocal if variant % 3 else qos.Policy.Durability.Volatile,
+        qos.Policy.Deadline(duration(milliseconds=10 + variant)),
+        qos.Policy.Ownership.Shared,
+        qos.Policy.Liveliness.Automatic(duration(seconds=1)),
+        qos.Policy.DataRepresentation(use_cdrv0_representation=True, use_xcdrv2_representation=True)
+    ]
+    return qos.Qos(*policies)
+
+
+def measure(label: str, pairs: int, run) -> float:
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        run()
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= 1.0:
+            break
+    rate = pairs * rounds / elapsed
+    print(f"{label:<40} {rate:>14,.0f} pairs/s")
+    return rate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    writers = {f"w{i}": Endpoint("bench_topic", "bench::Msg", makeQos(i % distinct)) for i in range(count)}
+    reader = Endpoint("bench_topic", "bench::Msg", makeQos(1))
+    writerProfiles = {key: QosProfile.from_endpoint(endp) for key, endp in writers.items()}
+    readerProfile = QosProfile.from_endpoint(reader)
+
+    def perPairEndpoints():
+        return {key: m for key, endp in writers.items() if len(m := qos_match(reader, endp)) > 0}
+
+    def perPairProfiles():
+        return {key: m for key, p in writerProfiles.items() if len(m := qos_match_profiles(readerProfile, p)) > 0}
+
+    def many():
+        return qos_match_many(readerProfile, True, writerProfiles)
+
+    assert perPairEndpoints() == perPairProfiles() == many()
+
+    print(f"1 reader against {count} writers with {distinct} distinct qos")
+    before = measure("qos_match per pair (from the qos)", count, perPairEndpoints)
+    measure("qos_match_profiles per pair", count, perPairProfiles)
+    after = measure("qos_match_many", count, many)
+    print(f"speedup {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+# Process CPU time per wakeup of a DispatcherThread with many readers, of
+# which only one receives, one sample per wakeup.
+#
+#   python benchmarks/wakeup_bench.py [readers ...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dataclasses import dataclass
+from loguru import logger
+from PySide6.QtCore import QCoreApplication, QEventLoop, Qt, QTimer
+from cyclonedds.core import Policy, Qos
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.idl import IdlStruct
+from cyclonedds.pub import DataWriter
+from cyclonedds.topic import Topic
+
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dispatcher import DispatcherThread
+
+
+SAMPLES = 1000
+
+
+@dataclass
+class Msg(IdlStruct, typename="bench::Msg"):
+    id: int
+
+
+def spin(ms: int):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def measure(readers: int):
+    domainId = 50 + readers % 50
+    qos = Qos(Policy.Reliability.Reliable(1_000_000_000), Policy.History.KeepAll)
+    dispatcher = DispatcherThread("r0", domainId, "T0", Msg, (None, qos, Qos(), qos), EntityType.READER)
+    received = [0]
+    dispatcher.onData.connect(lambda _id, samples: received.__setitem__(0, received[0] + len(samples)), Qt.ConnectionType.QueuedConnection)
+    dispatcher.start()
+    while not dispatcher.isSetUpDone():
+        time.sleep(0.01)
+    for i in range(1, readers):
+        dispatcher.addEndpoint(f"r{i}", f"T{i}", Msg, (None, qos, Qos(), qos), EntityType.READER)
+
+    participant = DomainParticipant(domainId)
+    writer = DataWriter(participant, Topic(participant, "T0", Msg), qos=qos)
+    spin(1500) # matched
+
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        writer.write(Msg(i))
+        time.sleep(0.001)
+    while received[0] < SAMPLES:
+        spin(5)
+    cpu = time.process_time() - cpu
+    print(f"{readers:>5} readers: {cpu / SAMPLES * 1e6:.0f} us cpu per wakeup, {time.perf_counter() - start:.2f} s")
+
+    dispatcher.stop()
+    dispatcher.wait()
+
+
+def main():
+    logger.remove()
+    app = QCoreApplication([])
+    for readers in [int(arg) for arg in sys.argv[1:]] or [1, 100, 500]:
+        measure(readers)
+    # after a flood of samples the interpreter may crash while it frees the
+    # dds entities and qt objects on shutdown, leave without that
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
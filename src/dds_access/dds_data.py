@@ -23,7 +23,7 @@ import json
 
 from dds_access.builtin_observer import BuiltInObserver
 from dds_access.dds_utils import getDataType
-from dds_access.dds_qos import qos_match, dds_qos_policy_id
+from dds_access.dds_qos import QosProfile, qos_match_many, dds_qos_policy_id
 from dds_access.datatypes.entity_type import EntityType
 from utils.singleton import singleton
 
@@ -33,6 +33,7 @@ class DataEndpoint:
         self.entity_type: EntityType = entity_type
         self.participant = None
         self.mismatches : Dict[str, List[dds_qos_policy_id]]= {}
+        self.qos_profile: QosProfile = QosProfile.from_endpoint(endpoint)
 
     def isReader(self):
         return self.entity_type == EntityType.READER
@@ -97,18 +98,13 @@ class DataTopic:
         if data_endpoint.isReader():
             endpoints_to_check = self.writer_endpoints
 
-        for endpKey in endpoints_to_check.keys():
-            endpoint_to_check = endpoints_to_check[endpKey]
-
-            mismatches: List[dds_qos_policy_id] = []
-            if data_endpoint.isReader():
-                mismatches = qos_match(data_endpoint.endpoint, endpoint_to_check.endpoint)
-            else:
-                mismatches = qos_match(endpoint_to_check.endpoint, data_endpoint.endpoint)
+        profiles = {endpKey: endp.qos_profile for endpKey, endp in endpoints_to_check.items()}
+        found = qos_match_many(data_endpoint.qos_profile, data_endpoint.isReader(), profiles)
 
-            if len(mismatches) > 0:
-                data_endpoint.mismatches[str(endpoint_to_check.endpoint.key)] = mismatches
-                endpoint_to_check.mismatches[str(data_endpoint.endpoint.key)] = mismatches
+        for endpKey, mismatches in found.items():
+            endpoint_to_check = endpoints_to_check[endpKey]
+            data_endpoint.mismatches[str(endpoint_to_check.endpoint.key)] = mismatches
+            endpoint_to_check.mismatches[str(data_endpoint.endpoint.key)] = mismatches
 
     def get_mismatches(self) -> List[str]:
         mism_endp_keys: List[str] = []
@@ -16,84 +16,6 @@ from cyclonedds import qos
 from utils.ordered_enum import OrderedEnum
 
 
-def qos_match(endpoint_reader, endpoint_writer) -> list:
-
-    mismatches = []
-
-    if endpoint_reader.topic_name != endpoint_writer.topic_name:
-        mismatches.append(dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID)
-
-    reliability_rd = to_kind_reliability(endpoint_reader.qos)
-    reliability_wr = to_kind_reliability(endpoint_writer.qos)
-    if reliability_rd and reliability_wr and reliability_rd > reliability_wr:
-        mismatches.append(dds_qos_policy_id.DDS_RELIABILITY_QOS_POLICY_ID)
-
-    durability_rd = to_kind_durability(endpoint_reader.qos)
-    durability_wr = to_kind_durability(endpoint_writer.qos)
-    if durability_rd and durability_wr and durability_rd > durability_wr:
-        mismatches.append(dds_qos_policy_id.DDS_DURABILITY_QOS_POLICY_ID)
-
-    access_scope_rd = to_kind_access_scope(endpoint_reader.qos)
-    access_scope_wr = to_kind_access_scope(endpoint_writer.qos)
-    if access_scope_rd and access_scope_wr and access_scope_rd > access_scope_wr:
-        mismatches.append(dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID)
-
-    coherent_access_rd = to_kind_coherent_access(endpoint_reader.qos)
-    coherent_access_wr = to_kind_coherent_access(endpoint_writer.qos)
-    if coherent_access_rd and coherent_access_wr and coherent_access_rd > coherent_access_wr:
-        mismatches.append(dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID)
-    
-    ordered_access_rd = to_kind_ordered_access(endpoint_reader.qos)
-    ordered_access_wr = to_kind_ordered_access(endpoint_writer.qos)
-    if ordered_access_rd and ordered_access_wr and ordered_access_rd > ordered_access_wr:
-        mismatches.append(dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID)
-
-    deadline_rd = to_kind_deadline(endpoint_reader.qos)
-    deadline_wr = to_kind_deadline(endpoint_writer.qos)
-    if deadline_rd and deadline_wr and deadline_rd < deadline_wr:
-        mismatches.append(dds_qos_policy_id.DDS_DEADLINE_QOS_POLICY_ID)
-
-    lat_duration_rd = to_kind_lat_duration(endpoint_reader.qos)
-    lat_duration_wr = to_kind_lat_duration(endpoint_writer.qos)
-    if lat_duration_rd and lat_duration_wr and lat_duration_rd < lat_duration_wr:
-        mismatches.append(dds_qos_policy_id.DDS_LATENCYBUDGET_QOS_POLICY_ID)
-
-    ownership_rd = to_kind_ownership(endpoint_reader.qos)
-    ownership_wr = to_kind_ownership(endpoint_writer.qos)
-    if ownership_rd and ownership_wr and ownership_rd != ownership_wr:
-        mismatches.append(dds_qos_policy_id.DDS_OWNERSHIP_QOS_POLICY_ID)
-
-    liveliness_rd = to_kind_liveliness(endpoint_reader.qos)
-    liveliness_wr = to_kind_liveliness(endpoint_writer.qos)
-    if liveliness_rd and liveliness_wr and liveliness_rd > liveliness_wr:
-        mismatches.append(dds_qos_policy_id.DDS_LIVELINESS_QOS_POLICY_ID)
-
-    live_duration_rd = to_kind_live_duration(endpoint_reader.qos)
-    live_duration_wr = to_kind_live_duration(endpoint_writer.qos)
-    if live_duration_rd and live_duration_wr and live_duration_rd < live_duration_wr:
-        mismatches.append(dds_qos_policy_id.DDS_LIVELINESS_QOS_POLICY_ID)
-
-    destination_order_rd = to_kind_destination_order(endpoint_reader.qos)
-    destination_order_wr = to_kind_destination_order(endpoint_writer.qos)
-    if destination_order_rd and destination_order_wr and destination_order_rd > destination_order_wr:
-        mismatches.append(dds_qos_policy_id.DDS_DESTINATIONORDER_QOS_POLICY_ID)
-
-    if qos.Policy.DataRepresentation in endpoint_reader.qos and qos.Policy.DataRepresentation in endpoint_writer.qos:
-        if endpoint_writer.qos[qos.Policy.DataRepresentation].use_cdrv0_representation and endpoint_reader.qos[qos.Policy.DataRepresentation].use_cdrv0_representation:
-            pass # ok - both using cdrv0
-        elif endpoint_writer.qos[qos.Policy.DataRepresentation].use_xcdrv2_representation and endpoint_reader.qos[qos.Policy.DataRepresentation].use_xcdrv2_representation:
-            pass # ok - both using xcdrv2
-        else:
-            mismatches.append(dds_qos_policy_id.DDS_DATA_REPRESENTATION_QOS_POLICY_ID)
-
-    if False: # feature_typelib:
-        pass # TODO: finish implementation of xtypes qos check
-    else:
-        if endpoint_reader.type_name != endpoint_writer.type_name:
-            mismatches.append(dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID)
-
-    return mismatches
-
 class dds_durability_kind(OrderedEnum):
     DDS_DURABILITY_VOLATILE = 0
     DDS_DURABILITY_TRANSIENT_LOCAL = 1
@@ -164,6 +86,130 @@ class dds_qos_policy_id(Enum):
     DDS_DATA_REPRESENTATION_QOS_POLICY_ID = 25
 
 
+# Matching relevant qos of an endpoint, computed once at discovery.
+# Each feature is an int where 0 means "not set": kinds are stored as
+# ordered enum value + 1, durations as plain ints.
+class QosProfile:
+
+    __slots__ = ("topic_name", "type_name", "features", "data_representation", "signature")
+
+    DATA_REPRESENTATION_SET = 1
+    DATA_REPRESENTATION_CDRV0 = 2
+    DATA_REPRESENTATION_XCDRV2 = 4
+
+    def __init__(self, topic_name: str, type_name: str, q: qos.Qos):
+        self.topic_name = topic_name
+        self.type_name = type_name
+        self.features = (
+            _enum_feature(to_kind_reliability(q)),
+            _enum_feature(to_kind_durability(q)),
+            _enum_feature(to_kind_access_scope(q)),
+            _int_feature(to_kind_coherent_access(q)),
+            _int_feature(to_kind_ordered_access(q)),
+            _int_feature(to_kind_deadline(q)),
+            _int_feature(to_kind_lat_duration(q)),
+            _enum_feature(to_kind_ownership(q)),
+            _enum_feature(to_kind_liveliness(q)),
+            _int_feature(to_kind_live_duration(q)),
+            _enum_feature(to_kind_destination_order(q))
+        )
+        self.data_representation = 0
+        if qos.Policy.DataRepresentation in q:
+            self.data_representation = self.DATA_REPRESENTATION_SET
+            if q[qos.Policy.DataRepresentation].use_cdrv0_representation:
+                self.data_representation |= self.DATA_REPRESENTATION_CDRV0
+            if q[qos.Policy.DataRepresentation].use_xcdrv2_representation:
+                self.data_representation |= self.DATA_REPRESENTATION_XCDRV2
+        # equal for profiles that match alike, most endpoints of a topic share one
+        self.signature = (topic_name, type_name, self.features, self.data_representation)
+
+    @staticmethod
+    def from_endpoint(endpoint) -> "QosProfile":
+        return QosProfile(endpoint.topic_name, endpoint.type_name, endpoint.qos)
+
+
+def _enum_feature(kind) -> int:
+    return 0 if kind is None else kind.value + 1
+
+def _int_feature(value) -> int:
+    return int(value) if value else 0
+
+# Feature index -> (comparison, policy), the reader mismatches the writer if
+# both are set and "reader <comparison> writer" holds.
+_MISMATCH_GT = 0
+_MISMATCH_LT = 1
+_MISMATCH_NE = 2
+
+_FEATURE_CHECKS = (
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_RELIABILITY_QOS_POLICY_ID),
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_DURABILITY_QOS_POLICY_ID),
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID),
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID),
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_PRESENTATION_QOS_POLICY_ID),
+    (_MISMATCH_LT, dds_qos_policy_id.DDS_DEADLINE_QOS_POLICY_ID),
+    (_MISMATCH_LT, dds_qos_policy_id.DDS_LATENCYBUDGET_QOS_POLICY_ID),
+    (_MISMATCH_NE, dds_qos_policy_id.DDS_OWNERSHIP_QOS_POLICY_ID),
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_LIVELINESS_QOS_POLICY_ID),
+    (_MISMATCH_LT, dds_qos_policy_id.DDS_LIVELINESS_QOS_POLICY_ID),
+    (_MISMATCH_GT, dds_qos_policy_id.DDS_DESTINATIONORDER_QOS_POLICY_ID)
+)
+
+
+def qos_match(endpoint_reader, endpoint_writer) -> list:
+    return qos_match_profiles(QosProfile.from_endpoint(endpoint_reader), QosProfile.from_endpoint(endpoint_writer))
+
+def qos_match_profiles(reader: QosProfile, writer: QosProfile) -> list:
+
+    mismatches = []
+
+    if reader.topic_name != writer.topic_name:
+        mismatches.append(dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID)
+
+    # identical vectors can't violate any of the checks
+    if reader.features != writer.features:
+        for (op, policy_id), rd, wr in zip(_FEATURE_CHECKS, reader.features, writer.features):
+            if rd and wr:
+                if op == _MISMATCH_GT:
+                    if rd > wr:
+                        mismatches.append(policy_id)
+                elif op == _MISMATCH_LT:
+                    if rd < wr:
+                        mismatches.append(policy_id)
+                elif rd != wr:
+                    mismatches.append(policy_id)
+
+    if reader.data_representation and writer.data_representation:
+        common = reader.data_representation & writer.data_representation
+        if not common & (QosProfile.DATA_REPRESENTATION_CDRV0 | QosProfile.DATA_REPRESENTATION_XCDRV2):
+            mismatches.append(dds_qos_policy_id.DDS_DATA_REPRESENTATION_QOS_POLICY_ID)
+
+    if False: # feature_typelib:
+        pass # TODO: finish implementation of xtypes qos check
+    else:
+        if reader.type_name != writer.type_name:
+            mismatches.append(dds_qos_policy_id.DDS_INVALID_QOS_POLICY_ID)
+
+    return mismatches
+
+# Matches one endpoint against many of the opposite kind,
+# returns only the keys with at least one mismatch. Each distinct
+# profile among the others is matched once.
+def qos_match_many(profile: QosProfile, is_reader: bool, others: dict) -> dict:
+    result = {}
+    matched = {}
+    for key, other in others.items():
+        mismatches = matched.get(other.signature)
+        if mismatches is None:
+            if is_reader:
+                mismatches = qos_match_profiles(profile, other)
+            else:
+                mismatches = qos_match_profiles(other, profile)
+            matched[other.signature] = mismatches
+        if len(mismatches) > 0:
+            result[key] = mismatches
+    return result
+
+
 def to_kind_reliability(q: qos.Qos):
     if qos.Policy.Reliability in q:
         if q[qos.Policy.Reliability] == qos.Policy.Reliability.BestEffort:
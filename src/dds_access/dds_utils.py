@@ -10,7 +10,7 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from cyclonedds.builtin import DcpsParticipant
 from cyclonedds import core, dynamic
 from cyclonedds import core
@@ -136,6 +136,16 @@ def getHostname(p: Optional[DcpsParticipant]):
 
     return hostnameRaw
 
+def getDebugMonitorAddress(p: Optional[DcpsParticipant]) -> Optional[Tuple[str, str]]:
+    # "tcp/<ip>:<port>" as announced by cyclonedds
+    dbg_mon_str: str = getProperty(p, DEBUG_MONITORS)
+    splitProtoAdr = dbg_mon_str.split("/")
+    if len(splitProtoAdr) > 1 and splitProtoAdr[0] == "tcp":
+        splitIpPort = splitProtoAdr[1].split(":")
+        if len(splitIpPort) > 1:
+            return (splitIpPort[0], splitIpPort[1])
+    return None
+
 
 def isVendorCycloneDDS(p: Optional[DcpsParticipant]) -> bool:
 
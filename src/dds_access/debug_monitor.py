@@ -0,0 +1,118 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from loguru import logger as logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+import time
+
+from utils.json_stream import JsonStreamExtractor
+
+
+CONNECT_TIMEOUT_SECONDS = 3
+READ_TIMEOUT_SECONDS = 5
+MAX_WORKERS = 32
+MAX_POOLED_HOSTS = 512
+CHUNK_SIZE = 64 * 1024
+
+# The parts of the debug monitor document the consumers use. Everything else
+# (proxy participants, address sets, ...) is skipped while the bytes arrive,
+# a monitor of a process with thousands of endpoints is never fully decoded.
+ENTITY_FIELDS = frozenset(["guid", "topic", "sent_bytes", "rexmit_bytes", "received_bytes", "ack", "heartbeat"])
+DOCUMENT_SPEC = {
+    "participants": [{
+        "guid": True,
+        "writers": [ENTITY_FIELDS],
+        "readers": [ENTITY_FIELDS]
+    }]
+}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    json_data: Optional[dict]
+    latency: float
+    error: Optional[str]
+    size: int = 0
+    timestamp: float = 0.0 # monotonic time the response was complete
+
+
+def debugMonitorUrl(ip: str, port: str) -> str:
+    return "http://" + ip + ":" + port + "/"
+
+
+class DebugMonitorFetcher:
+    # Fetches many debug monitors concurrently over keep-alive connections.
+    # The deadline is applied to the whole cycle, a host which does not answer
+    # in time is reported as failed and does not delay the others.
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DebugMonitor")
+        self.session = requests.Session()
+        # one pooled connection per host, a second one in case a request
+        # of the previous cycle is still running
+        adapter = HTTPAdapter(pool_connections=MAX_POOLED_HOSTS, pool_maxsize=2, max_retries=0)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url: str, deadline: float) -> FetchResult:
+        start = time.monotonic()
+        try:
+            timeout = (min(CONNECT_TIMEOUT_SECONDS, deadline), min(READ_TIMEOUT_SECONDS, deadline))
+            with self.session.get(url, timeout=timeout, verify=False, stream=True) as response:
+                logging.trace(f"Response code: {str(response.status_code)} from {url}")
+                response.raise_for_status()
+                extractor = JsonStreamExtractor(DOCUMENT_SPEC)
+                size = 0
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if time.monotonic() - start > deadline:
+                        raise TimeoutError(f"no complete response within {deadline} seconds")
+                    size += len(chunk)
+                    extractor.feed(chunk)
+                json_data = extractor.close()
+                now = time.monotonic()
+                return FetchResult(url, json_data, now - start, None, size, now)
+        except Exception as e:
+            now = time.monotonic()
+            return FetchResult(url, None, now - start, str(e), 0, now)
+
+    def submit(self, url: str, deadline: float) -> Future:
+        return self.executor.submit(self.fetch, url, deadline)
+
+    def fetchAll(self, urls: List[str], deadline: float) -> Dict[str, FetchResult]:
+        results: Dict[str, FetchResult] = {}
+        if len(urls) == 0:
+            return results
+
+        start = time.monotonic()
+        futures = {self.submit(url, deadline): url for url in urls}
+        done, not_done = wait(futures.keys(), timeout=deadline)
+
+        for future in done:
+            result = future.result()
+            results[result.url] = result
+
+        for future in not_done:
+            future.cancel()
+            url = futures[future]
+            now = time.monotonic()
+            results[url] = FetchResult(url, None, now - start, f"no response within {deadline} seconds", 0, now)
+
+        logging.trace(f"Fetched {len(done)}/{len(urls)} debug monitors in {time.monotonic() - start:.3f} seconds")
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
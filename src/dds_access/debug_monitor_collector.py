@@ -0,0 +1,307 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from PySide6.QtCore import QThread, Signal
+from loguru import logger as logging
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
+from queue import Queue, Empty, Full
+from threading import Lock
+from typing import Dict, Optional, Set
+import random
+import time
+
+from dds_access.debug_monitor import DebugMonitorFetcher, FetchResult
+from utils.singleton import singleton
+
+
+# consecutive failures until an endpoint is backed off
+FAILURE_THRESHOLD = 2
+MAX_BACKOFF_SECONDS = 300
+# a slow or big endpoint is polled less often, but at least once a minute
+MAX_ADAPTIVE_INTERVAL_SECONDS = 60
+# spend at most a quarter of the interval waiting for one endpoint
+LATENCY_FACTOR = 4
+# bytes of monitor document per second of interval
+SIZE_BUDGET_BYTES_PER_SECOND = 1024 * 1024
+LATENCY_SMOOTHING = 0.3
+# how long a cycle waits for its responses, slower ones are picked up later
+CYCLE_WAIT_FRACTION = 0.5
+# endpoints no consumer shows right now are only refreshed this rarely
+BACKGROUND_INTERVAL_SECONDS = 30
+BACKGROUND_INTERVAL_FACTOR = 10
+
+HEALTHY = "healthy"
+FAILING = "failing"
+UNREACHABLE = "unreachable"
+PROBING = "probing"
+
+
+@dataclass
+class DebugMonitorSnapshot:
+    timestamp: float
+    results: Dict[str, FetchResult]
+
+
+@dataclass
+class DebugMonitorConsumer:
+    queue: Queue
+    pollIntervalSeconds: float
+    urls: Set[str] = field(default_factory=set)
+    # urls which contribute to what is displayed, None if all of them do
+    focusUrls: Optional[Set[str]] = None
+    lastDelivery: float = 0.0
+
+    def baseInterval(self, url: str) -> float:
+        if self.focusUrls is None or url in self.focusUrls:
+            return self.pollIntervalSeconds
+        return max(BACKGROUND_INTERVAL_SECONDS, BACKGROUND_INTERVAL_FACTOR * self.pollIntervalSeconds)
+
+
+@dataclass
+class EndpointHealth:
+    state: str = HEALTHY
+    failures: int = 0
+    latency: Optional[float] = None
+    size: int = 0
+    baseInterval: float = 0.0
+    interval: float = 0.0
+    nextFetch: float = 0.0
+    lastResult: Optional[FetchResult] = None
+    lastError: Optional[str] = None
+
+    def fields(self, now: float) -> Dict[str, object]:
+        # plain values, the views format and translate them
+        nextProbe = 0
+        if self.state == UNREACHABLE:
+            # whole seconds, else every cycle would publish a new health
+            nextProbe = int(time.time() + max(0.0, self.nextFetch - now)) * 1000
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "latency": round(self.latency * 1000) if self.latency is not None else -1,
+            "size": self.size,
+            "interval": round(self.interval),
+            "nextProbe": nextProbe, # ms since epoch, 0 if not backed off
+            "error": self.lastError if self.lastError is not None else "",
+        }
+
+
+@singleton
+class DebugMonitorCollector(QThread):
+    # Fetches every debug monitor once per interval and hands the parsed
+    # documents to all consumers (statistics, graph, ...) which need it.
+    # Each consumer does its own aggregation on its own thread.
+    #
+    # Every endpoint has its own health: a slow or big one is polled less
+    # often, one which keeps failing is backed off exponentially and then
+    # probed with a single request. A cycle never waits for the slow ones,
+    # their last good document is handed out until a new one arrives.
+
+    healthChanged = Signal(str, "QVariantMap")
+
+    def __init__(self):
+        super().__init__()
+        self.running = False
+        self.collecting = False # the thread hasn't decided to exit yet
+        self.mutex = Lock()
+        self.consumers: Dict[str, DebugMonitorConsumer] = {}
+        self.health: Dict[str, EndpointHealth] = {}
+        self.published: Dict[str, Dict[str, object]] = {} # url -> last emitted health
+        self.inFlight: Dict[str, Future] = {}
+
+    def addConsumer(self, consumerId: str, pollIntervalSeconds: float) -> Queue:
+        logging.debug(f"Add debug monitor consumer {consumerId}")
+        snapshots = Queue(maxsize=1)
+        with self.mutex:
+            self.consumers[consumerId] = DebugMonitorConsumer(snapshots, pollIntervalSeconds)
+            # a collector which is asked to stop but still collecting just goes on
+            restart = not self.collecting
+            self.running = True
+            self.collecting = True
+
+        if restart:
+            self.wait() # a stopping collector exits after the current fetch
+            self.start()
+
+        return snapshots
+
+    def removeConsumer(self, consumerId: str):
+        logging.debug(f"Remove debug monitor consumer {consumerId}")
+        with self.mutex:
+            if consumerId in self.consumers:
+                del self.consumers[consumerId]
+            if len(self.consumers) == 0:
+                self.running = False
+
+    def setConsumerUrls(self, consumerId: str, urls: Set[str], focusUrls: Optional[Set[str]] = None):
+        with self.mutex:
+            if consumerId not in self.consumers:
+                return
+            consumer = self.consumers[consumerId]
+            consumer.urls = set(urls)
+            previousFocus = consumer.focusUrls
+            consumer.focusUrls = set(focusUrls) if focusUrls is not None else None
+
+            # what just became visible is fetched with the next cycle
+            for url in consumer.urls:
+                wasFocused = previousFocus is None or url in previousFocus
+                isFocused = consumer.focusUrls is None or url in consumer.focusUrls
+                if isFocused and not wasFocused:
+                    if url in self.health and self.health[url].state == HEALTHY:
+                        self.health[url].nextFetch = 0.0
+
+    def setConsumerInterval(self, consumerId: str, pollIntervalSeconds: float):
+        with self.mutex:
+            if consumerId in self.consumers:
+                self.consumers[consumerId].pollIntervalSeconds = pollIntervalSeconds
+
+    def pollIntervalSeconds(self) -> float:
+        with self.mutex:
+            if len(self.consumers) == 0:
+                return 1.0
+            return min([c.pollIntervalSeconds for c in self.consumers.values()])
+
+    def endpointHealth(self, url: str) -> Optional[Dict[str, object]]:
+        with self.mutex:
+            if url not in self.health:
+                return None
+            return self.health[url].fields(time.monotonic())
+
+    def adaptiveInterval(self, health: EndpointHealth, interval: float) -> float:
+        adaptive = max(interval, LATENCY_FACTOR * health.latency, health.size / SIZE_BUDGET_BYTES_PER_SECOND)
+        return max(interval, min(adaptive, MAX_ADAPTIVE_INTERVAL_SECONDS))
+
+    def recordResult(self, health: EndpointHealth, result: FetchResult):
+        interval = health.baseInterval
+        if result.error is None:
+            health.state = HEALTHY
+            health.failures = 0
+            if health.latency is None:
+                health.latency = result.latency
+            else:
+                health.latency += LATENCY_SMOOTHING * (result.latency - health.latency)
+            health.size = result.size
+            health.interval = self.adaptiveInterval(health, interval)
+            health.nextFetch = result.timestamp - result.latency + health.interval
+            health.lastResult = result
+            return
+
+        health.failures += 1
+        health.lastError = result.error
+        health.lastResult = None
+        if health.failures < FAILURE_THRESHOLD:
+            health.state = FAILING
+            health.nextFetch = result.timestamp
+        else:
+            # doubles with every failed probe, with jitter so hosts behind
+            # the same broken link are not probed all at once
+            backoff = min(interval * 2 ** (health.failures - FAILURE_THRESHOLD + 1), MAX_BACKOFF_SECONDS)
+            health.state = UNREACHABLE
+            health.nextFetch = result.timestamp + backoff * random.uniform(0.8, 1.2)
+
+    def collect(self, fetcher: DebugMonitorFetcher, interval: float):
+        with self.mutex:
+            # an endpoint is polled as often as its most interested consumer wants it
+            baseIntervals: Dict[str, float] = {}
+            for consumer in self.consumers.values():
+                for url in consumer.urls:
+                    baseIntervals[url] = min(baseIntervals.get(url, float("inf")), consumer.baseInterval(url))
+            urls = set(baseIntervals.keys())
+
+            for url in [u for u in self.health.keys() if u not in urls]:
+                del self.health[url]
+                self.published.pop(url, None)
+            for url in [u for u in self.inFlight.keys() if u not in urls]:
+                del self.inFlight[url]
+
+            now = time.monotonic()
+            for url in urls:
+                if url not in self.health:
+                    self.health[url] = EndpointHealth(interval=interval)
+                health = self.health[url]
+                health.baseInterval = baseIntervals[url]
+                # small tolerance, cycles don't start exactly one interval apart
+                if url in self.inFlight or now + 0.1 * interval < health.nextFetch:
+                    continue
+                if health.state == UNREACHABLE:
+                    health.state = PROBING
+                self.inFlight[url] = fetcher.submit(url, max(interval, health.interval))
+
+            pending = list(self.inFlight.values())
+
+        if len(pending) > 0:
+            wait(pending, timeout=interval * CYCLE_WAIT_FRACTION)
+
+        changes = []
+        with self.mutex:
+            results: Dict[str, FetchResult] = {}
+            for url in [u for u, future in self.inFlight.items() if future.done()]:
+                future = self.inFlight.pop(url)
+                if future.cancelled():
+                    continue
+                result = future.result()
+                self.recordResult(self.health[url], result)
+                results[url] = result
+
+            now = time.monotonic()
+            for url, health in self.health.items():
+                if url not in results and health.lastResult is not None:
+                    results[url] = health.lastResult # not due or still running
+                published = health.fields(now)
+                if self.published.get(url) != published:
+                    self.published[url] = published
+                    changes.append((url, published))
+
+            snapshot = DebugMonitorSnapshot(now, results)
+            for consumer in self.consumers.values():
+                # small tolerance, the collector interval is the smallest of all consumers
+                if snapshot.timestamp - consumer.lastDelivery < consumer.pollIntervalSeconds * 0.9:
+                    continue
+                consumer.lastDelivery = snapshot.timestamp
+                self.deliver(consumer.queue, snapshot)
+
+        for (url, fields) in changes:
+            self.healthChanged.emit(url, fields)
+
+    def deliver(self, snapshots: Queue, snapshot: DebugMonitorSnapshot):
+        # a consumer which is still busy only gets the latest snapshot
+        try:
+            snapshots.get_nowait()
+        except Empty:
+            pass
+        try:
+            snapshots.put_nowait(snapshot)
+        except Full:
+            pass
+
+    def run(self):
+        logging.debug("Debug monitor collector started")
+        fetcher = DebugMonitorFetcher()
+
+        start_time = 0.0
+        while True:
+            with self.mutex:
+                if not self.running:
+                    self.collecting = False
+                    break
+            interval = self.pollIntervalSeconds()
+            if time.monotonic() - start_time >= interval:
+                start_time = time.monotonic()
+                self.collect(fetcher, interval)
+            else:
+                time.sleep(0.1) # fast exit
+
+        with self.mutex:
+            self.inFlight.clear()
+        fetcher.close()
+        logging.debug("Debug monitor collector stopped")
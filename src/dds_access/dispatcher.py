@@ -11,11 +11,13 @@
 """
 
 from loguru import logger as logging
-import datetime
+import ctypes as ct
+import time
 from PySide6.QtCore import Signal, Slot, QThread
 from cyclonedds import core
 from cyclonedds.util import duration
-from cyclonedds.core import SampleState, ViewState, InstanceState
+from cyclonedds.core import SampleState, ViewState, InstanceState, DDSException
+from cyclonedds.internal import dds_c_t
 from cyclonedds.topic import Topic
 from cyclonedds.sub import Subscriber, DataReader
 from cyclonedds.pub import Publisher, DataWriter
@@ -23,11 +25,56 @@ from dds_access.dds_listener import DdsListener
 from threading import Lock, Event
 from dds_access.domain_participant_factory import DomainParticipantFactory
 from dds_access.datatypes.entity_type import EntityType
+from dds_access.received_sample import ReceivedSample, takeSerialized
+from dds_access.writer_executor import WriterExecutor
+from utils.histogram import ReaderTimings
+
+
+# samples of a reader are delivered together, a batch is sent once it is
+# full or its first sample waited this long
+MAX_BATCH_SIZE = 1000
+MAX_BATCH_AGE_SECONDS = 0.05
+# the timings of the readers which changed are sent this often
+TIMINGS_INTERVAL_SECONDS = 1.0
+# samples taken from a reader before the next triggered reader is served,
+# a reader with more samples left triggers the next wait again
+TAKE_BUDGET = 256
+
+
+def hasAttachArguments(waitset) -> bool:
+    # the attach arguments are only reachable through private members of
+    # the WaitSet of the python binding, which may change with its version
+    return hasattr(waitset, "_waitset_wait") and hasattr(waitset, "_ref") and isinstance(getattr(waitset, "attached", None), list)
+
+
+def attachArgument(waitset, entity):
+    # the value the waitset returns for a triggered entity, the entity
+    # itself without the private members
+    if not hasAttachArguments(waitset):
+        return entity
+    for (attached, value) in waitset.attached:
+        if attached is entity:
+            return ct.addressof(value)
+    return 0
+
+
+def waitTriggered(waitset, timeout, xs):
+    # WaitSet.wait which returns the attach arguments of the triggered
+    # entities instead of their number
+    if not hasAttachArguments(waitset):
+        # the public WaitSet.wait, the read conditions tell if they triggered
+        waitset.wait(timeout)
+        return [entity for entity in waitset.get_entities() if isinstance(entity, core.ReadCondition) and entity.triggered]
+    ret = waitset._waitset_wait(waitset._ref, xs, len(xs), timeout)
+    if ret < 0:
+        raise DDSException(ret, f"Occurred while waiting in {repr(waitset)}")
+    return [xs[i] for i in range(min(ret, len(xs)))]
 
 
 class DispatcherThread(QThread):
 
-    onData = Signal(str, str)
+    onData = Signal(str, object)
+    onTimings = Signal(object)
 
     def __init__(self, id: str, domain_id: int, topic_name: str, topic_type, qos, entityType, parent=None):
         super().__init__(parent)
@@ -35,10 +82,22 @@ class DispatcherThread(QThread):
         self.domain_id = domain_id
         self.domain_participant = None
         self.running = False
-        self.readerData = []
-        self.writerData = {}
+        self.readerData = [] # dispatcher thread only
+        self.readerByAttach = {} # attach argument of the read condition -> readerData entry, see attachArgument
+        self.nextReader = 0 # round robin over the triggered readers
+        self.readerChanges = [] # readers to attach or detach, guarded by mutex
+        self.writerExecutor = WriterExecutor(domain_id)
         self.mutex = Lock()
         self.dpSetUpDone = Event()
+        # readerId -> (time of the first sample, samples)
+        self.batches = {}
+        # (readerId, publication handle) -> writer guid
+        self.writerGuids = {}
+        # readerId -> ReaderTimings
+        self.timings = {}
+        # readerId -> SampleFilter
+        self.filters = {}
+        self.nextTimings = time.monotonic() + TIMINGS_INTERVAL_SECONDS
 
         # initial endpoint
         self.entityType = entityType
@@ -49,64 +108,85 @@ class DispatcherThread(QThread):
 
     @Slot(str, object)
     def write(self, id, data):
-        if id in self.writerData:
-            logging.debug(f"Write {id} {data}")
-            (_, writer, _) = self.writerData[id]
-            writer.write(data)
-            logging.debug("Write ... DONE")
+        self.writerExecutor.write(id, data)
 
     @Slot(str, object)
     def dispose(self, id, data):
-        if id in self.writerData:
-            logging.debug(f"Dispose {id} {data}")
-            (_, writer, _) = self.writerData[id]
-            writer.dispose(data)
-            logging.debug("Dispose ... DONE")
+        self.writerExecutor.dispose(id, data)
 
     @Slot(str, object)
     def unregisterInstance(self, id, data):
-        if id in self.writerData:
-            logging.debug(f"Unregister {id} {data}")
-            (_, writer, _) = self.writerData[id]
-            writer.unregister_instance(data)
-            logging.debug("Unregister ... DONE")
+        self.writerExecutor.unregisterInstance(id, data)
 
     @Slot()
     def deleteAllWriters(self):
-        logging.info(f"Delete all writers")  
-        self.writerData.clear()
+        self.writerExecutor.deleteAllWriters()
 
     def deleteWriter(self, id: str):
-        if id in self.writerData:
-            logging.info(f"Delete writer {id}")
-            del self.writerData[id]
+        self.writerExecutor.deleteWriter(id)
 
     @Slot()
     def deleteAllReaders(self):
-        logging.info(f"Delete all readers")
-        self.guardCondition.set(True)
-        for id, tp, sub, rd, readCondition in self.readerData:
-            logging.info(f"Delete reader {id} ({tp.name})")
-            self.waitset.detach(readCondition)
-            del rd
-            del sub
-            del tp
-        self.readerData.clear()
-        self.guardCondition.set(False)
+        self.changeReaders(("deleteAll", None))
 
     @Slot(str)
     def deleteReader(self, _id: str):
-        for i, (readerId, tp, sub, rd, readCondition) in enumerate(self.readerData):
-            if readerId == _id:
-                logging.info(f"Delete reader {_id} ({tp.name})")
-                self.guardCondition.set(True)
-                self.waitset.detach(readCondition)
-                del rd
-                del sub
-                del tp
-                del self.readerData[i]
-                self.guardCondition.set(False)
-                break
+        self.changeReaders(("delete", _id))
+
+    def setReaderFilter(self, _id: str, sampleFilter):
+        # samples not matching the filter are dropped right after the take,
+        # None removes the filter
+        self.changeReaders(("filter", (_id, sampleFilter)))
+
+    def changeReaders(self, change):
+        # the readers are attached and detached by the dispatcher thread
+        # between two waits, the guard condition wakes it up
+        with self.mutex:
+            self.readerChanges.append(change)
+            self.guardCondition.set(True)
+
+    def applyReaderChanges(self):
+        with self.mutex:
+            changes = self.readerChanges
+            self.readerChanges = []
+            self.guardCondition.set(False)
+
+        for (kind, change) in changes:
+            if kind == "add":
+                (_, _, _, _, readCondition) = change
+                self.waitset.attach(readCondition)
+                self.readerData.append(change)
+                self.readerByAttach[attachArgument(self.waitset, readCondition)] = change
+            elif kind == "delete":
+                for i, (readerId, tp, sub, rd, readCondition) in enumerate(self.readerData):
+                    if readerId == change:
+                        logging.info(f"Delete reader {change} ({tp.name})")
+                        self.readerByAttach.pop(attachArgument(self.waitset, readCondition), None)
+                        self.waitset.detach(readCondition)
+                        del self.readerData[i]
+                        self.writerGuids = {k: v for (k, v) in self.writerGuids.items() if k[0] != change}
+                        self.timings.pop(change, None)
+                        self.filters.pop(change, None)
+                        break
+            elif kind == "deleteAll":
+                logging.info(f"Delete all readers")
+                for id, tp, sub, rd, readCondition in self.readerData:
+                    logging.info(f"Delete reader {id} ({tp.name})")
+                    self.waitset.detach(readCondition)
+                self.readerData.clear()
+                self.readerByAttach.clear()
+                self.writerGuids.clear()
+                self.timings.clear()
+                self.filters.clear()
+            elif kind == "filter":
+                (_id, sampleFilter) = change
+                if sampleFilter is None:
+                    self.filters.pop(_id, None)
+                elif any(readerId == _id for (readerId, _, _, _, _) in self.readerData):
+                    logging.info(f"Filter reader {_id}: {sampleFilter.text}")
+                    self.filters[_id] = sampleFilter
+                if _id in self.timings:
+                    self.timings[_id].changed = True
 
     @Slot()
     def addEndpoint(self, id: str, topic_name: str, topic_type, qos, entity_type: EntityType):
@@ -119,15 +199,12 @@ class DispatcherThread(QThread):
                 subscriber = Subscriber(self.domain_participant, qos=pubSubQos, listener=self.listener)
                 reader = DataReader(subscriber, topic, qos=endpQos, listener=self.listener)
                 readCondition = core.ReadCondition(reader, SampleState.Any | ViewState.Any | InstanceState.Any)
-                self.guardCondition.set(True)
-                self.waitset.attach(readCondition)
-                self.guardCondition.set(False)
-                self.readerData.append((id, topic, subscriber, reader, readCondition))
+                self.changeReaders(("add", (id, topic, subscriber, reader, readCondition)))
 
             elif entity_type == EntityType.WRITER:
                 publisher = Publisher(self.domain_participant, qos=pubSubQos, listener=self.listener)
                 writer = DataWriter(publisher, topic, qos=endpQos, listener=self.listener)
-                self.writerData[id] = (publisher, writer, topic_name)
+                self.writerExecutor.addWriter(id, publisher, writer, topic_name)
 
             logging.info(f"Add endpoint {topic_name} ... Success")
 
@@ -143,33 +220,127 @@ class DispatcherThread(QThread):
             self.waitset = core.WaitSet(self.domain_participant)
             self.guardCondition = core.GuardCondition(self.domain_participant)
             self.waitset.attach(self.guardCondition)
+            self.writerExecutor.start()
             logging.info(f"Worker thread is set up domain({str(self.domain_id)})")
 
             self.addEndpoint(self.id, self.topic_name, self.topic_type, self.qos, self.entityType)
 
             self.dpSetUpDone.set()
 
+            xs = (dds_c_t.attach * 1)()
             while self.running:
-                amount_triggered = 0
+                attached = len(self.waitset.get_entities())
+                if len(xs) < attached:
+                    xs = (dds_c_t.attach * attached)()
+                triggered = []
                 try:
-                    amount_triggered = self.waitset.wait(duration(infinite=True))
+                    triggered = waitTriggered(self.waitset, self.waitTimeout(), xs)
                 except:
                     pass
-                if amount_triggered == 0:
-                    continue
 
-                for (_id, _, _, readItem, condItem) in self.readerData:
-                    for sample in readItem.take(condition=condItem):
-                        logging.trace(f"Received sample: {str(sample)}")
-                        self.onData.emit(_id, f"[{str(datetime.datetime.now().isoformat())}]  -  {str(sample)}")
+                self.applyReaderChanges()
+                # only the readers whose condition triggered are served, each
+                # up to its budget, starting with a different one each time
+                ready = [self.readerByAttach[x] for x in triggered if x in self.readerByAttach]
+                if len(ready) > 0:
+                    first = self.nextReader % len(ready)
+                    self.nextReader += 1
+                    for entry in ready[first:] + ready[:first]:
+                        self.takeSamples(*entry)
+
+                    # clean up references to last items
+                    ready = None
+                    entry = None
 
-                # clean up references to last items
-                _id = None
-                readItem = None
-                condItem = None
+                self.sendBatches(time.monotonic() - MAX_BATCH_AGE_SECONDS)
+                if time.monotonic() >= self.nextTimings:
+                    self.sendTimings()
 
+            self.sendBatches(None)
+            self.writerExecutor.stop()
+            self.writerExecutor.wait()
+            self.readerData.clear()
+            self.readerByAttach.clear()
             logging.info(f"Worker thread for domain({str(self.domain_id)}) ... DONE")
 
+    def takeSamples(self, _id: str, topic, subscriber, readItem, condItem):
+        # samples stay serialized, they are only decoded by a filter and
+        # when shown
+        now = time.time()
+        dataType = topic.data_type
+        timings = self.timings.get(_id)
+        if timings is None:
+            timings = ReaderTimings()
+            self.timings[_id] = timings
+        sampleFilter = self.filters.get(_id)
+        for (data, info) in takeSerialized(condItem, TAKE_BUDGET):
+            writerGuid = self.writerGuids.get((_id, info.publication_handle))
+            if writerGuid is None:
+                writerGuid = self.lookupWriterGuid(_id, readItem, info.publication_handle)
+            sourceTimestamp = info.source_timestamp / 1e9
+            timings.record(now, sourceTimestamp, writerGuid)
+            if sampleFilter is not None and not sampleFilter.matches(dataType, data, info.valid_data):
+                continue
+            sample = ReceivedSample(_id, now, dataType, data, None if info.valid_data else info,
+                                    sourceTimestamp, writerGuid)
+            logging.opt(lazy=True).trace("Received sample: {}", sample.format)
+            self.addToBatch(_id, sample)
+
+    def lookupWriterGuid(self, readerId: str, reader, handle: int) -> str:
+        try:
+            endpoint = reader.get_matched_publication_data(handle)
+        except Exception:
+            endpoint = None
+        self.writerGuids[(readerId, handle)] = "" if endpoint is None else str(endpoint.key)
+        return self.writerGuids[(readerId, handle)]
+
+    def addToBatch(self, readerId: str, sample: ReceivedSample):
+        if readerId not in self.batches:
+            self.batches[readerId] = (time.monotonic(), [])
+        (_, samples) = self.batches[readerId]
+        samples.append(sample)
+        if len(samples) >= MAX_BATCH_SIZE:
+            del self.batches[readerId]
+            self.onData.emit(readerId, samples)
+
+    def sendBatches(self, startedBefore):
+        # sends the batches started before the given time, all if None
+        for readerId in list(self.batches.keys()):
+            (started, samples) = self.batches[readerId]
+            if startedBefore is None or started <= startedBefore:
+                del self.batches[readerId]
+                self.onData.emit(readerId, samples)
+
+    def sendTimings(self):
+        # percentiles of the readers which received samples or lost some
+        # since the last time
+        self.nextTimings = time.monotonic() + TIMINGS_INTERVAL_SECONDS
+        for (_id, _, _, readItem, _) in self.readerData:
+            if _id in self.timings:
+                try:
+                    self.timings[_id].setLost(readItem.get_sample_lost_status().total_count,
+                                              readItem.get_sample_rejected_status().total_count)
+                except Exception:
+                    pass
+        summaries = {}
+        for (_id, timings) in list(self.timings.items()):
+            if timings.changed:
+                summaries[_id] = timings.summary()
+                sampleFilter = self.filters.get(_id)
+                summaries[_id]["filtered"] = sampleFilter is not None
+                summaries[_id]["dropped"] = 0 if sampleFilter is None else sampleFilter.dropped
+                summaries[_id]["filterErrors"] = 0 if sampleFilter is None else sampleFilter.errors
+        if len(summaries) > 0:
+            self.onTimings.emit(summaries)
+
+    def waitTimeout(self):
+        deadlines = [started + MAX_BATCH_AGE_SECONDS for (started, _) in self.batches.values()]
+        if len(self.timings) > 0:
+            deadlines.append(self.nextTimings)
+        if len(deadlines) == 0:
+            return duration(infinite=True)
+        return duration(seconds=max(0.0, min(deadlines) - time.monotonic()))
+
     def stop(self):
         logging.info(f"Request to stop worker thread for domain({str(self.domain_id)})")
         self.running = False
@@ -0,0 +1,78 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from typing import Any, NamedTuple, Optional, Tuple
+import datetime
+import struct
+
+from cyclonedds.core import DDSException
+from cyclonedds.internal import SampleInfo
+from cyclonedds.sub import InvalidSample
+from cyclonedds._clayer import ddspy_take, ddspy_write
+
+
+# the SampleInfo of an invalid sample as it is stored ahead of its key:
+# sample, view and instance state, valid data, source timestamp, instance
+# and publication handle, disposed and no writers generation count, sample,
+# generation and absolute generation rank
+INVALID_SAMPLE_INFO = struct.Struct("<III?qQQIIiii")
+
+
+class ReceivedSample(NamedTuple):
+    # A sample as it came from the reader, it is only decoded and formatted
+    # when it is shown or exported.
+    readerId: str
+    timestamp: float # reception, seconds since the epoch
+    dataType: Any
+    data: bytes # serialized sample, the serialized key of an invalid sample
+    info: Optional[Any] = None # SampleInfo, only kept for invalid samples
+    sourceTimestamp: float = 0.0 # seconds since the epoch
+    writerGuid: str = ""
+
+    def decode(self):
+        if self.info is None:
+            return self.dataType.deserialize(self.data)
+        return InvalidSample(self.dataType.deserialize_key(self.data), self.info)
+
+    def format(self) -> str:
+        return f"[{datetime.datetime.fromtimestamp(self.timestamp).isoformat()}]  -  {str(self.decode())}"
+
+
+def packInvalidSample(data: bytes, info: SampleInfo) -> bytes:
+    return INVALID_SAMPLE_INFO.pack(
+        info.sample_state, info.view_state, info.instance_state, info.valid_data, info.source_timestamp,
+        info.instance_handle, info.publication_handle, info.disposed_generation_count,
+        info.no_writers_generation_count, info.sample_rank, info.generation_rank,
+        info.absolute_generation_rank) + data
+
+
+def unpackInvalidSample(payload: bytes) -> Tuple[bytes, SampleInfo]:
+    # (serialized key, SampleInfo), raises ValueError if the payload is too short
+    if len(payload) < INVALID_SAMPLE_INFO.size:
+        raise ValueError("Invalid sample without sample info")
+    info = SampleInfo(*INVALID_SAMPLE_INFO.unpack_from(payload, 0))
+    return (bytes(payload[INVALID_SAMPLE_INFO.size:]), info)
+
+
+def takeSerialized(readCondition, n: int):
+    # DataReader.take without decoding, returns (data, SampleInfo) pairs
+    ret = ddspy_take(readCondition.reader._ref, readCondition.mask, n)
+    if type(ret) == int:
+        raise DDSException(ret, f"Occurred while taking data in {repr(readCondition.reader)}")
+    return ret
+
+
+def writeSerialized(writer, data: bytes):
+    # DataWriter.write of a sample which is serialized already
+    ret = ddspy_write(writer._ref, data.ljust((len(data) + 3) & ~3, b"\0"))
+    if ret < 0:
+        raise DDSException(ret, f"Occurred while writing data in {repr(writer)}")
@@ -0,0 +1,187 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from loguru import logger as logging
+from PySide6.QtCore import Signal, QThread
+from collections import deque
+from threading import Lock, Event
+import time
+
+from utils.histogram import Histogram
+
+
+# the queue statistics are sent this often while they change
+STATS_INTERVAL_SECONDS = 1.0
+# writes, disposes and unregisters beyond this are dropped
+MAX_PENDING = 10000
+
+WRITE = 0
+DISPOSE = 1
+UNREGISTER = 2
+ADD_WRITER = 3
+DELETE_WRITER = 4
+DELETE_ALL_WRITERS = 5
+
+
+class WriterExecutor(QThread):
+    # Executes the writes, disposes and unregisters of a domain in the
+    # order they were queued, on a thread of its own, so that they neither
+    # wait for the readers of the domain nor block them. The writers are
+    # added and deleted through the queue as well, a write queued before a
+    # delete still goes out. Writes, disposes and unregisters are dropped
+    # while MAX_PENDING of them wait, and counted.
+
+    onStats = Signal(int, object)
+
+    def __init__(self, domainId: int, parent=None):
+        super().__init__(parent)
+        self.domainId = domainId
+        self.running = False
+        self.mutex = Lock()
+        self.wakeup = Event()
+        self.pending = deque() # (operation, writer id, data, time queued)
+        self.writerIds = set() # writers added or about to be
+        self.writers = {} # writer id -> (publisher, writer, topic name), executor thread only
+
+        self.maxDepth = 0
+        self.executed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.overflowing = False
+        self.queued = Histogram() # microseconds from queued to executed
+        self.changed = False
+
+    def enqueue(self, operation: int, id: str, data=None):
+        with self.mutex:
+            if operation == ADD_WRITER:
+                self.writerIds.add(id)
+            elif operation == DELETE_WRITER:
+                self.writerIds.discard(id)
+            elif operation == DELETE_ALL_WRITERS:
+                self.writerIds.clear()
+            elif id not in self.writerIds:
+                return False
+            elif len(self.pending) >= MAX_PENDING:
+                if not self.overflowing:
+                    logging.warning(f"Write queue of domain({self.domainId}) is full, dropping writes")
+                    self.overflowing = True
+                self.dropped += 1
+                self.changed = True
+                return False
+            self.overflowing = False
+            self.pending.append((operation, id, data, time.monotonic()))
+            if len(self.pending) > self.maxDepth:
+                self.maxDepth = len(self.pending)
+        self.wakeup.set()
+        return True
+
+    def addWriter(self, id: str, publisher, writer, topicName: str):
+        self.enqueue(ADD_WRITER, id, (publisher, writer, topicName))
+
+    def deleteWriter(self, id: str):
+        self.enqueue(DELETE_WRITER, id)
+
+    def deleteAllWriters(self):
+        self.enqueue(DELETE_ALL_WRITERS, "")
+
+    def write(self, id: str, data) -> bool:
+        return self.enqueue(WRITE, id, data)
+
+    def dispose(self, id: str, data) -> bool:
+        return self.enqueue(DISPOSE, id, data)
+
+    def unregisterInstance(self, id: str, data) -> bool:
+        return self.enqueue(UNREGISTER, id, data)
+
+    def depth(self) -> int:
+        return len(self.pending)
+
+    def stats(self) -> dict:
+        (p50, p99, p999) = self.queued.percentiles((50.0, 99.0, 99.9))
+        self.changed = False
+        return {
+            "depth": len(self.pending),
+            "maxDepth": self.maxDepth,
+            "executed": self.executed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queued": [-1.0 if v is None else v / 1000.0 for v in (p50, p99, p999)]
+        }
+
+    def start(self):
+        # set before the thread runs, a stop() right after start() isn't undone
+        self.running = True
+        super().start()
+
+    def run(self):
+        logging.info(f"Writer executor for domain({self.domainId}) ...")
+        nextStats = time.monotonic() + STATS_INTERVAL_SECONDS
+        while True:
+            with self.mutex:
+                item = self.pending.popleft() if len(self.pending) > 0 else None
+                if item is None:
+                    self.wakeup.clear()
+
+            if item is not None:
+                self.execute(*item)
+            elif not self.running:
+                break
+
+            if time.monotonic() >= nextStats:
+                nextStats = time.monotonic() + STATS_INTERVAL_SECONDS
+                if self.changed:
+                    self.onStats.emit(self.domainId, self.stats())
+
+            if item is None:
+                self.wakeup.wait(0.1) # fast exit
+
+        self.writers.clear()
+        logging.info(f"Writer executor for domain({self.domainId}) ... DONE")
+
+    def execute(self, operation: int, id: str, data, queuedAt: float):
+        if operation == ADD_WRITER:
+            self.writers[id] = data
+            return
+        if operation == DELETE_WRITER:
+            if id in self.writers:
+                logging.info(f"Delete writer {id}")
+                del self.writers[id]
+            return
+        if operation == DELETE_ALL_WRITERS:
+            logging.info(f"Delete all writers")
+            self.writers.clear()
+            return
+
+        if id not in self.writers:
+            return
+        (_, writer, _) = self.writers[id]
+        self.queued.record(int((time.monotonic() - queuedAt) * 1e6))
+        self.changed = True
+        try:
+            if operation == WRITE:
+                logging.debug(f"Write {id} {data}")
+                writer.write(data)
+            elif operation == DISPOSE:
+                logging.debug(f"Dispose {id} {data}")
+                writer.dispose(data)
+            elif operation == UNREGISTER:
+                logging.debug(f"Unregister {id} {data}")
+                writer.unregister_instance(data)
+            self.executed += 1
+        except Exception as e:
+            self.failed += 1
+            logging.error(f"Error writing {id}: {e}")
+
+    def stop(self):
+        # the queued operations are executed before the thread ends
+        self.running = False
+        self.wakeup.set()
@@ -54,7 +54,7 @@ from models.datamodel_model.datamodel_proxy_model import DatamodelProxyModel
 from models.tester_model import TesterModel
 from models.listener.listener_model import ListenerModel
 from models.listener.listener_proxy_model import ListenerProxyModel
-from models.listener.receiver_model import ReceiverModel
+from models.listener.receiver_model import ReceiverModel, DEFAULT_CAPACITY
 from models.listener.receiver_proxy_model import ReceiverProxyModel
 from models.shapes_demo_model import ShapesDemoModel
 from models.graph_model import GraphModel
@@ -66,6 +66,10 @@ from utils.qml_utils import QmlUtils
 from version import CYCLONEDDS_INSIGHT_VERSION
 from module_handler import DataModelHandler
 from models.statistics_model import StatisticsModel, StatisticsUnitModel
+from models.metrics_exporter import MetricsExporter
+from models.alert_model import AlertModel
+from models.recording_model import RecordingModel
+from utils.alert_engine import loadRules
 from models.updater_model import UpdaterModel
 from models.language_model import LanguageModel
 from models.config_editor_model.xsd_schema import parse_xsd_schema
@@ -88,6 +92,10 @@ if __name__ == "__main__":
     # Setup the logger
     parser = argparse.ArgumentParser(description="CycloneDDS Insight")
     parser.add_argument("--loglevel", type=str, help="Set logging level (TRACE, DEBUG, INFO, WARNING, ERROR, CRITICAL)", default="INFO")
+    parser.add_argument("--metrics-port", type=int, help="Serve statistics in OpenMetrics format on http://127.0.0.1:<port>/metrics (disabled if 0)", default=0)
+    parser.add_argument("--alert-rules", type=str, help="JSON file with alert rules evaluated on statistics and discovery", default="")
+    parser.add_argument("--listener-buffer", type=int, help="Number of received samples the listener keeps in memory", default=DEFAULT_CAPACITY)
+    parser.add_argument("--listener-spill-dir", type=str, help="Directory to move samples to which don't fit into the listener buffer (dropped if empty)", default="")
     args = parser.parse_args()
     loglevel = args.loglevel.upper()
     loggerConfig = LoggerConfig()
@@ -127,25 +135,40 @@ if __name__ == "__main__":
     datamodelRepoModelProxy = DatamodelProxyModel()
     datamodelRepoModelProxy.setSourceModel(datamodelRepoModel)
 
-    receiverModel = ReceiverModel()
-    datamodelRepoModel.newDataArrived.connect(receiverModel.addReceivedMsg, Qt.QueuedConnection)
+    receiverModel = ReceiverModel(args.listener_buffer, args.listener_spill_dir)
+    datamodelRepoModel.newDataArrived.connect(receiverModel.addReceivedMsgs, Qt.QueuedConnection)
     receiverProxyModel = ReceiverProxyModel()
     receiverProxyModel.setSourceModel(receiverModel)
 
+    recordingModel = RecordingModel()
+    datamodelRepoModel.newDataArrived.connect(recordingModel.addReceivedMsgs, Qt.QueuedConnection)
+    recordingModel.replayData.connect(receiverModel.addReceivedMsgs)
+
     listenerModel = ListenerModel(threads)
     datamodelRepoModel.newReaderSignal.connect(listenerModel.addReader)
+    datamodelRepoModel.newTimingsArrived.connect(listenerModel.setTimings)
+    datamodelRepoModel.newReaderSignal.connect(recordingModel.addReader)
     listenerModel.createEndpointSignal.connect(datamodelRepoModel.createEndpointFromTester)
     listenerProxyModel = ListenerProxyModel()
     listenerProxyModel.setSourceModel(listenerModel)
 
     testerModel = TesterModel(threads, dataModelHandler, datamodelRepoModel)
     datamodelRepoModel.newWriterSignal.connect(testerModel.addWriter)
+    datamodelRepoModel.newWriterStatsArrived.connect(testerModel.setWriterStats)
     participantRootItem = ParticipantTreeNode("Root")
     participantModel = ParticipantTreeModel(participantRootItem)
     shapesDemoModel = ShapesDemoModel()
 
     updaterModel = UpdaterModel(build_info_helper.getBuildPipelineId(), build_info_helper.getBuildId(), build_info_helper.getBuildInfoGitBranch())
 
+    alertRules = []
+    if args.alert_rules:
+        try:
+            alertRules = loadRules(args.alert_rules)
+        except Exception as e:
+            logging.error(f"Failed to load alert rules from {args.alert_rules}: {e}")
+    alertModel = AlertModel(alertRules)
+
     qmlUtils = QmlUtils()
     app.aboutToQuit.connect(qmlUtils.aboutToQuit)
 
@@ -167,10 +190,12 @@ if __name__ == "__main__":
     engine.rootContext().setContextProperty("listenerProxyModel", listenerProxyModel)
     engine.rootContext().setContextProperty("receiverModel", receiverModel)
     engine.rootContext().setContextProperty("receiverProxyModel", receiverProxyModel)
+    engine.rootContext().setContextProperty("recordingModel", recordingModel)
     engine.rootContext().setContextProperty("updaterModel", updaterModel)
     engine.rootContext().setContextProperty("shapesDemoModel", shapesDemoModel)
     engine.rootContext().setContextProperty("langModel", langModel)
     engine.rootContext().setContextProperty("qmlUtils", qmlUtils)
+    engine.rootContext().setContextProperty("alertModel", alertModel)
     engine.rootContext().setContextProperty("loggerConfig", loggerConfig)
     engine.rootContext().setContextProperty("CYCLONEDDS_URI", os.getenv("CYCLONEDDS_URI", "<not set>"))
     engine.rootContext().setContextProperty("CYCLONEDDS_INSIGHT_VERSION", CYCLONEDDS_INSIGHT_VERSION)
@@ -217,6 +242,13 @@ if __name__ == "__main__":
 
     domainIds.sort()
 
+    metricsExporter = None
+    if args.metrics_port > 0:
+        metricsExporter = MetricsExporter(args.metrics_port)
+        metricsExporter.start()
+
+    alertModel.start()
+
     # Add domains
     for domainId in domainIds:
         data.add_domain(domainId)
@@ -226,10 +258,17 @@ if __name__ == "__main__":
     logging.info("qt ... DONE")
 
     logging.info("Clean up ...")
+    if metricsExporter:
+        logging.debug("Shutdown metrics exporter ...")
+        metricsExporter.stop()
+    logging.debug("Shutdown alerts ...")
+    alertModel.stop()
     logging.debug("Shutdown shapes demo ...")
     shapesDemoModel.stop()
     logging.debug("Shutdown data model ...")
     datamodelRepoModel.shutdownEndpoints()
+    recordingModel.shutdown()
+    receiverModel.shutdown()
     logging.debug("Shutdown data ...")
     data.join_observer()
     logging.debug("Shutdown worker thread ...")
@@ -0,0 +1,157 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, Signal, Slot, QTimer
+from loguru import logger as logging
+from threading import Lock
+from typing import List
+import datetime
+import time
+
+from models.discovery_counts import DiscoveryCounts
+from models.statistics_model import PollingThread
+from utils.alert_engine import AlertEngine, AlertEvent, AlertRule, FIRING
+
+
+MAX_ALERTS = 500
+# discovery counts hold until they change, "<" and "drop" rules are
+# evaluated against the held counts this often
+DISCOVERY_INTERVAL_MS = 1000
+
+
+class AlertModel(QAbstractListModel):
+    # Notification list of the alert rules, newest first.
+
+    newAlerts = Signal(object)
+    suppressedChanged = Signal(int)
+
+    TimeRole = Qt.UserRole + 1
+    RuleRole = Qt.UserRole + 2
+    SeriesRole = Qt.UserRole + 3
+    StateRole = Qt.UserRole + 4
+    ValueRole = Qt.UserRole + 5
+
+    def __init__(self, rules: List[AlertRule], parent=None):
+        super().__init__(parent)
+        self.alerts: List[AlertEvent] = []
+        self.engine = AlertEngine(rules)
+        self.engineMutex = Lock()
+        self.suppressed = 0
+
+        self.newAlerts.connect(self.addAlerts, Qt.ConnectionType.QueuedConnection)
+
+        self.pollingThread = PollingThread()
+
+        self.discovery = DiscoveryCounts()
+        self.discovery.countsChanged.connect(self.onDiscoveryCounts)
+        self.discoveryTimer = QTimer(self)
+        self.discoveryTimer.setInterval(DISCOVERY_INTERVAL_MS)
+        self.discoveryTimer.timeout.connect(self.evaluateDiscovery)
+
+    def roleNames(self):
+        return {
+            self.TimeRole: b'time',
+            self.RuleRole: b'rule',
+            self.SeriesRole: b'series',
+            self.StateRole: b'state',
+            self.ValueRole: b'value'
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.alerts)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.alerts):
+            return None
+        alert = self.alerts[index.row()]
+        if role == self.TimeRole:
+            return datetime.datetime.fromtimestamp(alert.timestamp).strftime("%H:%M:%S")
+        elif role == self.RuleRole:
+            return alert.rule
+        elif role == self.SeriesRole:
+            return alert.series
+        elif role == self.StateRole:
+            return alert.state
+        elif role == self.ValueRole:
+            return f"{alert.value:.6g}"
+        return None
+
+    @Slot(result=int)
+    def getRuleCount(self):
+        return len(self.engine.rules)
+
+    def start(self):
+        if len(self.engine.rules) == 0:
+            return
+        logging.info(f"Evaluate {len(self.engine.rules)} alert rules")
+        if len(self.engine.statisticRules) > 0:
+            self.pollingThread.onTable.connect(self.onStatisticTable, Qt.ConnectionType.DirectConnection)
+            self.pollingThread.acquire("alerts")
+        if len(self.engine.discoveryRules) > 0:
+            self.discoveryTimer.start()
+        self.discovery.start()
+
+    def stop(self):
+        self.discoveryTimer.stop()
+        if "alerts" in self.pollingThread.users:
+            self.pollingThread.onTable.disconnect(self.onStatisticTable)
+            self.pollingThread.release("alerts")
+
+    def onStatisticTable(self, rows):
+        # called on the polling thread
+        with self.engineMutex:
+            events = self.engine.evaluateRows(rows, time.monotonic())
+            suppressed = self.engine.suppressed
+        if len(events) > 0 or suppressed != self.suppressed:
+            self.newAlerts.emit(events)
+
+    @Slot(object)
+    def onDiscoveryCounts(self, counts):
+        if len(self.engine.discoveryRules) == 0:
+            return
+        with self.engineMutex:
+            events = self.engine.evaluateDiscovery(counts, time.monotonic())
+        self.addAlerts(events)
+
+    @Slot()
+    def evaluateDiscovery(self):
+        self.onDiscoveryCounts(self.discovery.counts)
+
+    @Slot(object)
+    def addAlerts(self, events: List[AlertEvent]):
+        for event in events:
+            if event.state == FIRING:
+                logging.warning(f"Alert {event.rule} firing: {event.series} value {event.value:.6g}")
+            else:
+                logging.info(f"Alert {event.rule} resolved: {event.series}")
+
+        if len(events) > 0:
+            self.beginInsertRows(QModelIndex(), 0, len(events) - 1)
+            self.alerts[0:0] = reversed(events)
+            self.endInsertRows()
+
+        if len(self.alerts) > MAX_ALERTS:
+            self.beginRemoveRows(QModelIndex(), MAX_ALERTS, len(self.alerts) - 1)
+            del self.alerts[MAX_ALERTS:]
+            self.endRemoveRows()
+
+        with self.engineMutex:
+            suppressed = self.engine.suppressed
+        if suppressed != self.suppressed:
+            self.suppressed = suppressed
+            self.suppressedChanged.emit(suppressed)
+
+    @Slot()
+    def clear(self):
+        self.beginResetModel()
+        self.alerts.clear()
+        self.endResetModel()
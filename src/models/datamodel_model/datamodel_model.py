@@ -35,7 +35,9 @@ class DatamodelModel(QAbstractListModel):
 
     NameRole = Qt.UserRole + 1
 
-    newDataArrived = Signal(str, str)
+    newDataArrived = Signal(str, object)
+    newTimingsArrived = Signal(object)
+    newWriterStatsArrived = Signal(int, object)
     isLoadingSignal = Signal(bool)
     requestDataType = Signal(str, int, str, str)
     newWriterSignal = Signal(str, int, str, str, object)
@@ -98,10 +100,18 @@ class DatamodelModel(QAbstractListModel):
     def endInsertModule(self):
         self.endInsertRows()
 
-    @Slot(str, str)
-    def onData(self, _id: str, data: str):
+    @Slot(str, object)
+    def onData(self, _id: str, data: list):
         self.newDataArrived.emit(_id, data)
 
+    @Slot(object)
+    def onTimings(self, timings: dict):
+        self.newTimingsArrived.emit(timings)
+
+    @Slot(int, object)
+    def onWriterStats(self, domainId: int, stats: dict):
+        self.newWriterStatsArrived.emit(domainId, stats)
+
     @Slot()
     def shutdownEndpoints(self):
         for key in list(self.threads.keys()):
@@ -249,6 +259,8 @@ class DatamodelModel(QAbstractListModel):
         else:
             self.threads[domainId] = DispatcherThread(id, domainId, topicName, dataType, qos, entityType)
             self.threads[domainId].onData.connect(self.onData, Qt.ConnectionType.QueuedConnection)
+            self.threads[domainId].onTimings.connect(self.onTimings, Qt.ConnectionType.QueuedConnection)
+            self.threads[domainId].writerExecutor.onStats.connect(self.onWriterStats, Qt.ConnectionType.QueuedConnection)
             self.threads[domainId].start()
             while not self.threads[domainId].isSetUpDone():
                 logging.debug("Waiting for worker thread to set up...")
@@ -0,0 +1,137 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+from cyclonedds.builtin import DcpsParticipant
+from typing import Dict
+import uuid
+
+from dds_access import dds_data
+from dds_access.dds_data import DataEndpoint
+from dds_access.dds_utils import getAppName, getHostname, getDebugMonitorAddress
+from utils.singleton import singleton
+
+
+@singleton
+class DiscoveryCounts(QObject):
+    # Number of discovered participants, topics, readers and writers per
+    # domain and the debug monitors of the participants, shared by all
+    # consumers of the discovery.
+
+    requestParticipants = Signal(str)
+    countsChanged = Signal(object)
+    dbgPortsChanged = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # replaced as a whole on every change, can be read from any thread
+        self.counts: Dict[int, Dict[str, int]] = {}
+        # participant key -> (ip, port, app name, host, domain id)
+        self.dgbPorts: Dict[str, tuple] = {}
+        self.started = False
+
+        self.participants: Dict[int, set] = {}
+        self.topics: Dict[int, set] = {}
+        self.readers: Dict[int, set] = {}
+        self.writers: Dict[int, set] = {}
+        self.requestId = str(uuid.uuid4())
+
+        self.dds_data = dds_data.DdsData()
+        self.requestParticipants.connect(self.dds_data.requestParticipants, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.response_participants_signal.connect(self.responseParticipantsSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_participant_signal.connect(self.newParticipantSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_participant_signal.connect(self.removedParticipantSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_topic_signal.connect(self.newTopicSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.remove_topic_signal.connect(self.removedTopicSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_endpoint_signal.connect(self.newEndpointSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_endpoint_signal.connect(self.removedEndpointSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.new_domain_signal.connect(self.newDomainSlot, Qt.ConnectionType.QueuedConnection)
+        self.dds_data.removed_domain_signal.connect(self.removedDomainSlot, Qt.ConnectionType.QueuedConnection)
+
+    def start(self):
+        # participants discovered before we were created
+        if not self.started:
+            self.started = True
+            self.requestParticipants.emit(self.requestId)
+
+    def publish(self):
+        counts = {}
+        for domainId in set(self.participants) | set(self.topics) | set(self.readers) | set(self.writers):
+            counts[domainId] = {
+                "participants": len(self.participants.get(domainId, ())),
+                "topics": len(self.topics.get(domainId, ())),
+                "readers": len(self.readers.get(domainId, ())),
+                "writers": len(self.writers.get(domainId, ()))
+            }
+        self.counts = counts
+        self.countsChanged.emit(counts)
+
+    @Slot(str, int, object)
+    def responseParticipantsSlot(self, requestId: str, domainId: int, participants):
+        if requestId != self.requestId:
+            return
+        for participant in participants:
+            self.newParticipantSlot(domainId, participant)
+
+    @Slot(int, DcpsParticipant)
+    def newParticipantSlot(self, domainId: int, participant: DcpsParticipant):
+        self.participants.setdefault(domainId, set()).add(str(participant.key))
+        self.publish()
+        address = getDebugMonitorAddress(participant)
+        if address:
+            (ip, port) = address
+            self.dgbPorts[str(participant.key)] = (ip, port, getAppName(participant), getHostname(participant), domainId)
+            self.dbgPortsChanged.emit(self.dgbPorts.copy())
+
+    @Slot(int, str)
+    def removedParticipantSlot(self, domainId: int, participantKey: str):
+        self.participants.get(domainId, set()).discard(participantKey)
+        self.publish()
+        if participantKey in self.dgbPorts:
+            del self.dgbPorts[participantKey]
+            self.dbgPortsChanged.emit(self.dgbPorts.copy())
+
+    @Slot(int, str)
+    def newTopicSlot(self, domainId: int, topicName: str):
+        self.topics.setdefault(domainId, set()).add(topicName)
+        self.publish()
+
+    @Slot(int, str)
+    def removedTopicSlot(self, domainId: int, topicName: str):
+        self.topics.get(domainId, set()).discard(topicName)
+        self.publish()
+
+    @Slot(str, int, DataEndpoint)
+    def newEndpointSlot(self, requestId: str, domainId: int, endpoint: DataEndpoint):
+        if requestId != "":
+            return # answer to someone else's request
+        endpoints = self.readers if endpoint.isReader() else self.writers
+        endpoints.setdefault(domainId, set()).add(str(endpoint.endpoint.key))
+        self.publish()
+
+    @Slot(int, str)
+    def removedEndpointSlot(self, domainId: int, endpointKey: str):
+        self.readers.get(domainId, set()).discard(endpointKey)
+        self.writers.get(domainId, set()).discard(endpointKey)
+        self.publish()
+
+    @Slot(int)
+    def newDomainSlot(self, domainId: int):
+        self.participants.setdefault(domainId, set())
+        self.publish()
+
+    @Slot(int)
+    def removedDomainSlot(self, domainId: int):
+        for domains in (self.participants, self.topics, self.readers, self.writers):
+            if domainId in domains:
+                del domains[domainId]
+        self.publish()
@@ -10,65 +10,79 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
-from PySide6.QtCore import Qt, QAbstractItemModel, Qt, Slot, Signal, QThread
+from PySide6.QtCore import Qt, QAbstractItemModel, Qt, Slot, Signal, QThread, QTimer
 from cyclonedds.builtin import DcpsParticipant
 from loguru import logger as logging
 from pathlib import Path
 from dds_access import dds_utils
-from threading import Lock
+from threading import Event, Lock
+from typing import Dict, Set, Tuple
 import uuid
-import time
 import psutil
-import requests
+import random
 import socket
+import time
+from queue import Empty
 
 from dds_access import dds_data
-from dds_access.dds_utils import getAppName, getHostname, getVendorShortName, getVendorPicture, getProperty, DEBUG_MONITORS
+from dds_access.debug_monitor import debugMonitorUrl
+from dds_access.debug_monitor_collector import DebugMonitorCollector, DebugMonitorSnapshot, MAX_ADAPTIVE_INTERVAL_SECONDS
+from utils.force_layout import ForceLayout
+from utils.rate_engine import RateEngine
+from dds_access.dds_utils import getAppName, getHostname, getVendorShortName, getVendorPicture, getDebugMonitorAddress
+
+
+# the view gets at most one delta and one layout step per frame
+FLUSH_INTERVAL_MS = 16
+FRAME_SECONDS = 0.016
+
+
+def domainNodeKey(domainId: int) -> str:
+    return f"Domain {domainId}"
 
 
 class GraphStatisticThread(QThread):
 
-    onData = Signal(int, str, str, float)
+    onData = Signal(list)
     error = Signal(str)
 
     def __init__(self, parent=None):
         super().__init__()
         self.running = False
         self.mutex = Lock()
+        self.consumerId = str(uuid.uuid4())
+        self.collector = DebugMonitorCollector()
         self.pollIntervalSeconds = 3
+        self.rates = RateEngine()
         self.dgbPorts = {}
         self.dgbPortsRequest = {}
         self.dgbPortChangeRequest = False
+        # None while the graph is on screen, the collector refreshes in the background otherwise
+        self.focusUrls = None
+        self.focusChangeRequest = False
 
-    def pollData(self):
+    def pollData(self, snapshot: DebugMonitorSnapshot):
         logging.debug("GraphStatisticThread: Polling data")
 
-        # reset current counters for this poll
-        sent_bytes = {}
-        received_bytes = {}
-        already_processed_ip_port = []
+        # bytes per second of this poll
+        bps_sent = {}
+        bps_received = {}
 
-        for participant_key in self.dgbPorts.keys():
+        for url in self.dbgUrls():
 
             if not self.running:
                 return # fast exit
 
-            (ip, port, _, _) = self.dgbPorts[participant_key]
-            if f"{ip}:{port}" in already_processed_ip_port:
-                continue
-            already_processed_ip_port.append(f"{ip}:{port}")
+            if url not in snapshot.results:
+                continue # added after this snapshot was taken
 
-            json_data = {}
-            try:
-                url = "http://" + ip + ":" + port + "/"
-                response = requests.get(url, timeout=(3, 5), verify=False, headers={'Connection': 'close'})
-                response.raise_for_status()
-                json_data = response.json()
-                # logging.trace(json.dumps(json_data, indent=4))
-            except Exception as e:
-                logging.error(str(e))
+            result = snapshot.results[url]
+            if result.error is not None:
+                logging.error(result.error)
                 continue
 
+            json_data = result.json_data
+
             if "participants" in json_data:
                 for participant in json_data["participants"]:
                     pKeyCurrent = dds_utils.normalizeGuid(participant["guid"])
@@ -76,78 +90,75 @@ class GraphStatisticThread(QThread):
                         continue
 
                     (_, _, nodeKey, domainId) = self.dgbPorts[pKeyCurrent]
-                    if domainId not in sent_bytes.keys():
-                        sent_bytes[domainId] = {}
-                        received_bytes[domainId] = {}
+                    if domainId not in bps_sent.keys():
+                        bps_sent[domainId] = {}
+                        bps_received[domainId] = {}
 
                     if "writers" in participant:
                         for writer in participant["writers"]:
                             if "sent_bytes" in writer:
-                                if nodeKey in sent_bytes[domainId]:
-                                    sent_bytes[domainId][nodeKey] += writer["sent_bytes"]
-                                else:
-                                    sent_bytes[domainId][nodeKey] = writer["sent_bytes"]
+                                sample = self.rates.update(("sent", writer["guid"]), writer["sent_bytes"], result.timestamp)
+                                if nodeKey not in bps_sent[domainId]:
+                                    bps_sent[domainId][nodeKey] = 0.0
+                                if sample:
+                                    bps_sent[domainId][nodeKey] += sample.rate
 
                     if "readers" in participant:
                         for reader in participant["readers"]:
                             if "received_bytes" in reader:
-                                if nodeKey in received_bytes[domainId]:
-                                    received_bytes[domainId][nodeKey] += reader["received_bytes"]
-                                else:
-                                    received_bytes[domainId][nodeKey] = reader["received_bytes"]
-
-        # Calculate bytes per second for sent and received
-        bps_sent = {}
-        bps_received = {}
-
-        current_time = time.monotonic()
-        if not hasattr(self, "last_poll_time"):
-            self.last_poll_time = current_time
-            self.last_sent_bytes = {k: v.copy() for k, v in sent_bytes.items()}
-            self.last_received_bytes = {k: v.copy() for k, v in received_bytes.items()}
-            return
-
-        elapsed = current_time - self.last_poll_time
-        for domain_id in sent_bytes:
-            bps_sent[domain_id] = {}
-            for nodeKey in sent_bytes[domain_id]:
-                prev = self.last_sent_bytes.get(domain_id, {}).get(nodeKey, 0)
-                curr = sent_bytes[domain_id][nodeKey]
-                bps_sent[domain_id][nodeKey] = max(0, (curr - prev)) / elapsed if elapsed > 0 else 0
-
-        for domain_id in received_bytes:
-            bps_received[domain_id] = {}
-            for nodeKey in received_bytes[domain_id]:
-                prev = self.last_received_bytes.get(domain_id, {}).get(nodeKey, 0)
-                curr = received_bytes[domain_id][nodeKey]
-                bps_received[domain_id][nodeKey] = max(0, (curr - prev)) / elapsed if elapsed > 0 else 0
-
-        self.last_poll_time = current_time
-        self.last_sent_bytes = {k: v.copy() for k, v in sent_bytes.items()}
-        self.last_received_bytes = {k: v.copy() for k, v in received_bytes.items()}
-
+                                sample = self.rates.update(("recv", reader["guid"]), reader["received_bytes"], result.timestamp)
+                                if nodeKey not in bps_received[domainId]:
+                                    bps_received[domainId][nodeKey] = 0.0
+                                if sample:
+                                    bps_received[domainId][nodeKey] += sample.rate
+
+        # forget entities which are gone for a while, slow endpoints are
+        # only fetched every MAX_ADAPTIVE_INTERVAL_SECONDS
+        self.rates.expire(snapshot.timestamp - max(10 * self.pollIntervalSeconds, 2 * MAX_ADAPTIVE_INTERVAL_SECONDS))
+
+        # one signal per poll, (domainId, nodeKey, direction, bps)
+        speeds = []
         for domain_id in bps_sent.keys():
             for nodeKey in bps_sent[domain_id].keys():
-                self.onData.emit(domain_id, nodeKey, "sent", bps_sent[domain_id][nodeKey])
+                speeds.append((domain_id, nodeKey, "sent", bps_sent[domain_id][nodeKey]))
 
         for domain_id in bps_received.keys():
             for nodeKey in bps_received[domain_id].keys():
-                self.onData.emit(domain_id, nodeKey, "recv", bps_received[domain_id][nodeKey])
+                speeds.append((domain_id, nodeKey, "recv", bps_received[domain_id][nodeKey]))
+
+        if len(speeds) > 0:
+            self.onData.emit(speeds)
+
+    def dbgUrls(self):
+        urls = []
+        for participant_key in self.dgbPorts.keys():
+            (ip, port, _, _) = self.dgbPorts[participant_key]
+            url = debugMonitorUrl(ip, port)
+            if url not in urls:
+                urls.append(url)
+        return urls
 
     def run(self):
         self.running = True
+        snapshots = self.collector.addConsumer(self.consumerId, self.pollIntervalSeconds)
+        self.collector.setConsumerUrls(self.consumerId, set(self.dbgUrls()), self.focusUrls)
 
-        start_time = time.monotonic()
         while self.running:
-            if time.monotonic() - start_time >= self.pollIntervalSeconds:
-                with self.mutex:
-                    self.pollData()
-                    if self.dgbPortChangeRequest:
-                        self.dgbPorts = self.dgbPortsRequest.copy()
+            with self.mutex:
+                if self.dgbPortChangeRequest or self.focusChangeRequest:
+                    self.dgbPorts = self.dgbPortsRequest.copy()
+                    self.dgbPortChangeRequest = False
+                    self.focusChangeRequest = False
+                    self.collector.setConsumerUrls(self.consumerId, set(self.dbgUrls()), self.focusUrls)
 
-                start_time = time.monotonic()  # reset the timer
-            else:
-                time.sleep(0.1) # fast exit
+            try:
+                snapshot = snapshots.get(timeout=0.1) # fast exit
+            except Empty:
+                continue
+
+            self.pollData(snapshot)
+
+        self.collector.removeConsumer(self.consumerId)
 
     def stop(self):
         self.running = False
@@ -157,15 +168,87 @@ class GraphStatisticThread(QThread):
             self.dgbPortsRequest = dgbPorts.copy()
             self.dgbPortChangeRequest = True
 
+    def setOnScreen(self, onScreen: bool):
+        with self.mutex:
+            self.focusUrls = None if onScreen else set()
+            self.focusChangeRequest = True
+
+class ForceLayoutThread(QThread):
+    # Runs the force layout off the gui thread, one step per frame until the
+    # layout is stable. Changes are queued and applied between two steps.
+
+    onPositions = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__()
+        self.running = False
+        self.mutex = Lock()
+        self.wakeup = Event()
+        self.requests = []
+        self.layout = ForceLayout()
+
+    def request(self, function, *args):
+        with self.mutex:
+            self.requests.append((function, args))
+        self.wakeup.set()
+
+    def run(self):
+        self.running = True
+        nextFrame = time.monotonic()
+
+        while self.running:
+            with self.mutex:
+                requests = self.requests
+                self.requests = []
+                self.wakeup.clear()
+            for (function, args) in requests:
+                function(*args)
+
+            if self.layout.isStable():
+                self.wakeup.wait(0.1) # fast exit
+                nextFrame = time.monotonic()
+                continue
+
+            moved = self.layout.step()
+            if len(moved) > 0:
+                self.onPositions.emit(moved)
+
+            nextFrame += FRAME_SECONDS
+            delay = nextFrame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                nextFrame = time.monotonic() # slower than the frame rate
+
+    def stop(self):
+        self.running = False
+
+    def addNode(self, key: str, hostName: str, x: float, y: float):
+        self.request(self.layout.addNode, key, hostName, x, y)
+
+    def removeNode(self, key: str):
+        self.request(self.layout.removeNode, key)
+
+    def addEdge(self, a: str, b: str):
+        self.request(self.layout.addEdge, a, b)
+
+    def removeEdge(self, a: str, b: str):
+        self.request(self.layout.removeEdge, a, b)
+
+    def setArea(self, width: float, height: float, nodeSize: float, scale: float):
+        self.request(self.layout.setArea, width, height, nodeSize, scale)
+
+    def move(self, key: str, x: float, y: float, pinned: bool):
+        self.request(self.layout.move, key, x, y, pinned)
+
 class GraphModel(QAbstractItemModel):
 
     requestParticipants = Signal(str)
     requestDomainIds = Signal(str)
 
-    newNodeSignal = Signal(str, str, str, str, str, str)
-    removeNodeSignal = Signal(str, str)
-    removeEdgeBetweenNodes = Signal(str, str)
-    updateEdgeSignal = Signal(str, str, str, float)
+    # removed edges, removed nodes, added or changed nodes, added edges, edge speeds
+    graphDelta = Signal(list, list, list, list, list)
+    nodePositions = Signal(list)
 
     def __init__(self, parent=None):
         super(GraphModel, self).__init__(parent)
@@ -173,10 +256,30 @@ class GraphModel(QAbstractItemModel):
 
         self.domain_id = -1
         self.currentRequestId = str(uuid.uuid4())
-        self.appNames = {}
-        self.domainIds = {}
         self.ignoreSelf = False
 
+        # nodeKey -> (name, hostName, vendorShortName, vendorPicture)
+        self.nodes: Dict[str, Tuple[str, str, str, str]] = {}
+        # (nodeKey, domain nodeKey) -> participant keys
+        self.edges: Dict[Tuple[str, str], Set[str]] = {}
+        self.nodeEdges: Dict[str, Set[Tuple[str, str]]] = {}
+        # participantKey -> (nodeKey, domainId)
+        self.participants: Dict[str, Tuple[str, int]] = {}
+        self.domainIds: Set[int] = set()
+
+        # what the view shows, changes in between are coalesced
+        self.shownNodes: Dict[str, Tuple[str, str, str, str]] = {}
+        self.shownEdges: Set[Tuple[str, str]] = set()
+        self.dirtyNodes: Set[str] = set()
+        self.dirtyEdges: Set[Tuple[str, str]] = set()
+        self.pendingSpeeds: Dict[Tuple[str, str, str], float] = {}
+        # where new nodes appear, until they are sent to the view
+        self.startPositions: Dict[str, Tuple[float, float]] = {}
+        self.flushTimer = QTimer(self)
+        self.flushTimer.setSingleShot(True)
+        self.flushTimer.setInterval(FLUSH_INTERVAL_MS)
+        self.flushTimer.timeout.connect(self.flush)
+
         proc = psutil.Process()
         hostName = socket.gethostname()
         self.selfName = f"{hostName}:{Path(proc.exe()).stem}:{proc.pid}"
@@ -199,6 +302,10 @@ class GraphModel(QAbstractItemModel):
         self.graphStatistics = GraphStatisticThread(self)
         self.graphStatistics.onData.connect(self.onGraphStatisticsData, Qt.ConnectionType.QueuedConnection)
 
+        self.layoutArea = (0.0, 0.0)
+        self.layoutThread = ForceLayoutThread(self)
+        self.layoutThread.onPositions.connect(self.onLayoutPositions, Qt.ConnectionType.QueuedConnection)
+
     def acceptDomainId(self, domain_id: int):
         return self.domain_id == -1 or self.domain_id == domain_id
 
@@ -210,25 +317,121 @@ class GraphModel(QAbstractItemModel):
         self.domain_id = domain_id
         self.ignoreSelf = ignoreSelf
 
-        self.endpoints = {}
-        self.appNames = {}
+        # the answers to the new requests rebuild the graph
+        for nodeKey in self.nodes.keys():
+            self.layoutThread.removeNode(nodeKey)
+        self.dirtyNodes.update(self.nodes.keys())
+        self.dirtyEdges.update(self.edges.keys())
+        self.nodes.clear()
+        self.edges.clear()
+        self.nodeEdges.clear()
+        self.participants.clear()
+        self.domainIds.clear()
+        self.startPositions.clear()
+        self.scheduleFlush()
         self.currentRequestId = str(uuid.uuid4())
 
         self.requestDomainIds.emit(self.currentRequestId)
         self.requestParticipants.emit(self.currentRequestId)
 
+        if not self.layoutThread.isRunning():
+            self.layoutThread.start()
+
         if speedEnabled:
             self.start()
 
+    def scheduleFlush(self):
+        if not self.flushTimer.isActive():
+            self.flushTimer.start()
+
+    def setNode(self, nodeKey: str, info: Tuple[str, str, str, str]):
+        if nodeKey not in self.nodes:
+            (width, height) = self.layoutArea
+            (x, y) = (random.random() * width, random.random() * height)
+            self.startPositions[nodeKey] = (x, y)
+            (_, hostName, _, _) = info
+            self.layoutThread.addNode(nodeKey, hostName, x, y)
+        if self.nodes.get(nodeKey) != info:
+            self.nodes[nodeKey] = info
+            self.dirtyNodes.add(nodeKey)
+            self.scheduleFlush()
+
+    def removeNode(self, nodeKey: str):
+        self.nodeEdges.pop(nodeKey, None)
+        self.startPositions.pop(nodeKey, None)
+        if self.nodes.pop(nodeKey, None) is not None:
+            self.layoutThread.removeNode(nodeKey)
+            self.dirtyNodes.add(nodeKey)
+            self.scheduleFlush()
+
+    def addEdge(self, edge: Tuple[str, str]):
+        self.edges[edge] = set()
+        for nodeKey in edge:
+            self.nodeEdges.setdefault(nodeKey, set()).add(edge)
+        self.layoutThread.addEdge(*edge)
+        self.dirtyEdges.add(edge)
+        self.scheduleFlush()
+
+    def removeEdge(self, edge: Tuple[str, str]):
+        del self.edges[edge]
+        for nodeKey in edge:
+            if nodeKey in self.nodeEdges:
+                self.nodeEdges[nodeKey].discard(edge)
+        self.layoutThread.removeEdge(*edge)
+        self.dirtyEdges.add(edge)
+        self.scheduleFlush()
+
+        # an application without participants is gone, a domain stays until it is removed
+        (nodeKey, _) = edge
+        if len(self.nodeEdges.get(nodeKey, ())) == 0:
+            self.removeNode(nodeKey)
+
+    def addDomain(self, domainId: int):
+        if domainId not in self.domainIds:
+            self.domainIds.add(domainId)
+            domainIdStr = domainNodeKey(domainId)
+            self.setNode(domainIdStr, (domainIdStr, "", "", ""))
+
+    @Slot()
+    def flush(self):
+        # edges first, removing a node in the view also removes its edges
+        removedEdges = []
+        addedEdges = []
+        for edge in self.dirtyEdges:
+            if edge in self.edges:
+                if edge not in self.shownEdges:
+                    self.shownEdges.add(edge)
+                    addedEdges.append(list(edge))
+            elif edge in self.shownEdges:
+                self.shownEdges.discard(edge)
+                removedEdges.append(list(edge))
+
+        removedNodes = []
+        addedNodes = []
+        for nodeKey in self.dirtyNodes:
+            info = self.nodes.get(nodeKey)
+            if info is None:
+                if self.shownNodes.pop(nodeKey, None) is not None:
+                    removedNodes.append(nodeKey)
+            elif self.shownNodes.get(nodeKey) != info:
+                self.shownNodes[nodeKey] = info
+                addedNodes.append([nodeKey, *info, *self.startPositions.pop(nodeKey, (0.0, 0.0))])
+
+        speeds = [[nodeKey, domainKey, t, bps]
+                  for ((nodeKey, domainKey, t), bps) in self.pendingSpeeds.items()
+                  if (nodeKey, domainKey) in self.shownEdges]
+
+        self.dirtyEdges.clear()
+        self.dirtyNodes.clear()
+        self.pendingSpeeds.clear()
+
+        if removedEdges or removedNodes or addedNodes or addedEdges or speeds:
+            self.graphDelta.emit(removedEdges, removedNodes, addedNodes, addedEdges, speeds)
+
     @Slot(int)
     def newDomainSlot(self, domain_id: int):
-        if not self.acceptDomainId(domain_id):
-            return
-        
-        domainIdStr = f"Domain {domain_id}"
-        if domain_id not in self.domainIds.keys():
-            self.domainIds[domain_id] = []
-            self.newNodeSignal.emit(domainIdStr, domainIdStr, "", "", "", "")
+        if self.acceptDomainId(domain_id):
+            self.addDomain(domain_id)
 
     @Slot(str, int, object)
     def response_participants_slot(self, request_id: str, domain_id: int, participants):
@@ -254,64 +457,40 @@ class GraphModel(QAbstractItemModel):
         if nodeKey == self.selfName and self.ignoreSelf:
             return
 
-        domainIdStr = f"Domain {domain_id}"
-
-        if domain_id not in self.domainIds.keys():
-            self.domainIds[domain_id] = [str(participant.key)]
-            self.newNodeSignal.emit(domainIdStr, domainIdStr, "", "", "", "")
-        else:
-            if str(participant.key) not in self.domainIds[domain_id]:
-                self.domainIds[domain_id].append(str(participant.key))
-
-        if nodeKey not in self.appNames.keys():
-            self.appNames[nodeKey] = {
-                domain_id: [str(participant.key)]
-            }
-        else:
-            if domain_id not in self.appNames[nodeKey]:
-                self.appNames[nodeKey][domain_id] = [str(participant.key)]
-            else:
-                self.appNames[nodeKey][domain_id].append(str(participant.key))
-
-        self.newNodeSignal.emit(nodeKey, appName, domainIdStr, host, getVendorShortName(participant), getVendorPicture(participant))
-
-        # Extracting debug monitor address
-        dbg_mon_str: str = getProperty(participant, DEBUG_MONITORS)
-        splitProtoAdr = dbg_mon_str.split("/")
-        if len(splitProtoAdr) > 0:
-            if splitProtoAdr[0] == "tcp":
-                splitIpPort = splitProtoAdr[1].split(":")
-                if len(splitIpPort) > 1:
-                    ip = splitIpPort[0]
-                    port = splitIpPort[1]
-                    self.dgbPorts[str(participant.key)] = (ip, port, nodeKey, domain_id)
+        participantKey = str(participant.key)
+        self.addDomain(domain_id)
+        self.setNode(nodeKey, (appName, host, getVendorShortName(participant), getVendorPicture(participant)))
+
+        if participantKey not in self.participants:
+            self.participants[participantKey] = (nodeKey, domain_id)
+            edge = (nodeKey, domainNodeKey(domain_id))
+            if edge not in self.edges:
+                self.addEdge(edge)
+            self.edges[edge].add(participantKey)
+
+        address = getDebugMonitorAddress(participant)
+        if address:
+            (ip, port) = address
+            self.dgbPorts[participantKey] = (ip, port, nodeKey, domain_id)
         
         self.graphStatistics.setDbgPorts(self.dgbPorts)
 
+    def removeParticipant(self, participantKey: str):
+        entry = self.participants.pop(participantKey, None)
+        if entry is None:
+            return
+
+        (nodeKey, domainId) = entry
+        edge = (nodeKey, domainNodeKey(domainId))
+        members = self.edges.get(edge)
+        if members is not None:
+            members.discard(participantKey)
+            if len(members) == 0:
+                self.removeEdge(edge)
+
     @Slot(int, str)
     def removedParticipantSlot(self, domainId: int, participantKey: str):
-        toBeRemovedApps = []
-        for appName in list(self.appNames.keys()):
-            if domainId in self.appNames[appName]:
-                if participantKey in self.appNames[appName][domainId]:
-                    self.appNames[appName][domainId].remove(participantKey)
-
-                    # Check if appName is present in any other domain with participants
-                    found_in_other_domain = any(
-                        domain != domainId and len(self.appNames[appName][domain]) > 0
-                        for domain in self.appNames[appName]
-                    )
-                    if not found_in_other_domain:
-                        if len(self.appNames[appName][domainId]) == 0:
-                            toBeRemovedApps.append(appName)
-
-                    if len(self.appNames[appName][domainId]) == 0:
-                        self.removeEdgeBetweenNodes.emit(appName, f"Domain {domainId}")
-
-        for remApp in toBeRemovedApps:
-            if remApp in self.appNames.keys():
-                del self.appNames[remApp]
-                self.removeNodeSignal.emit(remApp, "")
+        self.removeParticipant(participantKey)
 
         if participantKey in self.dgbPorts:
             del self.dgbPorts[participantKey]
@@ -319,9 +498,18 @@ class GraphModel(QAbstractItemModel):
 
     @Slot(int)
     def removedDomainSlot(self, domainId: int):
-        if domainId in self.domainIds.keys():
-            del self.domainIds[domainId]
-            self.removeNodeSignal.emit(f"Domain {domainId}", "")
+        if domainId not in self.domainIds:
+            return
+
+        self.domainIds.discard(domainId)
+        domainIdStr = domainNodeKey(domainId)
+        for edge in list(self.nodeEdges.get(domainIdStr, ())):
+            for participantKey in self.edges[edge]:
+                self.participants.pop(participantKey, None)
+                self.dgbPorts.pop(participantKey, None)
+            self.removeEdge(edge)
+        self.removeNode(domainIdStr)
+        self.graphStatistics.setDbgPorts(self.dgbPorts)
 
     @Slot(str, list)
     def responseDomainIdsSlot(self, requestId: str, domainIds):
@@ -330,15 +518,31 @@ class GraphModel(QAbstractItemModel):
 
         for domainId in domainIds:
             if self.acceptDomainId(domainId):
-                if domainId not in self.domainIds.keys():
-                    self.domainIds[domainId] = []
-                    domainIdStr = f"Domain {domainId}"
-                    self.newNodeSignal.emit(domainIdStr, domainIdStr, "", "", "", "")
+                self.addDomain(domainId)
+
+    @Slot(list)
+    def onGraphStatisticsData(self, speeds):
+        logging.debug(f"GraphModel: onGraphStatisticsData {len(speeds)} speeds")
+        for (domain_id, nodeKey, t, bps) in speeds:
+            self.pendingSpeeds[(nodeKey, domainNodeKey(domain_id), t)] = bps
+        self.scheduleFlush()
 
-    @Slot(int, str, str, float)
-    def onGraphStatisticsData(self, domain_id: int, nodeKey: str, t: str, bps: float):
-        logging.debug(f"GraphModel: onGraphStatisticsData domain_id: {domain_id}, nodeKey: {nodeKey}, bps: {bps}")
-        self.updateEdgeSignal.emit(f"Domain {domain_id}", nodeKey, t, bps)
+    @Slot(list)
+    def onLayoutPositions(self, positions):
+        self.nodePositions.emit(positions)
+
+    @Slot(float, float, float, float)
+    def setLayoutArea(self, width: float, height: float, nodeSize: float, scale: float):
+        self.layoutArea = (width, height)
+        self.layoutThread.setArea(width, height, nodeSize, scale)
+
+    @Slot(str, float, float, bool)
+    def moveNode(self, nodeKey: str, x: float, y: float, pinned: bool):
+        self.layoutThread.move(nodeKey, x, y, pinned)
+
+    @Slot(bool)
+    def setOnScreen(self, onScreen: bool):
+        self.graphStatistics.setOnScreen(onScreen)
 
     @Slot()
     def start(self):
@@ -353,4 +557,9 @@ class GraphModel(QAbstractItemModel):
         logging.debug("Stopping GraphStatistics thread")
         self.graphStatistics.stop()
         self.graphStatistics.wait()
-        logging.debug("GraphStatistics thread stopped")
\ No newline at end of file
+        logging.debug("GraphStatistics thread stopped")
+
+    @Slot()
+    def stopLayout(self):
+        self.layoutThread.stop()
+        self.layoutThread.wait()
@@ -30,6 +30,7 @@ import types
 from PySide6.QtQml import qmlRegisterType
 from models.data_tree_model import DataTreeModel, DataTreeNode
 from utils.qml_utils import QmlUtils
+from utils.sample_filter import compileFilter
 
 import json
 
@@ -43,6 +44,7 @@ class ReaderData:
     qos: object
     stopped: bool
     isChecked: bool
+    filter: str = ""
 
 
 class ListenerModel(QAbstractListModel):
@@ -51,6 +53,8 @@ class ListenerModel(QAbstractListModel):
     TopicTypeRole = Qt.UserRole + 3
     StoppedRole = Qt.UserRole + 4
     IsCheckedRole = Qt.UserRole + 5
+    TimingsRole = Qt.UserRole + 6
+    FilterRole = Qt.UserRole + 7
 
     createEndpointSignal = Signal(str, int, str, str, int, str, object, object)
     allCheckedChanged = Signal()
@@ -60,6 +64,7 @@ class ListenerModel(QAbstractListModel):
 
         self.threads = threads
         self.readers = {}
+        self.timings = {} # readerId -> summary of the dispatcher
 
     def rowCount(self, parent=QModelIndex()):
         if parent.isValid():
@@ -83,6 +88,10 @@ class ListenerModel(QAbstractListModel):
             return item.stopped
         if role == self.IsCheckedRole:
             return item.isChecked
+        if role == self.TimingsRole:
+            return self.timings.get(_id, {})
+        if role == self.FilterRole:
+            return item.filter
 
         return None
 
@@ -97,7 +106,9 @@ class ListenerModel(QAbstractListModel):
             self.TopicNameRole: b"topicName",
             self.TopicTypeRole: b"topicType",
             self.StoppedRole: b"stoppedReader",
-            self.IsCheckedRole: b"isChecked"
+            self.IsCheckedRole: b"isChecked",
+            self.TimingsRole: b"timings",
+            self.FilterRole: b"readerFilter"
         }
 
     def _row_for_id(self, _id: str):
@@ -119,6 +130,7 @@ class ListenerModel(QAbstractListModel):
             row = self._row_for_id(_id)
             self.beginRemoveRows(QModelIndex(), row, row)
             del self.readers[_id]
+            self.timings.pop(_id, None)
             self.endRemoveRows()
             self.allCheckedChanged.emit()
 
@@ -165,6 +177,7 @@ class ListenerModel(QAbstractListModel):
             self.threads[key].deleteAllReaders()
         self.beginResetModel()
         self.readers.clear()
+        self.timings.clear()
         self.endResetModel()
         self.allCheckedChanged.emit()
 
@@ -193,6 +206,35 @@ class ListenerModel(QAbstractListModel):
             self.dataChanged.emit(first, last, [self.IsCheckedRole])
             self.allCheckedChanged.emit()
 
+    @Slot(str, str, result=str)
+    def setFilter(self, _id: str, text: str):
+        # the error if the expression can't be compiled, else an empty string
+        if _id not in self.readers:
+            return ""
+        try:
+            sampleFilter = compileFilter(text)
+        except ValueError as e:
+            return str(e)
+
+        logging.info(f"Set filter of reader {_id} to \"{text}\"")
+        self.readers[_id].filter = text.strip()
+        for key in self.threads:
+            # every dispatcher gets a filter of its own, with its own counts
+            self.threads[key].setReaderFilter(_id, None if sampleFilter is None else sampleFilter.copy())
+        row = self._row_for_id(_id)
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, [self.FilterRole])
+        return ""
+
+    @Slot(object)
+    def setTimings(self, timings: dict):
+        for (_id, summary) in timings.items():
+            if _id in self.readers:
+                self.timings[_id] = summary
+                row = self._row_for_id(_id)
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index, [self.TimingsRole])
+
     @Slot(result=list)
     def readerIds(self):
         return list(self.readers.keys())
@@ -201,7 +243,11 @@ class ListenerModel(QAbstractListModel):
     def addReader(self, id: str, domainId, topic_name, topic_type: str, qos):
         logging.info("AddReader to ListenerModel")
         if id in self.readers:
-            self.readers[id] = ReaderData(id, domainId, topic_name, topic_type, qos, False, True)
+            # a restarted reader keeps its filter
+            readerFilter = self.readers[id].filter
+            self.readers[id] = ReaderData(id, domainId, topic_name, topic_type, qos, False, True, readerFilter)
+            if readerFilter:
+                self.setFilter(id, readerFilter)
             row = self._row_for_id(id)
             index = self.index(row, 0)
             self.dataChanged.emit(index, index, [
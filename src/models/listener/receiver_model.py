@@ -11,77 +11,414 @@
 """
 
 from loguru import logger as logging
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from threading import Event, Lock
+from typing import List, Optional
 
-from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, Qt, Slot
+from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, Qt, Signal, Slot, QThread
+
+from dds_access.received_sample import ReceivedSample
+from utils.search_index import SearchIndex, Term, highlight, matchesTerms, parseQuery, sampleTerms
+from utils.spill_store import SpillStore
+
+
+# formatted messages kept for the rows which were shown last
+RENDER_CACHE_SIZE = 512
+DEFAULT_CAPACITY = 500000
+# runs before the samples in memory are dropped in batches of at least this many
+TRIM_RUNS = 1024
+# samples indexed before pending requests are looked at again
+INDEX_CHUNK_SIZE = 256
+
+
+class SearchIndexThread(QThread):
+    # Builds the search index of the received samples off the gui thread.
+    # Samples are queued as they arrive and indexed in chunks, samples which
+    # were evicted before they were indexed are skipped. Searches run in
+    # between two chunks, samples indexed afterwards are matched against
+    # the last search and reported with onMatches.
+
+    onResults = Signal(int, object) # search id, matching sequence numbers
+    onMatches = Signal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__()
+        self.running = False
+        self.mutex = Lock()
+        self.wakeup = Event()
+        self.pending = deque() # (first sequence number, samples)
+        self.cleared = False
+        self.bound = 0 # samples before aren't indexed
+        self.query = None # (search id, terms)
+        self.searchId = 0
+        self.terms: List[Term] = []
+        self.index = SearchIndex()
+
+    def run(self):
+        self.running = True
+
+        while self.running:
+            with self.mutex:
+                if self.cleared:
+                    self.cleared = False
+                    self.index.clear()
+                query = self.query
+                self.query = None
+                bound = self.bound
+                chunk = self.nextChunk()
+                if chunk is None and query is None:
+                    self.wakeup.clear()
+
+            self.index.dropBefore(bound)
+            if query is not None:
+                (self.searchId, self.terms) = query
+                if len(self.terms) > 0:
+                    self.onResults.emit(self.searchId, self.index.search(self.terms, bound))
+
+            if chunk is None:
+                if query is None:
+                    self.wakeup.wait(0.1) # fast exit
+                continue
+
+            matches = []
+            (seq, samples) = chunk
+            for sample in samples:
+                try:
+                    terms = sampleTerms(sample.decode())
+                except Exception as e:
+                    logging.debug(f"Failed to index sample: {e}")
+                    terms = set()
+                self.index.add(seq, terms)
+                if len(self.terms) > 0 and matchesTerms(self.terms, terms):
+                    matches.append(seq)
+                seq += 1
+            if len(matches) > 0:
+                self.onMatches.emit(self.searchId, matches)
+
+    def nextChunk(self):
+        # called with the mutex held
+        if len(self.pending) == 0:
+            return None
+        (seq, samples) = self.pending[0]
+        if seq < self.bound:
+            samples = samples[self.bound - seq:]
+            seq = self.bound
+        if len(samples) > INDEX_CHUNK_SIZE:
+            self.pending[0] = (seq + INDEX_CHUNK_SIZE, samples[INDEX_CHUNK_SIZE:])
+            return (seq, samples[:INDEX_CHUNK_SIZE])
+        self.pending.popleft()
+        return (seq, samples)
+
+    def stop(self):
+        self.running = False
+
+    def add(self, seq: int, samples):
+        with self.mutex:
+            self.pending.append((seq, samples))
+        self.wakeup.set()
+
+    def dropBefore(self, seq: int):
+        with self.mutex:
+            self.bound = seq
+            # nothing to index if it's gone already
+            while len(self.pending) > 0 and self.pending[0][0] + len(self.pending[0][1]) <= seq:
+                self.pending.popleft()
+
+    def search(self, searchId: int, terms: List[Term]):
+        with self.mutex:
+            self.query = (searchId, terms)
+        self.wakeup.set()
+
+    def clear(self):
+        with self.mutex:
+            self.pending.clear()
+            self.bound = 0
+            self.cleared = True
+        self.wakeup.set()
 
 
 class ReceiverModel(QAbstractListModel):
+    # Received samples in a ring buffer of the given capacity. Samples are
+    # numbered in the order they arrived, the oldest ones are dropped once
+    # the buffer is full, or moved to a SpillStore if a spill directory is
+    # given. Spilled samples stay rows of the model and are paged in again
+    # when they are shown.
+
+    countsChanged = Signal(int, int) # retained, evicted
+    # matching sequence numbers of a new search, None once it ended
+    searchResults = Signal(object)
+    searchMatches = Signal(object) # matching samples which arrived later
 
     ReaderIdRole = Qt.UserRole + 1
     ReceivedMsgRole = Qt.UserRole + 2
+    HighlightedMsgRole = Qt.UserRole + 3
 
-    def __init__(self, parent=None):
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, spillDirectory: str = "", parent=None):
         super().__init__(parent)
-        self._messages = []
-        self._rows_by_reader = {}
+        self._capacity = max(1, capacity)
+        self._spillDirectory = spillDirectory
+        self._spill: Optional[SpillStore] = None
+        self._ring: list[ReceivedSample] = []
+        self._total = 0 # samples since the last clear
+        self._firstSeq = 0 # sample shown in the first row
+        # runs of consecutive samples of the same reader
+        self._runStarts = array("q")
+        self._runReaders = array("I")
+        # reader indexes of readers without samples left are reused
+        self._readerIds: list[Optional[str]] = []
+        self._readerIndex = {}
+        self._freeReaders: list[int] = []
+        # sample ranges [start, end) of every reader, by reader index
+        self._readerRunStarts: list[array] = []
+        self._readerRunEnds: list[array] = []
+        self._rendered = OrderedDict()
+        self._searchId = 0
+        self._searchTerms: List[Term] = []
+        self._highlightColor = ""
+        self._indexThread = SearchIndexThread()
+        self._indexThread.onResults.connect(self.onSearchResults, Qt.QueuedConnection)
+        self._indexThread.onMatches.connect(self.onSearchMatches, Qt.QueuedConnection)
+        self._indexThread.start()
 
     def rowCount(self, parent=QModelIndex()):
-        return 0 if parent.isValid() else len(self._messages)
+        return 0 if parent.isValid() else self._total - self._firstSeq
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
 
-        item = self._messages[index.row()]
+        seq = self._firstSeq + index.row()
 
         if role == self.ReaderIdRole:
-            return item["readerId"]
+            return self.readerIdAt(seq)
         if role == self.ReceivedMsgRole:
-            return item["msg"]
+            return self.render(seq)
+        if role == self.HighlightedMsgRole:
+            text = highlight(self.render(seq), self._searchTerms, self._highlightColor)
+            return f"<span style=\"white-space:pre-wrap\">{text}</span>"
 
         return None
 
+    def firstSequence(self) -> int:
+        return self._firstSeq
+
+    def readerIds(self) -> list[str]:
+        return [readerId for readerId in self._readerIds if readerId is not None]
+
+    def readerRuns(self, readerId: str):
+        # (start, end) of the sample ranges of a reader in order, may begin before the first row
+        spilled = 0
+        if self._spill is not None:
+            yield from self._spill.readerRuns(readerId)
+            spilled = len(self._spill)
+        index = self._readerIndex.get(readerId)
+        if index is None:
+            return
+        starts = self._readerRunStarts[index]
+        ends = self._readerRunEnds[index]
+        # the runs in memory go on where the spilled ones end
+        for run in range(bisect_right(ends, spilled), len(ends)):
+            yield (max(starts[run], spilled), ends[run])
+
+    def retainedStart(self) -> int:
+        return self._total - len(self._ring)
+
+    def sample(self, seq: int) -> ReceivedSample:
+        if seq >= self.retainedStart():
+            return self._ring[seq % self._capacity]
+        return self._spill.get(seq)
+
+    def readerIdAt(self, seq: int) -> str:
+        if seq < self.retainedStart():
+            return self._spill.get(seq).readerId
+        run = bisect_right(self._runStarts, seq) - 1
+        return self._readerIds[self._runReaders[run]]
+
+    def render(self, seq: int) -> str:
+        if seq in self._rendered:
+            self._rendered.move_to_end(seq)
+            return self._rendered[seq]
+
+        try:
+            text = self.sample(seq).format()
+        except Exception as e:
+            text = f"Failed to decode sample: {e}"
+        self._rendered[seq] = text
+        if len(self._rendered) > RENDER_CACHE_SIZE:
+            self._rendered.popitem(last=False)
+        return text
+
     def roleNames(self):
         return {
             self.ReaderIdRole: b"readerId",
-            self.ReceivedMsgRole: b"receivedMsg"
+            self.ReceivedMsgRole: b"receivedMsg",
+            self.HighlightedMsgRole: b"highlightedMsg"
         }
 
 
-    @Slot(str, str)
-    def addReceivedMsg(self, readerId, msg):
-        row = len(self._messages)
+    @Slot(str, object)
+    def addReceivedMsgs(self, readerId, samples):
+        if len(samples) == 0:
+            return
+
+        for start in range(0, len(samples), self._capacity):
+            self.append(readerId, samples[start:start + self._capacity])
 
-        self.beginInsertRows(QModelIndex(), row, row)
+        retained = len(self._ring)
+        self.countsChanged.emit(retained, self._total - retained)
 
-        self._messages.append({
-            "readerId": readerId,
-            "msg": msg,
-        })
+    def append(self, readerId: str, samples):
+        # at most capacity samples
+        evict = max(0, len(self._ring) + len(samples) - self._capacity)
+        if evict > 0:
+            self.evict(evict)
 
-        if readerId not in self._rows_by_reader:
-            self._rows_by_reader[readerId] = []
+        first = self._total - self._firstSeq
 
-        self._rows_by_reader[readerId].append(row)
+        self.beginInsertRows(QModelIndex(), first, first + len(samples) - 1)
+
+        if readerId not in self._readerIndex:
+            if len(self._freeReaders) > 0:
+                self._readerIds[self._freeReaders[-1]] = readerId
+                self._readerIndex[readerId] = self._freeReaders.pop()
+            else:
+                self._readerIndex[readerId] = len(self._readerIds)
+                self._readerIds.append(readerId)
+                self._readerRunStarts.append(array("q"))
+                self._readerRunEnds.append(array("q"))
+        reader = self._readerIndex[readerId]
+        if len(self._runReaders) == 0 or self._runReaders[-1] != reader:
+            self._runStarts.append(self._total)
+            self._runReaders.append(reader)
+        ends = self._readerRunEnds[reader]
+        if len(ends) > 0 and ends[-1] == self._total:
+            ends[-1] += len(samples)
+        else:
+            self._readerRunStarts[reader].append(self._total)
+            ends.append(self._total + len(samples))
+
+        for sample in samples:
+            if len(self._ring) < self._capacity:
+                self._ring.append(sample)
+            else:
+                self._ring[self._total % self._capacity] = sample
+            self._total += 1
 
         self.endInsertRows()
 
+        self._indexThread.add(self._total - len(samples), samples)
+
+    def evict(self, count: int):
+        start = self.retainedStart()
+        evicted = [self._ring[seq % self._capacity] for seq in range(start, start + count)]
+        for seq in range(start, start + count):
+            self._ring[seq % self._capacity] = None
+
+        # only samples in memory are searched
+        self._indexThread.dropBefore(start + count)
+
+        spilling = bool(self._spillDirectory)
+        if spilling:
+            if self._spill is None:
+                self._spill = SpillStore(self._spillDirectory)
+            self._spill.append(evicted)
+        else:
+            self.beginRemoveRows(QModelIndex(), 0, count - 1)
+            self._firstSeq = start + count
+
+        # runs which ended before the samples in memory, the spill keeps
+        # its own runs
+        retained = start + count
+        run = bisect_right(self._runStarts, retained) - 1
+        if run > TRIM_RUNS:
+            del self._runStarts[:run]
+            del self._runReaders[:run]
+        for (reader, (starts, ends)) in enumerate(zip(self._readerRunStarts, self._readerRunEnds)):
+            if not spilling and self._readerIds[reader] is not None and len(ends) > 0 and ends[-1] <= retained:
+                # none of its samples are left, the runs referring to it
+                # ended before the first row
+                del self._readerIndex[self._readerIds[reader]]
+                self._readerIds[reader] = None
+                self._freeReaders.append(reader)
+                del starts[:]
+                del ends[:]
+                continue
+            run = bisect_right(ends, retained)
+            if run > TRIM_RUNS:
+                del starts[:run]
+                del ends[:run]
+
+        if not spilling:
+            self.endRemoveRows()
 
     @Slot()
     def clear(self):
         self.beginResetModel()
 
-        self._messages.clear()
-        self._rows_by_reader.clear()
+        self._ring.clear()
+        self._total = 0
+        self._firstSeq = 0
+        self._runStarts = array("q")
+        self._runReaders = array("I")
+        self._readerIds = []
+        self._readerIndex = {}
+        self._freeReaders = []
+        self._readerRunStarts = []
+        self._readerRunEnds = []
+        self._rendered.clear()
+        self.closeSpill()
+        self._indexThread.clear()
+        self.endSearch()
 
         self.endResetModel()
+        self.countsChanged.emit(0, 0)
+
+    @Slot(str, str)
+    def search(self, text: str, highlightColor: str):
+        self._searchTerms = parseQuery(text)
+        if len(self._searchTerms) == 0:
+            self.endSearch()
+            return
+        self._searchId += 1
+        self._highlightColor = highlightColor
+        self._indexThread.search(self._searchId, self._searchTerms)
+
+    @Slot()
+    def endSearch(self):
+        self._searchId += 1
+        self._indexThread.search(self._searchId, [])
+        if len(self._searchTerms) > 0:
+            self._searchTerms = []
+            self.searchResults.emit(None)
+
+    @Slot(int, object)
+    def onSearchResults(self, searchId: int, seqs):
+        if searchId == self._searchId:
+            self.searchResults.emit(seqs)
+
+    @Slot(int, object)
+    def onSearchMatches(self, searchId: int, seqs):
+        if searchId == self._searchId:
+            self.searchMatches.emit(seqs)
+
+    def shutdown(self):
+        self._indexThread.stop()
+        self._indexThread.wait()
+        self.closeSpill()
+
+    def closeSpill(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
 
     @Slot(str)
     def exportToFile(self, filePath):
         logging.info(f"Export messages to file: {filePath}")
         try:
             with open(filePath, "w", encoding="utf-8") as f:
-                for item in self._messages:
-                    f.write(f"{item['msg']}\n")
+                for seq in range(self._firstSeq, self._total):
+                    f.write(f"{self.sample(seq).format()}\n")
         except Exception as e:
             logging.error(f"Error exporting messages to file: {e}")
@@ -10,13 +10,53 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
-from PySide6.QtCore import QSortFilterProxyModel, Slot
+from array import array
+from bisect import bisect_right
+import heapq
 
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, Slot
+
+
+class ReceiverProxyModel(QAbstractProxyModel):
+    # Rows of the ReceiverModel without the hidden readers. The visible
+    # rows are kept as sample ranges [start, end) merged from the range
+    # index the source keeps per reader, a row is mapped with a bisect over
+    # the ranges. Hiding or showing a reader merges the ranges again instead
+    # of looking at every row, appended rows extend the last range. While
+    # the source is searched only the matching samples are shown.
 
-class ReceiverProxyModel(QSortFilterProxyModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._hidden_reader_ids = set()
+        self._starts = array("q")
+        self._ends = array("q")
+        self._offsets = array("q") # visible samples before a range
+        self._count = 0 # visible samples, including evicted ones
+        self._removed = 0 # visible samples evicted from the source
+        self._removing = 0
+        self._matches = None # sequence numbers while searching
+
+    def setSourceModel(self, model):
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.rowsInserted.disconnect(self.onSourceRowsInserted)
+            previous.rowsAboutToBeRemoved.disconnect(self.onSourceRowsAboutToBeRemoved)
+            previous.rowsRemoved.disconnect(self.onSourceRowsRemoved)
+            previous.modelReset.disconnect(self.rebuild)
+            previous.searchResults.disconnect(self.setMatches)
+            previous.searchMatches.disconnect(self.addMatches)
+
+        self.beginResetModel()
+        super().setSourceModel(model)
+        if model is not None:
+            model.rowsInserted.connect(self.onSourceRowsInserted)
+            model.rowsAboutToBeRemoved.connect(self.onSourceRowsAboutToBeRemoved)
+            model.rowsRemoved.connect(self.onSourceRowsRemoved)
+            model.modelReset.connect(self.rebuild)
+            model.searchResults.connect(self.setMatches)
+            model.searchMatches.connect(self.addMatches)
+        self.merge()
+        self.endResetModel()
 
     @Slot(str, bool)
     def showReaderId(self, reader_id: str, show: bool):
@@ -29,8 +69,8 @@ class ReceiverProxyModel(QSortFilterProxyModel):
         else:
             if reader_id not in self._hidden_reader_ids:
                 self._hidden_reader_ids.add(reader_id)
-        
-        self.invalidateFilter()
+
+        self.rebuild()
 
     @Slot(list, bool)
     def showReaderIds(self, reader_ids, show: bool):
@@ -49,22 +89,150 @@ class ReceiverProxyModel(QSortFilterProxyModel):
                     changed = True
 
         if changed:
-            self.invalidateFilter()
+            self.rebuild()
 
     @Slot()
     def clearHiddenReaderIds(self):
         if self._hidden_reader_ids:
             self._hidden_reader_ids.clear()
-            self.invalidateFilter()
+            self.rebuild()
+
+    @Slot(object)
+    def setMatches(self, seqs):
+        self._matches = None if seqs is None else array("q", seqs)
+        self.rebuild()
+
+    @Slot(object)
+    def addMatches(self, seqs):
+        if self._matches is None:
+            return
+        model = self.sourceModel()
+        first = model.firstSequence()
+        for seq in seqs:
+            # matches arrive in order
+            self._matches.append(seq)
+            if seq >= first and model.readerIdAt(seq) not in self._hidden_reader_ids:
+                self.append(seq, seq + 1)
+
+    @Slot()
+    def rebuild(self):
+        self.beginResetModel()
+        self.merge()
+        self.endResetModel()
+
+    def merge(self):
+        self._starts = array("q")
+        self._ends = array("q")
+        self._offsets = array("q")
+        self._count = 0
+        self._removed = 0
 
-    def filterAcceptsRow(self, source_row, source_parent):
         model = self.sourceModel()
         if model is None:
-            return False
+            return
+
+        first = model.firstSequence()
+        if self._matches is not None:
+            skip = bisect_right(self._matches, first - 1)
+            del self._matches[:skip]
+            for seq in self._matches:
+                if model.readerIdAt(seq) not in self._hidden_reader_ids:
+                    self.extend(seq, seq + 1)
+            return
 
-        index = model.index(source_row, 0, source_parent)
-        if not index.isValid():
-            return False
+        readers = []
+        for reader_id in model.readerIds():
+            if reader_id in self._hidden_reader_ids:
+                continue
+            readers.append(run for run in model.readerRuns(reader_id) if run[1] > first)
+
+        # ranges of different readers never overlap
+        for (start, end) in heapq.merge(*readers):
+            self.extend(max(start, first), end)
+
+    def extend(self, start: int, end: int):
+        if len(self._ends) > 0 and self._ends[-1] == start:
+            self._ends[-1] = end
+        else:
+            self._starts.append(start)
+            self._ends.append(end)
+            self._offsets.append(self._count)
+        self._count += end - start
+
+    def append(self, start: int, end: int):
+        row = self._count - self._removed
+        self.beginInsertRows(QModelIndex(), row, row + end - start - 1)
+        self.extend(start, end)
+        self.endInsertRows()
+
+    def visibleBefore(self, seq: int) -> int:
+        # visible samples in front of a sample, evicted ones included
+        run = bisect_right(self._starts, seq) - 1
+        if run < 0:
+            return 0
+        return self._offsets[run] + min(seq, self._ends[run]) - self._starts[run]
+
+    def onSourceRowsInserted(self, parent, first, last):
+        model = self.sourceModel()
+        start = model.firstSequence() + first
+        # the rows of one insert belong to the same reader, while searching
+        # they are added once they were matched
+        if self._matches is not None or model.readerIdAt(start) in self._hidden_reader_ids:
+            return
+        self.append(start, model.firstSequence() + last + 1)
+
+    def onSourceRowsAboutToBeRemoved(self, parent, first, last):
+        # the source only drops its oldest rows
+        model = self.sourceModel()
+        self._removing = self.visibleBefore(model.firstSequence() + last + 1) - self._removed
+        if self._removing > 0:
+            self.beginRemoveRows(QModelIndex(), 0, self._removing - 1)
+
+    def onSourceRowsRemoved(self, parent, first, last):
+        if self._removing == 0:
+            return
+        self._removed += self._removing
+        self._removing = 0
+
+        # ranges which were removed completely
+        run = bisect_right(self._ends, self.sourceModel().firstSequence())
+        if run > 1024:
+            del self._starts[:run]
+            del self._ends[:run]
+            del self._offsets[:run]
+        self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count - self._removed
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or column != 0 or row < 0 or row >= self.rowCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxyIndex):
+        model = self.sourceModel()
+        if model is None or not proxyIndex.isValid():
+            return QModelIndex()
+
+        position = self._removed + proxyIndex.row()
+        run = bisect_right(self._offsets, position) - 1
+        seq = self._starts[run] + position - self._offsets[run]
+        return model.index(seq - model.firstSequence(), 0)
+
+    def mapFromSource(self, sourceIndex):
+        model = self.sourceModel()
+        if model is None or not sourceIndex.isValid():
+            return QModelIndex()
 
-        reader_id = model.data(index, model.ReaderIdRole)
-        return reader_id not in self._hidden_reader_ids
+        seq = model.firstSequence() + sourceIndex.row()
+        run = bisect_right(self._starts, seq) - 1
+        if run < 0 or seq >= self._ends[run]:
+            return QModelIndex()
+        return self.createIndex(self._offsets[run] + seq - self._starts[run] - self._removed, 0)
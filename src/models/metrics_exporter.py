@@ -0,0 +1,157 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from PySide6.QtCore import QObject, Qt
+from loguru import logger as logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple
+import threading
+
+from models.discovery_counts import DiscoveryCounts
+from models.statistics_model import PollingThread, COUNTER_METRICS
+from utils.statistics_table import EntityRow
+
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+METRIC_PREFIX = "cyclonedds_insight_"
+STATISTIC_LABELS = ("domain", "host", "process", "topic")
+# label sets per metric family, the rest is summed up as topic="other"
+MAX_LABEL_SETS = 500
+
+METRIC_HELP = {
+    "sent_bytes": "Bytes sent by writers (excluding retransmits).",
+    "received_bytes": "Bytes received by readers (excluding retransmits).",
+    "rexmit_bytes": "Bytes retransmitted by writers.",
+    "n_acks_received": "ACKNACK messages not requesting a retransmit.",
+    "n_nacks_received": "ACKNACK messages requesting a retransmit.",
+    "rexmit_count": "Samples retransmitted.",
+    "n_reliable_readers": "Matched reliable readers."
+}
+
+DISCOVERY_HELP = {
+    "participants": "Discovered participants.",
+    "topics": "Discovered topics.",
+    "readers": "Discovered readers.",
+    "writers": "Discovered writers."
+}
+
+
+def escapeLabelValue(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def formatLabels(names, values) -> str:
+    return ",".join([f"{name}=\"{escapeLabelValue(value)}\"" for name, value in zip(names, values)])
+
+def renderOpenMetrics(rows: List[EntityRow], discovery: Dict[int, Dict[str, int]]) -> str:
+    families: Dict[str, Dict[Tuple[str, ...], float]] = {}
+    for row in rows:
+        labels = (row.domain, row.host, row.process, row.topic)
+        for metric, value in row.values.items():
+            if metric not in families:
+                families[metric] = {}
+            families[metric][labels] = families[metric].get(labels, 0) + value
+
+    lines = []
+    for metric in sorted(families.keys()):
+        name = METRIC_PREFIX + metric
+        isCounter = metric in COUNTER_METRICS
+        lines.append(f"# TYPE {name} {'counter' if isCounter else 'gauge'}")
+        lines.append(f"# HELP {name} {METRIC_HELP.get(metric, metric)}")
+
+        series = families[metric]
+        labelSets = sorted(series.keys())
+        if len(labelSets) > MAX_LABEL_SETS:
+            bounded = {labels: series[labels] for labels in labelSets[:MAX_LABEL_SETS - 1]}
+            other = ("other", "other", "other", "other")
+            bounded[other] = sum([series[labels] for labels in labelSets[MAX_LABEL_SETS - 1:]])
+            series = bounded
+
+        for labels, value in series.items():
+            sampleName = name + "_total" if isCounter else name
+            lines.append(f"{sampleName}{{{formatLabels(STATISTIC_LABELS, labels)}}} {value}")
+
+    for kind in DISCOVERY_HELP.keys():
+        name = METRIC_PREFIX + kind
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"# HELP {name} {DISCOVERY_HELP[kind]}")
+        for domainId in sorted(discovery.keys()):
+            lines.append(f"{name}{{domain=\"{domainId}\"}} {discovery[domainId].get(kind, 0)}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        # renders from the last published references, the collector is never waited for
+        body = renderOpenMetrics(self.server.exporter.statisticRows, self.server.exporter.discovery.counts).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.trace("Metrics exporter: " + (format % args))
+
+
+class MetricsExporter(QObject):
+    # Serves the debug monitor statistics and discovery counts on a local
+    # /metrics endpoint in OpenMetrics format.
+
+    def __init__(self, port: int, host: str = "127.0.0.1", parent=None):
+        super().__init__(parent)
+        self.host = host
+        self.port = port
+        self.server = None
+        self.serverThread = None
+
+        # replaced as a whole on every update, read by the http threads
+        self.statisticRows: List[EntityRow] = []
+
+        self.pollingThread = PollingThread()
+        self.pollingThread.onTable.connect(self.onStatisticTable, Qt.ConnectionType.DirectConnection)
+
+        self.discovery = DiscoveryCounts()
+
+    def start(self):
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        except OSError as e:
+            logging.error(f"Metrics exporter can't listen on {self.host}:{self.port}: {e}")
+            return
+
+        self.server.daemon_threads = True
+        self.server.exporter = self
+        self.serverThread = threading.Thread(target=self.server.serve_forever, name="MetricsExporter", daemon=True)
+        self.serverThread.start()
+        logging.info(f"Metrics exporter listening on http://{self.host}:{self.server.server_address[1]}/metrics")
+
+        self.pollingThread.acquire("metrics")
+        self.discovery.start()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        self.pollingThread.onTable.disconnect(self.onStatisticTable)
+        self.pollingThread.release("metrics")
+
+    def onStatisticTable(self, rows):
+        # called on the polling thread, just swaps the reference
+        self.statisticRows = rows
@@ -0,0 +1,284 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from PySide6.QtCore import QObject, Qt, QThread, Signal, Slot
+from loguru import logger as logging
+from contextlib import ExitStack
+from threading import Event, Lock, Semaphore
+from typing import Dict, Optional, Tuple
+import time
+
+from cyclonedds.topic import Topic
+from cyclonedds.pub import Publisher, DataWriter
+from cyclonedds.util import duration
+
+from dds_access.domain_participant_factory import DomainParticipantFactory
+from dds_access.received_sample import writeSerialized
+from dds_access.dispatcher import MAX_BATCH_SIZE, MAX_BATCH_AGE_SECONDS
+from utils.recording import Recording, RecordingWriter
+
+
+# batches a replay is ahead of the listener
+MAX_PENDING_BATCHES = 8
+# a new writer waits this long for a reader before it publishes
+MATCH_TIMEOUT_SECONDS = 1.0
+
+
+class RecorderThread(QThread):
+    # Writes the received samples to a recording off the gui thread.
+
+    def __init__(self, path: str, parent=None):
+        super().__init__()
+        self.path = path
+        self.running = False
+        self.mutex = Lock()
+        self.wakeup = Event()
+        self.pending = [] # (readerId, (domainId, topicName, typeName), samples)
+        self.topicIds: Dict[str, int] = {}
+
+    def add(self, readerId: str, reader: Tuple[int, str, str], samples):
+        with self.mutex:
+            self.pending.append((readerId, reader, samples))
+        self.wakeup.set()
+
+    def start(self):
+        # set before the thread runs, a stop() right after start() isn't undone
+        self.running = True
+        super().start()
+
+    def run(self):
+        try:
+            writer = RecordingWriter(self.path)
+        except Exception as e:
+            logging.error(f"Failed to create recording {self.path}: {e}")
+            return
+
+        logging.info(f"Recording to {self.path} ...")
+        while True:
+            with self.mutex:
+                pending = self.pending
+                self.pending = []
+                self.wakeup.clear()
+
+            for (readerId, (domainId, topicName, typeName), samples) in pending:
+                if readerId not in self.topicIds:
+                    self.topicIds[readerId] = writer.addTopic(domainId, topicName, typeName, samples[0].dataType)
+                writer.append(self.topicIds[readerId], samples)
+
+            if not self.running and len(pending) == 0:
+                break
+            if len(pending) == 0:
+                self.wakeup.wait(0.1) # fast exit
+
+        writer.close()
+        logging.info(f"Recording to {self.path} ... DONE, {writer.count} samples")
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+
+class ReplayThread(QThread):
+    # Replays a recording into the listener or publishes it with a
+    # DataWriter per topic. Samples are paced by their reception time,
+    # divided by speed, a speed of 0 replays as fast as possible. Batches
+    # for the listener wait for the previous ones to be taken, so that a
+    # fast replay doesn't pile up in the event queue.
+
+    onData = Signal(str, object)
+
+    def __init__(self, path: str, speed: float, publish: bool, parent=None):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.publish = publish
+        self.running = False
+        self.wakeup = Event()
+        self.pendingBatches = Semaphore(MAX_PENDING_BATCHES)
+
+    def start(self):
+        # set before the thread runs, a stop() right after start() isn't undone
+        self.running = True
+        super().start()
+
+    def run(self):
+        try:
+            recording = Recording(self.path)
+        except Exception as e:
+            logging.error(f"Failed to open recording {self.path}: {e}")
+            return
+
+        logging.info(f"Replay {len(recording)} samples from {self.path} ...")
+        with ExitStack() as stack:
+            participants = {}
+            writers = {}
+            batches = {} # readerId -> (time of the first sample, samples)
+            start = time.monotonic()
+            first = None
+
+            for (number, (topicId, sample)) in enumerate(recording.samples()):
+                if not self.running:
+                    break
+
+                if self.speed > 0:
+                    if first is None:
+                        first = sample.timestamp
+                    due = start + (sample.timestamp - first) / self.speed
+                    while self.running and time.monotonic() < due:
+                        self.sendBatches(batches, time.monotonic() - MAX_BATCH_AGE_SECONDS)
+                        self.wakeup.wait(min(due - time.monotonic(), 0.1))
+
+                if self.publish:
+                    if sample.info is not None:
+                        continue # disposes and unregisters aren't published
+                    writer = writers.get(topicId)
+                    if writer is None:
+                        created = time.monotonic()
+                        writer = self.createWriter(recording, topicId, participants, stack)
+                        writers[topicId] = writer
+                        start += time.monotonic() - created # the replay is paused meanwhile
+                    if writer is not False:
+                        writeSerialized(writer, sample.data)
+                    continue
+
+                if sample.readerId not in batches:
+                    batches[sample.readerId] = (time.monotonic(), [])
+                batches[sample.readerId][1].append(sample)
+                if len(batches[sample.readerId][1]) >= MAX_BATCH_SIZE:
+                    self.emitBatch(sample.readerId, batches.pop(sample.readerId)[1])
+                elif number % MAX_BATCH_SIZE == 0:
+                    self.sendBatches(batches, time.monotonic() - MAX_BATCH_AGE_SECONDS)
+
+            self.sendBatches(batches, None)
+            for writer in writers.values():
+                if writer is not False:
+                    writer.wait_for_acks(duration(seconds=1))
+            writers.clear()
+
+        recording.close()
+        logging.info(f"Replay from {self.path} ... DONE")
+
+    def createWriter(self, recording: Recording, topicId: int, participants, stack: ExitStack):
+        # False if the topic can't be published
+        topic = recording.topics[topicId]
+        dataType = recording.dataType(topicId)
+        if dataType is None:
+            logging.error(f"Type of {topic.topicName} unknown, it isn't published")
+            return False
+        try:
+            if topic.domainId not in participants:
+                participants[topic.domainId] = stack.enter_context(DomainParticipantFactory.get_participant(topic.domainId))
+            participant = participants[topic.domainId]
+            writer = DataWriter(Publisher(participant), Topic(participant, topic.topicName, dataType))
+            timeout = time.monotonic() + MATCH_TIMEOUT_SECONDS
+            while self.running and len(writer.get_matched_subscriptions()) == 0 and time.monotonic() < timeout:
+                self.wakeup.wait(0.01)
+            return writer
+        except Exception as e:
+            logging.error(f"Failed to create writer for {topic.topicName}: {e}")
+            return False
+
+    def sendBatches(self, batches, startedBefore):
+        for readerId in list(batches.keys()):
+            (started, samples) = batches[readerId]
+            if startedBefore is None or started <= startedBefore:
+                del batches[readerId]
+                self.emitBatch(readerId, samples)
+
+    def emitBatch(self, readerId: str, samples):
+        while self.running and not self.pendingBatches.acquire(timeout=0.1):
+            pass # fast exit
+        if self.running:
+            self.onData.emit(readerId, samples)
+
+    def batchTaken(self):
+        self.pendingBatches.release()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+
+class RecordingModel(QObject):
+    # Records the samples of the listener and replays recordings.
+
+    recordingChanged = Signal(bool)
+    replayingChanged = Signal(bool)
+    replayData = Signal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # readerId -> (domainId, topicName, typeName)
+        self.readers: Dict[str, Tuple[int, str, str]] = {}
+        self.recorder: Optional[RecorderThread] = None
+        self.replay: Optional[ReplayThread] = None
+
+    @Slot(str, int, str, str, object)
+    def addReader(self, id: str, domainId, topic_name, topic_type: str, qos):
+        self.readers[id] = (domainId, topic_name, topic_type)
+
+    @Slot(str, object)
+    def addReceivedMsgs(self, readerId, samples):
+        if self.recorder is not None and len(samples) > 0:
+            self.recorder.add(readerId, self.readers.get(readerId, (-1, readerId, "")), samples)
+
+    @Slot(str)
+    def startRecording(self, path: str):
+        self.stopRecording()
+        self.recorder = RecorderThread(path)
+        self.recorder.start()
+        self.recordingChanged.emit(True)
+
+    @Slot()
+    def stopRecording(self):
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder.wait()
+            self.recorder = None
+            self.recordingChanged.emit(False)
+
+    @Slot(str, float, bool)
+    def startReplay(self, path: str, speed: float, publish: bool):
+        self.stopReplay()
+        self.replay = ReplayThread(path, speed, publish)
+        self.replay.onData.connect(self.onReplayData, Qt.ConnectionType.QueuedConnection)
+        self.replay.finished.connect(self.onReplayFinished, Qt.ConnectionType.QueuedConnection)
+        self.replay.start()
+        self.replayingChanged.emit(True)
+
+    @Slot()
+    def stopReplay(self):
+        if self.replay is not None:
+            self.replay.stop()
+            self.replay.wait()
+            self.replay = None
+            self.replayingChanged.emit(False)
+
+    @Slot(str, object)
+    def onReplayData(self, readerId, samples):
+        self.replayData.emit(readerId, samples)
+        if self.replay is not None:
+            self.replay.batchTaken()
+
+    @Slot()
+    def onReplayFinished(self):
+        if self.replay is not None and self.replay.isFinished():
+            self.replay = None
+            self.replayingChanged.emit(False)
+
+    @Slot(result=bool)
+    def isRecording(self) -> bool:
+        return self.recorder is not None
+
+    def shutdown(self):
+        self.stopReplay()
+        self.stopRecording()
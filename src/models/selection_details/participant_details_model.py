@@ -12,12 +12,16 @@
 
 from PySide6.QtCore import Qt, QAbstractItemModel, Qt, Slot, Signal
 from dds_access import dds_data
+from dds_access.dds_utils import getDebugMonitorAddress
+from dds_access.debug_monitor import debugMonitorUrl
+from dds_access.debug_monitor_collector import DebugMonitorCollector
 import uuid
 
 
 class ParticipantDetailsModel(QAbstractItemModel):
 
     updateQosSignal = Signal(str)
+    updateMonitorHealthSignal = Signal("QVariantMap")
     requestParticipantByKeySignal = Signal(str, int, str)
 
     def __init__(self, parent=None):
@@ -25,6 +29,7 @@ class ParticipantDetailsModel(QAbstractItemModel):
 
         self.requestIds = set()
         self.domainId = -1
+        self.monitorUrl = None
 
         self.dds_data = dds_data.DdsData()
 
@@ -33,6 +38,9 @@ class ParticipantDetailsModel(QAbstractItemModel):
         # From dds_data to self
         self.dds_data.response_participant_by_key.connect(self.receive_participant, Qt.ConnectionType.QueuedConnection)
 
+        self.collector = DebugMonitorCollector()
+        self.collector.healthChanged.connect(self.monitorHealthChanged, Qt.ConnectionType.QueuedConnection)
+
     @Slot(int, str)
     def start(self, domainId, pkey):
         self.domainId = domainId
@@ -52,3 +60,20 @@ class ParticipantDetailsModel(QAbstractItemModel):
                 split += "\n"
 
         self.updateQosSignal.emit(split)
+
+        address = getDebugMonitorAddress(participant)
+        if address:
+            (ip, port) = address
+            self.monitorUrl = debugMonitorUrl(ip, port)
+            health = self.collector.endpointHealth(self.monitorUrl)
+            if health:
+                self.updateMonitorHealthSignal.emit(health)
+            else:
+                self.updateMonitorHealthSignal.emit({"state": "idle"})
+        else:
+            self.updateMonitorHealthSignal.emit({"state": "none"})
+
+    @Slot(str, "QVariantMap")
+    def monitorHealthChanged(self, url: str, fields: dict):
+        if url == self.monitorUrl:
+            self.updateMonitorHealthSignal.emit(fields)
@@ -10,40 +10,116 @@
  * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
 """
 
-from PySide6.QtCore import Qt, QModelIndex, Qt, QThread, Signal, Slot, QAbstractTableModel, QLocale
+from PySide6.QtCore import Qt, QModelIndex, Qt, QThread, Signal, Slot, QAbstractTableModel, QLocale, QPointF
 from PySide6.QtGui import QColor
+from PySide6.QtCharts import QXYSeries
 from loguru import logger as logging
 import uuid
-import requests
-import json
-from dds_access import dds_data
-from cyclonedds.builtin import DcpsParticipant
 from dds_access import dds_utils
-from dds_access.dds_utils import getProperty, DEBUG_MONITORS, getAppName, getHostname
+from dds_access.debug_monitor import debugMonitorUrl
+from dds_access.debug_monitor_collector import DebugMonitorCollector, DebugMonitorSnapshot, MAX_ADAPTIVE_INTERVAL_SECONDS
 import random
 import colorsys
 import datetime
 import time
 from threading import Lock
-
-
+from queue import Empty
+from utils.time_series import TimeSeriesStore
+from utils.rate_engine import RateEngine, RateSample
+from utils.statistics_table import StatisticsTable, EntityRow, InterestSet
+from utils.top_talkers import TopTalkers
+from models.top_talkers_model import TopTalkersModel
+from models.discovery_counts import DiscoveryCounts
+from utils.singleton import singleton
+
+
+# counters which can be shown as rate, everything else is a gauge
+COUNTER_METRICS = set(["sent_bytes", "received_bytes", "rexmit_bytes", "n_acks_received", "n_nacks_received", "rexmit_count"])
+
+# metric name and its path in the debug monitor json per entity kind
+ENTITY_METRICS = {
+    "writer": [
+        ("sent_bytes", ("sent_bytes",)),
+        ("rexmit_bytes", ("rexmit_bytes",)),
+        ("n_acks_received", ("ack", "n_acks_received")),
+        ("n_nacks_received", ("ack", "n_nacks_received")),
+        ("rexmit_count", ("ack", "rexmit_count")),
+        ("n_reliable_readers", ("heartbeat", "n_reliable_readers"))
+    ],
+    "reader": [
+        ("received_bytes", ("received_bytes",))
+    ]
+}
+
+# name: (dimension, metric) ranked by rate
+TOP_TALKERS = {
+    "writers_by_sent_bytes": ("writer", "sent_bytes"),
+    "topics_by_rexmit_bytes": ("topic", "rexmit_bytes")
+}
+TOP_N = 20
+
+UNIT_METRICS = ["sent_bytes", "received_bytes", "rexmit_bytes", "n_acks_received", "n_nacks_received", "rexmit_count", "n_reliable_readers"]
+
+
+@singleton
 class PollingThread(QThread):
-
-    onData = Signal(str, object, object)
+    # The statistics of all debug monitors, shared by the statistics view,
+    # the metrics exporter and the alerts: one poll and one rate engine for
+    # all of them. While the view is its only user, only what it displays is
+    # polled at full rate, the rest is refreshed in the background.
+
+    onData = Signal(object, object)
+    onTable = Signal(object)
+    onTopTalkers = Signal(str, object)
     error = Signal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self):
         super().__init__()
         self.running = False
+        self.users = set()
+        self.consumerId = str(uuid.uuid4())
+        self.collector = DebugMonitorCollector()
         self.mutex = Lock()
         self.color_mapping = {}
         self.pollIntervalSeconds = 3
         self.aggregateBy = "writer"
         self.aggregateByRequest = self.aggregateBy
+        self.mode = "cumulative"
+        self.modeRequest = self.mode
+        self.rates = RateEngine()
+        self.table = StatisticsTable()
+        self.publishAggregates = False
+        self.topTalkers = {name: TopTalkers() for name in TOP_TALKERS.keys()}
+        self.interest = InterestSet()
+        self.interestChanged = False
+        self.focusUrls = None
+        self.rowsByUrl = {}
         self.dgbPorts = {}
         self.dgbPortsRequest = self.dgbPorts
         self.dgbPortChangeRequest = False
 
+        self.discovery = DiscoveryCounts()
+        self.discovery.dbgPortsChanged.connect(self.setDbgPorts)
+
+    def acquire(self, user: str):
+        # runs as long as anyone uses the statistics
+        with self.mutex:
+            self.users.add(user)
+            self.interestChanged = True
+        if not self.running:
+            self.setDbgPorts(self.discovery.dgbPorts)
+            self.running = True
+            self.start()
+            self.discovery.start()
+
+    def release(self, user: str):
+        with self.mutex:
+            self.users.discard(user)
+            self.interestChanged = True
+        if len(self.users) == 0 and self.running:
+            self.stop()
+            self.wait()
+
     def getRandomColor(self):
         h = random.random()
         s = random.uniform(0.5, 1.0)  # not too gray
@@ -51,41 +127,22 @@ class PollingThread(QThread):
         r, g, b = colorsys.hsv_to_rgb(h, s, v)
         return (int(r * 255), int(g * 255), int(b * 255))
 
-    def poll(self):
-        logging.trace("Debug monitor timer triggered")
-
-        ag_sent_bytes = {}
-        ag_received_bytes = {}
-        ag_rexmit_bytes = {}
-        ag_n_nacks_received = {}
-        ag_rexmit_count = {}
-        ag_n_acks_received = {}
-        ag_n_reliable_readers = {}
-
-        already_processed_ip_port = []
-        for participant_key in self.dgbPorts.keys():
-            (ip, port, _, _, _) = self.dgbPorts[participant_key]
-            if f"{ip}:{port}" in already_processed_ip_port:
-                logging.trace(f"skip {ip}:{port} - already processed.")
+    def poll(self, snapshot: DebugMonitorSnapshot):
+        logging.trace("Debug monitor snapshot received")
+
+        rows = []
+        rowsByUrl = {}
+        for url in self.dbgUrls():
+            if url not in snapshot.results:
+                continue # added after this snapshot was taken
+            result = snapshot.results[url]
+            logging.trace(f"Fetched {url} in {result.latency:.3f} seconds")
+            if result.error is not None:
+                logging.error(result.error)
+                self.error.emit("[" + datetime.datetime.now().isoformat() + "] " + url + " " + result.error)
                 continue
-            already_processed_ip_port.append(f"{ip}:{port}")
 
-            json_data = {}
-            try:
-                url = "http://" + ip + ":" + port + "/"
-                logging.trace(f"Downloading JSON from: {url}")
-                headers = {
-                    'Connection': 'close'
-                }
-                response = requests.get(url, timeout=(3, 5), verify=False, headers=headers)
-                logging.trace(f"Response code: {str(response.status_code)}")
-                response.raise_for_status()
-                json_data = response.json()
-                # logging.trace(json.dumps(json_data, indent=4))
-            except Exception as e:
-                logging.error(str(e))
-                self.error.emit("[" + datetime.datetime.now().isoformat() + "] " + url + " " + str(e))
-                continue
+            json_data = result.json_data
 
             if "participants" in json_data:
                 for participant in json_data["participants"]:
@@ -96,110 +153,136 @@ class PollingThread(QThread):
 
                     (_, _, appName, host, domainId) = self.dgbPorts[pKeyCurrent]
 
-                    aggkey = "undefined"
-                    if self.aggregateBy == "domain":
-                        aggkey = str(domainId)
-                    if self.aggregateBy == "process":
-                        aggkey = appName
-                    if self.aggregateBy == "host":
-                        aggkey = host
-                    if self.aggregateBy == "participant":
-                        aggkey = pKeyCurrent
-
-                    if "writers" in participant:
-                        for writer in participant["writers"]:
-                            if self.aggregateBy == "writer":
-                                aggkey = dds_utils.normalizeGuid(writer["guid"])
-                            if self.aggregateBy == "topic":
-                                topic = writer["topic"]
-                                aggkey = topic
-
-                            if aggkey not in self.color_mapping:
-                                self.color_mapping[aggkey] = self.getRandomColor()
-
-                            if "rexmit_bytes" in writer:
-                                if aggkey in ag_rexmit_bytes:
-                                    ag_rexmit_bytes[aggkey] += writer["rexmit_bytes"]
-                                else:
-                                    ag_rexmit_bytes[aggkey] = writer["rexmit_bytes"]
-
-                            if "sent_bytes" in writer:
-                                if aggkey in ag_sent_bytes:
-                                    ag_sent_bytes[aggkey] += writer["sent_bytes"]
-                                else:
-                                    ag_sent_bytes[aggkey] = writer["sent_bytes"]
-
-                            if "ack" in writer:
-                                ack = writer["ack"]
-                                if "n_acks_received" in ack:
-                                    if aggkey in ag_n_acks_received:
-                                        ag_n_acks_received[aggkey] += ack["n_acks_received"]
-                                    else:
-                                        ag_n_acks_received[aggkey] = ack["n_acks_received"]
-                                if "n_nacks_received" in ack:
-                                    if aggkey in ag_n_nacks_received:
-                                        ag_n_nacks_received[aggkey] += ack["n_nacks_received"]
-                                    else:
-                                        ag_n_nacks_received[aggkey] = ack["n_nacks_received"]
-                                if "rexmit_count" in ack:
-                                    if aggkey in ag_rexmit_count:
-                                        ag_rexmit_count[aggkey] += ack["rexmit_count"]
-                                    else:
-                                        ag_rexmit_count[aggkey] = ack["rexmit_count"]
-
-                            if "heartbeat" in writer:
-                                heartbeat = writer["heartbeat"]
-                                if "n_reliable_readers" in heartbeat:
-                                    if aggkey in ag_n_reliable_readers:
-                                        ag_n_reliable_readers[aggkey] += heartbeat["n_reliable_readers"]
-                                    else:
-                                        ag_n_reliable_readers[aggkey] = heartbeat["n_reliable_readers"]
-
-                    if "readers" in participant:
-                        for reader in participant["readers"]:
-                            if self.aggregateBy == "reader":
-                                aggkey = dds_utils.normalizeGuid(reader["guid"])
-                            if self.aggregateBy == "topic":
-                                topic = reader["topic"]
-                                aggkey = topic
-
-                            if aggkey not in self.color_mapping:
-                                self.color_mapping[aggkey] = self.getRandomColor()
-
-                            if "received_bytes" in reader:
-                                if aggkey in ag_received_bytes:
-                                    ag_received_bytes[aggkey] += reader["received_bytes"]
-                                else:
-                                    ag_received_bytes[aggkey] = reader["received_bytes"]
-
-        self.onData.emit("sent_bytes", ag_sent_bytes.copy(), self.color_mapping.copy())
-        self.onData.emit("received_bytes", ag_received_bytes.copy(), self.color_mapping.copy())
-        self.onData.emit("rexmit_bytes", ag_rexmit_bytes.copy(), self.color_mapping.copy())
-        self.onData.emit("n_acks_received", ag_n_acks_received.copy(), self.color_mapping.copy())
-        self.onData.emit("n_nacks_received", ag_n_nacks_received.copy(), self.color_mapping.copy())
-        self.onData.emit("rexmit_count", ag_rexmit_count.copy(), self.color_mapping.copy())
-        self.onData.emit("n_reliable_readers", ag_n_reliable_readers.copy(), self.color_mapping.copy())
+                    for kind, entities in (("writer", participant.get("writers", [])), ("reader", participant.get("readers", []))):
+                        for entity in entities:
+                            row = EntityRow(kind, dds_utils.normalizeGuid(entity["guid"]), str(domainId), host, appName, pKeyCurrent, entity.get("topic", ""))
+                            for (metric, path) in ENTITY_METRICS[kind]:
+                                value = entity
+                                for step in path:
+                                    value = value.get(step) if isinstance(value, dict) else None
+                                if value is None:
+                                    continue
+                                row.values[metric] = value
+                                if metric in COUNTER_METRICS:
+                                    # rates are computed per entity and summed up later, a restarted
+                                    # process can only reset its own entities and not the aggregate
+                                    sample = self.rates.update((metric, row.guid), value, result.timestamp)
+                                    row.rates[metric] = sample if sample else RateSample(0.0, 0.0)
+                            rows.append(row)
+                            rowsByUrl.setdefault(url, []).append(row)
+
+        # forget entities which are gone for a while, slow endpoints are
+        # only fetched every MAX_ADAPTIVE_INTERVAL_SECONDS
+        self.rates.expire(snapshot.timestamp - max(10 * self.pollIntervalSeconds, 2 * MAX_ADAPTIVE_INTERVAL_SECONDS))
+
+        self.rowsByUrl = rowsByUrl
+        self.updateFocus()
+
+        self.table.replace(rows)
+        self.onTable.emit(rows)
+        self.publish()
+        self.updateTopTalkers(rows)
+
+    def updateTopTalkers(self, rows):
+        if not self.publishAggregates:
+            return
+
+        for name, (dimension, metric) in TOP_TALKERS.items():
+            tracker = self.topTalkers[name]
+            perEntity = dimension in ("writer", "reader")
+            for row in rows:
+                if metric not in row.rates or (perEntity and row.kind != dimension):
+                    continue
+                label = f"{row.topic} ({row.process}@{row.host})" if perEntity else ""
+                tracker.update(row.guid, row.dimension(dimension), row.rates[metric].rate, label)
+            tracker.endPoll()
+            self.onTopTalkers.emit(name, tracker.top(TOP_N))
+
+    def updateFocus(self):
+        # only endpoints which contribute to what is displayed are polled at
+        # full rate, the collector refreshes the others in the background
+        with self.mutex:
+            self.interestChanged = False
+            # the exporter and the alerts need everything at full rate, the
+            # focus of the view only applies while it is the only user
+            if not self.publishAggregates or self.users != {"statistics"} or self.interest.isEverything():
+                focus = None
+            else:
+                focus = set()
+                for participantKey, (ip, port, appName, host, domainId) in self.dgbPorts.items():
+                    url = debugMonitorUrl(ip, port)
+                    if url in self.rowsByUrl:
+                        if any([self.interest.matches(row) for row in self.rowsByUrl[url]]):
+                            focus.add(url)
+                    elif self.interest.mayMatch({"domain": str(domainId), "host": host, "process": appName, "participant": participantKey}):
+                        focus.add(url) # not fetched yet
+
+        if focus != self.focusUrls:
+            logging.trace(f"Statistics focus on {'all' if focus is None else len(focus)} debug monitors")
+            self.focusUrls = focus
+            self.collector.setConsumerUrls(self.consumerId, set(self.dbgUrls()), focus)
+
+    def publish(self):
+        if not self.publishAggregates:
+            return
+
+        aggregated = self.table.aggregate(self.aggregateBy, self.mode)
+        units = {}
+        for metric in UNIT_METRICS:
+            units[metric] = aggregated.get(metric, {})
+            for aggkey in units[metric].keys():
+                if aggkey not in self.color_mapping:
+                    self.color_mapping[aggkey] = self.getRandomColor()
 
+        # one payload per poll for all units
+        self.onData.emit(units, self.color_mapping.copy())
+
+    def dbgUrls(self):
+        urls = []
+        for participant_key in self.dgbPorts.keys():
+            (ip, port, _, _, _) = self.dgbPorts[participant_key]
+            url = debugMonitorUrl(ip, port)
+            if url not in urls:
+                urls.append(url)
+        return urls
 
     def run(self):
-        self.running = True
+        snapshots = self.collector.addConsumer(self.consumerId, self.pollIntervalSeconds)
+        self.collector.setConsumerUrls(self.consumerId, set(self.dbgUrls()), self.focusUrls)
 
-        start_time = time.monotonic()
         while self.running:
+            with self.mutex:
+                republish = False
+                if self.aggregateByRequest != self.aggregateBy:
+                    self.color_mapping.clear()
+                    self.aggregateBy = self.aggregateByRequest
+                    self.interest.clearHidden()
+                    self.interestChanged = True
+                    republish = True
+                if self.modeRequest != self.mode:
+                    self.mode = self.modeRequest
+                    republish = True
+                if self.dgbPortChangeRequest:
+                    self.dgbPorts = self.dgbPortsRequest.copy()
+                    self.dgbPortChangeRequest = False
+                    self.collector.setConsumerUrls(self.consumerId, set(self.dbgUrls()), self.focusUrls)
+                refocus = self.interestChanged
+
+            if refocus:
+                self.updateFocus()
+
+            if republish:
+                # aggregate the rows of the last poll, no need to wait for the next one
+                self.publish()
 
-            if time.monotonic() - start_time >= self.pollIntervalSeconds:
-                with self.mutex:
-                    if self.aggregateByRequest != self.aggregateBy:
-                        self.color_mapping.clear()
-                        self.aggregateBy = self.aggregateByRequest
-                    if self.dgbPortChangeRequest:
-                        self.dgbPorts = self.dgbPortsRequest.copy()
-                
-                self.poll()
-                start_time = time.monotonic()  # reset the timer
-            else:
-                time.sleep(0.1) # fast exit
+            try:
+                snapshot = snapshots.get(timeout=0.1) # fast exit
+            except Empty:
+                continue
 
+            self.poll(snapshot)
+
+        self.collector.removeConsumer(self.consumerId)
         logging.trace("Statistics-Polling thread stopped")
 
     def stop(self):
@@ -211,6 +294,7 @@ class PollingThread(QThread):
     def setInterval(self, seconds):
         logging.trace(f"Set update interval to: {seconds} seconds")
         self.pollIntervalSeconds = seconds
+        self.collector.setConsumerInterval(self.consumerId, seconds)
 
     def setDbgPorts(self, dgbPorts):
         with self.mutex:
@@ -222,6 +306,26 @@ class PollingThread(QThread):
             logging.trace(f"Set aggregateByRequest to: {aggre}")
             self.aggregateByRequest = aggre
 
+    def setMode(self, mode: str):
+        with self.mutex:
+            logging.trace(f"Set modeRequest to: {mode}")
+            self.modeRequest = mode
+
+    def setPublishAggregates(self, publish: bool):
+        with self.mutex:
+            self.publishAggregates = publish
+            self.interestChanged = True
+
+    def setInterest(self, dimension: str, keys):
+        with self.mutex:
+            self.interest.setIncluded(dimension, keys)
+            self.interestChanged = True
+
+    def setItemHidden(self, aggkey: str, hidden: bool):
+        with self.mutex:
+            self.interest.setHidden(self.aggregateByRequest, aggkey, hidden)
+            self.interestChanged = True
+
     def changeColor(self, aggkey: str, color: QColor):
         with self.mutex:
             if aggkey in self.color_mapping:
@@ -231,7 +335,6 @@ class PollingThread(QThread):
 class StatisticsModel(QAbstractTableModel):
 
     newData = Signal(str, str, int, int, int, int)
-    requestParticipants = Signal(str)
     statisticError = Signal(str)
 
     NameRole = Qt.UserRole + 1
@@ -250,19 +353,13 @@ class StatisticsModel(QAbstractTableModel):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.dgbPorts = {}
         self.data_list = {} 
+        self.mode = "cumulative"
 
-        self.pollingThread = PollingThread(self)
+        self.pollingThread = PollingThread()
         self.pollingThread.error.connect(self.statisticError)
-
-        self.dds_data = dds_data.DdsData()
-        self.requestParticipants.connect(self.dds_data.requestParticipants, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.new_participant_signal.connect(self.new_participant_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.response_participants_signal.connect(self.response_participants_slot, Qt.ConnectionType.QueuedConnection)
-        self.dds_data.removed_participant_signal.connect(self.removed_participant_slot, Qt.ConnectionType.QueuedConnection)
-
-        self.request_ids = []
+        self.pollingThread.onTopTalkers.connect(self.onTopTalkers, Qt.ConnectionType.QueuedConnection)
+        self.topTalkerModels = {name: TopTalkersModel(self) for name in TOP_TALKERS.keys()}
 
         self.unitModels = {}
         self.unitModels["sent_bytes"] = StatisticsUnitModel(self.pollingThread, "sent_bytes")
@@ -308,17 +405,8 @@ class StatisticsModel(QAbstractTableModel):
     def startStatistics(self):
 
         logging.info("Start statistics model")
-
-        if self.pollingThread.isRunning():
-            self.pollingThread.stop()
-            self.pollingThread.wait()
-
-        self.pollingThread.setDbgPorts(self.dgbPorts)
-        self.pollingThread.start()
-
-        reqId = str(uuid.uuid4())
-        self.request_ids.append(reqId)
-        self.requestParticipants.emit(reqId)
+        self.pollingThread.setPublishAggregates(True)
+        self.pollingThread.acquire("statistics")
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.unitModels)
@@ -347,6 +435,8 @@ class StatisticsModel(QAbstractTableModel):
                 return "n/a"
         elif role == self.UnitNameRole:
             if key in self.unitDescriptions:
+                if self.mode != "cumulative" and key in COUNTER_METRICS:
+                    return self.unitDescriptions[key]["unit"] + "/s"
                 return self.unitDescriptions[key]["unit"]
             else:
                 return "n/a"
@@ -362,47 +452,11 @@ class StatisticsModel(QAbstractTableModel):
                 return headers[section]
         return None
 
-    @Slot(int, DcpsParticipant)
-    def new_participant_slot(self, domain_id: int, participant: DcpsParticipant):
-
-        dbg_mon_str: str = getProperty(participant, DEBUG_MONITORS)
-        appName: str = getAppName(participant)
-        host: str = getHostname(participant)
-
-        splitProtoAdr = dbg_mon_str.split("/")
-        if len(splitProtoAdr) > 0:
-            if splitProtoAdr[0] == "tcp":
-                splitIpPort = splitProtoAdr[1].split(":")
-                if len(splitIpPort) > 1:
-                    ip = splitIpPort[0]
-                    port = splitIpPort[1]
-                    self.dgbPorts[str(participant.key)] = (ip, port, appName, host, domain_id)
-
-        self.pollingThread.setDbgPorts(self.dgbPorts)
-
-    @Slot(str, int, object)
-    def response_participants_slot(self, request_id: str, domain_id: int, participants):
-        if request_id not in self.request_ids:
-            return
-
-        for participant in participants:
-            self.new_participant_slot(domain_id, participant)
-
-        self.request_ids.remove(request_id)
-
-    @Slot(int, str)
-    def removed_participant_slot(self, domain_id: int, participant_key: str):
-        if participant_key in self.dgbPorts:
-            del self.dgbPorts[participant_key]
-        self.pollingThread.setDbgPorts(self.dgbPorts)
-
     @Slot()
     def stop(self):
         logging.trace("Stop statistics model")
-        if self.pollingThread:
-            if self.pollingThread.stillRunning():
-                self.pollingThread.stop()
-                self.pollingThread.wait()
+        self.pollingThread.setPublishAggregates(False)
+        self.pollingThread.release("statistics")
 
     @Slot(int)
     def setUpdateInterval(self, interval: int):
@@ -412,6 +466,13 @@ class StatisticsModel(QAbstractTableModel):
     def setAggregation(self, aggre: str):
         self.pollingThread.setAggregation(aggre.lower())
 
+    @Slot(str)
+    def setMode(self, mode: str):
+        self.mode = mode.lower()
+        self.pollingThread.setMode(self.mode)
+        if self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, 0), [self.UnitNameRole])
+
     @Slot()
     def clearStatistics(self):
         for key in self.unitModels.keys():
@@ -425,13 +486,29 @@ class StatisticsModel(QAbstractTableModel):
         for k in self.unitModels.keys():
             self.unitModels[k].updateColors(item, color)
 
+    @Slot(str, object)
+    def onTopTalkers(self, name: str, items):
+        if name in self.topTalkerModels:
+            self.topTalkerModels[name].setItems(items)
+
+    @Slot(str, result=TopTalkersModel)
+    def topTalkers(self, name: str):
+        return self.topTalkerModels.get(name)
+
     @Slot(str, bool)
     def setItemVisible(self, item: str, isVisible: bool):
         for k in self.unitModels.keys():
             self.unitModels[k].setItemVisible(item, isVisible)
+        self.pollingThread.setItemHidden(item, not isVisible)
+
+    @Slot(str, list)
+    def setInterest(self, dimension: str, keys: list):
+        # limits the full rate polling to these keys of the dimension (domain,
+        # topic, process, ...), an empty list removes the limit
+        self.pollingThread.setInterest(dimension.lower(), set([str(k) for k in keys]) if len(keys) > 0 else None)
 
 class StatisticsUnitModel(QAbstractTableModel):
-    newData = Signal(str, float, int, int, int, bool)
+    newData = Signal(list, bool)
 
     NameRole = Qt.UserRole + 1
     ValueRole = Qt.UserRole + 2
@@ -455,9 +532,11 @@ class StatisticsUnitModel(QAbstractTableModel):
     def __init__(self, pollingThread, prop, parent=None):
         super().__init__(parent)
         self.data_list = []
+        self.rowByKey = {}
         self.visibleItems = {}
         self.prop = prop
         self.clearOnNextData = False
+        self.history = TimeSeriesStore()
         self.pollingThread = pollingThread
         self.pollingThread.onData.connect(self.onAggregatedData, Qt.ConnectionType.QueuedConnection)
 
@@ -507,36 +586,101 @@ class StatisticsUnitModel(QAbstractTableModel):
                 return headers[section]
         return None
 
-    @Slot(str, object, object)
-    def onAggregatedData(self, prop, aggregated_data, color_mapping):
-        if prop != self.prop:
+    @Slot(object, object)
+    def onAggregatedData(self, aggregated_units, color_mapping):
+        if self.prop not in aggregated_units:
             return
 
-        logging.trace(f"New data received {prop}: {str(len(aggregated_data))}")
-        self.beginResetModel()
-        self.data_list.clear()
+        aggregated_data = aggregated_units[self.prop]
+        logging.trace(f"New data received {self.prop}: {str(len(aggregated_data))}")
+        if self.clearOnNextData:
+            self.history.clear()
+
+        now = time.time()
+        items = []
         for topc_guid in aggregated_data.keys():
             value = float(aggregated_data[topc_guid]) # in qml there is no uint64, so we use float aka. double in qml
             (r, g, b) = color_mapping[topc_guid]
-            self.newData.emit(topc_guid, value, r, g, b, self.clearOnNextData)
-            self.data_list.append([topc_guid, value, r, g, b])
+            self.history.add(self.prop, topc_guid, now, value)
+            items.append([topc_guid, value, r, g, b])
             self.visibleItems[topc_guid] = True if topc_guid not in self.visibleItems else self.visibleItems[topc_guid]
-        self.endResetModel()
+
+        self.updateRows(items)
+        self.newData.emit(items, self.clearOnNextData)
 
         self.clearOnNextData = False
 
+    def updateRows(self, items):
+        newKeys = set([item[0] for item in items])
+        vanishedRows = [row for key, row in self.rowByKey.items() if key not in newKeys]
+
+        if len(self.data_list) > 0 and len(vanishedRows) == len(self.data_list):
+            # nothing left to keep, e.g. after the aggregation changed
+            self.beginResetModel()
+            self.data_list = [list(item) for item in items]
+            self.rowByKey = {item[0]: row for row, item in enumerate(self.data_list)}
+            self.endResetModel()
+            return
+
+        # remove from the back, the remaining row numbers stay valid
+        for row in sorted(vanishedRows, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.data_list[row]
+            self.endRemoveRows()
+        if len(vanishedRows) > 0:
+            self.rowByKey = {item[0]: row for row, item in enumerate(self.data_list)}
+
+        changedRows = []
+        insertItems = []
+        for item in items:
+            if item[0] in self.rowByKey:
+                row = self.rowByKey[item[0]]
+                if self.data_list[row] != item:
+                    self.data_list[row][1:] = item[1:]
+                    changedRows.append(row)
+            else:
+                insertItems.append(list(item))
+
+        for (first, last) in self.rowRanges(changedRows):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1), [Qt.DisplayRole, self.ValueRole, self.RoleColorR, self.RoleColorG, self.RoleColorB])
+
+        if len(insertItems) > 0:
+            first = len(self.data_list)
+            self.beginInsertRows(QModelIndex(), first, first + len(insertItems) - 1)
+            for item in insertItems:
+                self.rowByKey[item[0]] = len(self.data_list)
+                self.data_list.append(item)
+            self.endInsertRows()
+
+    def rowRanges(self, rows):
+        ranges = []
+        for row in sorted(rows):
+            if len(ranges) > 0 and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        return ranges
+
     def clearStatistics(self):
         self.clearOnNextData = True
 
+    @Slot(QXYSeries, str, float, float, int)
+    def updateSeries(self, series: QXYSeries, item: str, fromMs: float, toMs: float, maxPoints: int):
+        # only line, spline and scatter series hold points which can be replaced
+        if not isinstance(series, QXYSeries):
+            raise TypeError(f"Statistics are only shown in a QXYSeries, not in {type(series).__name__}")
+        # only as many points as fit on the chart, replaced in one call
+        rows = self.history.query(self.prop, item, fromMs / 1000.0, toMs / 1000.0, max(1, maxPoints))
+        series.replace([QPointF(t * 1000.0, avg) for (t, _, _, avg) in rows])
+
     def updateColors(self, item: str, color: QColor):
-        for i in range(len(self.data_list)):
-            if self.data_list[i][0] == item:
-                self.data_list[i][2] = color.red()
-                self.data_list[i][3] = color.green()
-                self.data_list[i][4] = color.blue()
-                self.dataChanged.emit(self.index(i, 0), self.index(i, self.columnCount() - 1), [self.RoleColorR, self.RoleColorG, self.RoleColorB, self.ValueRole, self.NameRole, self.IsVisibleRole])
-                logging.debug(f"Updated color for {item} to {color.red()},{color.green()},{color.blue()}")
-                break
+        if item in self.rowByKey:
+            i = self.rowByKey[item]
+            self.data_list[i][2] = color.red()
+            self.data_list[i][3] = color.green()
+            self.data_list[i][4] = color.blue()
+            self.dataChanged.emit(self.index(i, 0), self.index(i, self.columnCount() - 1), [self.RoleColorR, self.RoleColorG, self.RoleColorB, self.ValueRole, self.NameRole, self.IsVisibleRole])
+            logging.debug(f"Updated color for {item} to {color.red()},{color.green()},{color.blue()}")
 
     @Slot(str, bool)
     def setItemVisible(self, item: str, is_visible: bool):
@@ -548,8 +692,7 @@ class StatisticsUnitModel(QAbstractTableModel):
 
         self.visibleItems[item] = is_visible
 
-        for i in range(len(self.data_list)):
-            if self.data_list[i][0] == item:
-                self.dataChanged.emit(self.index(i, 0), self.index(i, self.columnCount() - 1), [self.RoleColorR, self.RoleColorG, self.RoleColorB, self.ValueRole, self.NameRole, self.IsVisibleRole])
-                logging.debug(f"Set visibility for {item} to {is_visible}")
-                break
+        if item in self.rowByKey:
+            i = self.rowByKey[item]
+            self.dataChanged.emit(self.index(i, 0), self.index(i, self.columnCount() - 1), [self.RoleColorR, self.RoleColorG, self.RoleColorB, self.ValueRole, self.NameRole, self.IsVisibleRole])
+            logging.debug(f"Set visibility for {item} to {is_visible}")
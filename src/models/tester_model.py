@@ -239,12 +239,27 @@ class TesterModel(QAbstractListModel):
     unregisterDataSignal = Signal(str, object)
 
     requestQosJsonSignal = Signal(str, str)
+    writeQueueChanged = Signal()
 
     def getCount(self):
         return self.rowCount()
 
     count = Property(int, getCount, notify=countChanged)
 
+    def getWriteQueue(self):
+        # the write queues of all domains together
+        stats = list(self.writerStats.values())
+        return {
+            "depth": sum(s["depth"] for s in stats),
+            "maxDepth": max([s["maxDepth"] for s in stats], default=0),
+            "executed": sum(s["executed"] for s in stats),
+            "failed": sum(s["failed"] for s in stats),
+            "dropped": sum(s["dropped"] for s in stats),
+            "queued": [max([s["queued"][i] for s in stats], default=-1.0) for i in range(3)]
+        }
+
+    writeQueue = Property("QVariantMap", getWriteQueue, notify=writeQueueChanged)
+
     untitiledSequenceCount = 1
     untitiledCount = 1
 
@@ -257,6 +272,7 @@ class TesterModel(QAbstractListModel):
         self.threads = threads
         self.alreadyConnectedDomains = []
         self.pendingQosRequests = {}
+        self.writerStats = {} # domainId -> write queue statistics
         self.resetExportData()
 
     def resetExportData(self):
@@ -599,6 +615,11 @@ class TesterModel(QAbstractListModel):
         idx = self.index(currentIndex)
         self.dataChanged.emit(idx, idx, [self.DescriptionRole])
 
+    @Slot(int, object)
+    def setWriterStats(self, domainId: int, stats: dict):
+        self.writerStats[domainId] = stats
+        self.writeQueueChanged.emit()
+
     @Slot(int, str, str, str, object)
     def addWriter(self, id: str, domainId, topic_name, topic_type: str, qos):
         logging.info("AddWriter to TesterModel")
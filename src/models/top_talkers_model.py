@@ -0,0 +1,68 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from PySide6.QtCore import Qt, QModelIndex, QAbstractListModel, QLocale
+
+
+class TopTalkersModel(QAbstractListModel):
+    # The few heaviest keys of one ranking, replaced after every poll.
+
+    KeyRole = Qt.UserRole + 1
+    LabelRole = Qt.UserRole + 2
+    ValueRole = Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []
+
+    def roleNames(self):
+        return {
+            self.KeyRole: b'key',
+            self.LabelRole: b'label',
+            self.ValueRole: b'value'
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.items):
+            return None
+        (key, label, value) = self.items[index.row()]
+        if role == self.KeyRole:
+            return key
+        elif role == self.LabelRole:
+            return label
+        elif role == self.ValueRole:
+            return QLocale().toString(float(value), "f", 1)
+        return None
+
+    def setItems(self, items):
+        previous = len(self.items)
+        if len(items) < previous:
+            self.beginRemoveRows(QModelIndex(), len(items), previous - 1)
+            self.items = self.items[:len(items)]
+            self.endRemoveRows()
+        elif len(items) > previous:
+            self.beginInsertRows(QModelIndex(), previous, len(items) - 1)
+            self.items = self.items + items[previous:]
+            self.endInsertRows()
+
+        changed = [i for i in range(min(previous, len(items))) if self.items[i] != items[i]]
+        self.items = list(items)
+        if len(changed) > 0:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+
+    def clear(self):
+        self.beginResetModel()
+        self.items = []
+        self.endResetModel()
@@ -386,6 +386,21 @@
     <message id="listener.reader.stop">
         <translation>停止 Reader</translation>
     </message>
+    <message id="listener.reader.timings">
+        <translation>延迟 %1 / %2 / %3 ms · 间隔 %4 / %5 / %6 ms · 丢失 %7</translation>
+    </message>
+    <message id="listener.reader.timings.tooltip">
+        <translation>从源时间戳到接收的延迟以及同一写入者两个样本之间间隔 (按源时间戳) 的 p50 / p99 / p99.9。来自 %2 个写入者的 %1 个样本，最大延迟 %3 ms。丢失为读取者丢失或拒绝的样本数。</translation>
+    </message>
+    <message id="listener.reader.filter">
+        <translation>过滤样本</translation>
+    </message>
+    <message id="listener.reader.filter.placeholder">
+        <translation>例如 id == 42 &amp;&amp; name == "a"，回车应用，留空移除</translation>
+    </message>
+    <message id="listener.reader.filter.active">
+        <translation>过滤 %1 · %3 个中丢弃 %2 个</translation>
+    </message>
     <message id="listener.readers.delete.all">
         <translation>删除所有 Reader</translation>
     </message>
@@ -401,6 +416,39 @@
     <message id="listener.readers.stop.all">
         <translation>停止所有 Reader</translation>
     </message>
+    <message id="listener.retained.evicted">
+        <translation>保留 %1 条，移出 %2 条</translation>
+    </message>
+    <message id="listener.search.placeholder">
+        <translation>搜索消息：词语、前缀*、字段:值</translation>
+    </message>
+    <message id="listener.search.matches">
+        <translation>%1 个匹配</translation>
+    </message>
+    <message id="listener.recording.start">
+        <translation>开始录制</translation>
+    </message>
+    <message id="listener.recording.stop">
+        <translation>停止录制</translation>
+    </message>
+    <message id="listener.recording.active">
+        <translation>录制中</translation>
+    </message>
+    <message id="listener.recording.replay">
+        <translation>回放录制</translation>
+    </message>
+    <message id="listener.recording.publish">
+        <translation>发布录制</translation>
+    </message>
+    <message id="listener.recording.speed">
+        <translation>回放速度</translation>
+    </message>
+    <message id="listener.recording.speed.max">
+        <translation>尽可能快</translation>
+    </message>
+    <message id="listener.recording.replay.stop">
+        <translation>停止回放</translation>
+    </message>
     <message id="listener.sample.export">
         <translation>导出 Sample 日志</translation>
     </message>
@@ -446,6 +494,36 @@
     </message>
 
     <!-- participant -->
+    <message id="participant.debug.monitor">
+        <translation>调试监视器</translation>
+    </message>
+    <message id="participant.debug.monitor.details.failing">
+        <translation>%1 次失败：%2</translation>
+    </message>
+    <message id="participant.debug.monitor.details.healthy">
+        <translation>%1 毫秒，%2 KiB，每 %3 秒</translation>
+    </message>
+    <message id="participant.debug.monitor.details.unreachable">
+        <translation>%1 次失败，下次探测于 %2：%3</translation>
+    </message>
+    <message id="participant.debug.monitor.failing">
+        <translation>失败</translation>
+    </message>
+    <message id="participant.debug.monitor.healthy">
+        <translation>可访问</translation>
+    </message>
+    <message id="participant.debug.monitor.idle">
+        <translation>未轮询</translation>
+    </message>
+    <message id="participant.debug.monitor.none">
+        <translation>未启用</translation>
+    </message>
+    <message id="participant.debug.monitor.probing">
+        <translation>探测中</translation>
+    </message>
+    <message id="participant.debug.monitor.unreachable">
+        <translation>不可访问</translation>
+    </message>
     <message id="participant.domain">
         <translation>Domain</translation>
     </message>
@@ -796,6 +874,33 @@
     <message id="statistics.aggregate">
         <translation>聚合方式：</translation>
     </message>
+    <message id="statistics.focus">
+        <translation>全速率轮询：</translation>
+    </message>
+    <message id="statistics.focus.all">
+        <translation>全部</translation>
+    </message>
+    <message id="statistics.focus.placeholder">
+        <translation>以逗号分隔的名称</translation>
+    </message>
+    <message id="statistics.focus.tooltip">
+        <translation>显示统计信息时，仅以全速率轮询这些名称的调试监视器，其他的在后台刷新。</translation>
+    </message>
+    <message id="statistics.alert.firing">
+        <translation>触发</translation>
+    </message>
+    <message id="statistics.alert.resolved">
+        <translation>已解除</translation>
+    </message>
+    <message id="statistics.alerts">
+        <translation>告警</translation>
+    </message>
+    <message id="statistics.alerts.suppressed">
+        <translation>已抑制</translation>
+    </message>
+    <message id="statistics.mode">
+        <translation>数值显示方式:</translation>
+    </message>
     <message id="statistics.csv.export">
         <translation>导出 CSV</translation>
     </message>
@@ -823,6 +928,15 @@
     <message id="statistics.stop">
         <translation>停止统计</translation>
     </message>
+    <message id="statistics.top.talkers">
+        <translation>流量排行</translation>
+    </message>
+    <message id="statistics.top.topics.rexmit">
+        <translation>按重传字节/秒排序的主题</translation>
+    </message>
+    <message id="statistics.top.writers.sent">
+        <translation>按发送字节/秒排序的写入者</translation>
+    </message>
     <message id="statistics.update.interval">
         <translation>更新间隔：</translation>
     </message>
@@ -937,6 +1051,15 @@
     <message id="tester.text.placeholder">
         <translation>输入文本</translation>
     </message>
+    <message id="tester.write.queue">
+        <translation>写入队列 %1 (最大 %2) · p99 %3 ms</translation>
+    </message>
+    <message id="tester.write.queue.dropped">
+        <translation> · 丢弃 %1</translation>
+    </message>
+    <message id="tester.write.queue.tooltip">
+        <translation>等待写入线程的写入、dispose 和 unregister，最多 10000 个，超出的被丢弃。已执行 %1，失败 %2。队列中时间 p50 %3 ms，p99.9 %4 ms。</translation>
+    </message>
 
     <!-- topic -->
     <message id="topic.domain.id">
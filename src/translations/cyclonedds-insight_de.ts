@@ -386,6 +386,21 @@
     <message id="listener.reader.stop">
         <translation>Reader stoppen</translation>
     </message>
+    <message id="listener.reader.timings">
+        <translation>Latenz %1 / %2 / %3 ms · Abstand %4 / %5 / %6 ms · Verloren %7</translation>
+    </message>
+    <message id="listener.reader.timings.tooltip">
+        <translation>p50 / p99 / p99.9 der Latenz vom Quellzeitstempel bis zum Empfang und der Zeit zwischen zwei Samples desselben Writers, nach ihren Quellzeitstempeln. %1 Samples von %2 Writern, maximale Latenz %3 ms. Verloren zählt die vom Reader verlorenen oder abgelehnten Samples.</translation>
+    </message>
+    <message id="listener.reader.filter">
+        <translation>Samples filtern</translation>
+    </message>
+    <message id="listener.reader.filter.placeholder">
+        <translation>z. B. id == 42 &amp;&amp; name == "a", Enter übernimmt, leer entfernt</translation>
+    </message>
+    <message id="listener.reader.filter.active">
+        <translation>Filter %1 · %2 von %3 verworfen</translation>
+    </message>
     <message id="listener.readers.delete.all">
         <translation>Alle Reader löschen</translation>
     </message>
@@ -401,6 +416,39 @@
     <message id="listener.readers.stop.all">
         <translation>Alle Reader stoppen</translation>
     </message>
+    <message id="listener.retained.evicted">
+        <translation>%1 behalten, %2 verdrängt</translation>
+    </message>
+    <message id="listener.search.placeholder">
+        <translation>Nachrichten durchsuchen: Begriff, Präfix*, Feld:Wert</translation>
+    </message>
+    <message id="listener.search.matches">
+        <translation>%1 Treffer</translation>
+    </message>
+    <message id="listener.recording.start">
+        <translation>Aufnahme starten</translation>
+    </message>
+    <message id="listener.recording.stop">
+        <translation>Aufnahme beenden</translation>
+    </message>
+    <message id="listener.recording.active">
+        <translation>Aufnahme</translation>
+    </message>
+    <message id="listener.recording.replay">
+        <translation>Aufnahme abspielen</translation>
+    </message>
+    <message id="listener.recording.publish">
+        <translation>Aufnahme veröffentlichen</translation>
+    </message>
+    <message id="listener.recording.speed">
+        <translation>Abspielgeschwindigkeit</translation>
+    </message>
+    <message id="listener.recording.speed.max">
+        <translation>So schnell wie möglich</translation>
+    </message>
+    <message id="listener.recording.replay.stop">
+        <translation>Abspielen beenden</translation>
+    </message>
     <message id="listener.sample.export">
         <translation>Sample-Protokoll exportieren</translation>
     </message>
@@ -446,6 +494,36 @@
     </message>
 
     <!-- participant -->
+    <message id="participant.debug.monitor">
+        <translation>Debug-Monitor</translation>
+    </message>
+    <message id="participant.debug.monitor.details.failing">
+        <translation>%1 Fehlschläge: %2</translation>
+    </message>
+    <message id="participant.debug.monitor.details.healthy">
+        <translation>%1 ms, %2 KiB, alle %3 s</translation>
+    </message>
+    <message id="participant.debug.monitor.details.unreachable">
+        <translation>%1 Fehlschläge, nächster Versuch um %2: %3</translation>
+    </message>
+    <message id="participant.debug.monitor.failing">
+        <translation>Fehlerhaft</translation>
+    </message>
+    <message id="participant.debug.monitor.healthy">
+        <translation>Erreichbar</translation>
+    </message>
+    <message id="participant.debug.monitor.idle">
+        <translation>Nicht abgefragt</translation>
+    </message>
+    <message id="participant.debug.monitor.none">
+        <translation>Nicht aktiviert</translation>
+    </message>
+    <message id="participant.debug.monitor.probing">
+        <translation>Wird geprüft</translation>
+    </message>
+    <message id="participant.debug.monitor.unreachable">
+        <translation>Nicht erreichbar</translation>
+    </message>
     <message id="participant.domain">
         <translation>Domain</translation>
     </message>
@@ -796,6 +874,33 @@
     <message id="statistics.aggregate">
         <translation>Aggregieren nach:</translation>
     </message>
+    <message id="statistics.focus">
+        <translation>Volle Abfragerate für:</translation>
+    </message>
+    <message id="statistics.focus.all">
+        <translation>Alles</translation>
+    </message>
+    <message id="statistics.focus.placeholder">
+        <translation>Namen, durch Komma getrennt</translation>
+    </message>
+    <message id="statistics.focus.tooltip">
+        <translation>Nur die Debug-Monitore dieser Namen werden während der Anzeige mit voller Rate abgefragt, die anderen im Hintergrund aktualisiert.</translation>
+    </message>
+    <message id="statistics.alert.firing">
+        <translation>ausgelöst</translation>
+    </message>
+    <message id="statistics.alert.resolved">
+        <translation>behoben</translation>
+    </message>
+    <message id="statistics.alerts">
+        <translation>Alarme</translation>
+    </message>
+    <message id="statistics.alerts.suppressed">
+        <translation>unterdrückt</translation>
+    </message>
+    <message id="statistics.mode">
+        <translation>Werte anzeigen als:</translation>
+    </message>
     <message id="statistics.csv.export">
         <translation>CSV exportieren</translation>
     </message>
@@ -823,6 +928,15 @@
     <message id="statistics.stop">
         <translation>Statistiken stoppen</translation>
     </message>
+    <message id="statistics.top.talkers">
+        <translation>Top-Sender</translation>
+    </message>
+    <message id="statistics.top.topics.rexmit">
+        <translation>Topics nach erneut gesendeten Bytes/s</translation>
+    </message>
+    <message id="statistics.top.writers.sent">
+        <translation>Writer nach gesendeten Bytes/s</translation>
+    </message>
     <message id="statistics.update.interval">
         <translation>Aktualisierungsintervall:</translation>
     </message>
@@ -937,6 +1051,15 @@
     <message id="tester.text.placeholder">
         <translation>Text eingeben</translation>
     </message>
+    <message id="tester.write.queue">
+        <translation>Schreibwarteschlange %1 (max %2) · p99 %3 ms</translation>
+    </message>
+    <message id="tester.write.queue.dropped">
+        <translation> · %1 verworfen</translation>
+    </message>
+    <message id="tester.write.queue.tooltip">
+        <translation>Schreib-, Dispose- und Unregister-Aufrufe, die auf den Writer-Thread warten, höchstens 10000, weitere werden verworfen. %1 ausgeführt, %2 fehlgeschlagen. Zeit in der Warteschlange p50 %3 ms, p99.9 %4 ms.</translation>
+    </message>
 
     <!-- topic -->
     <message id="topic.domain.id">
@@ -386,6 +386,21 @@
     <message id="listener.reader.stop">
         <translation>Stop reader</translation>
     </message>
+    <message id="listener.reader.timings">
+        <translation>Latency %1 / %2 / %3 ms · Interval %4 / %5 / %6 ms · Lost %7</translation>
+    </message>
+    <message id="listener.reader.timings.tooltip">
+        <translation>p50 / p99 / p99.9 of the latency from the source timestamp to the reception and of the time between two samples of the same writer, by their source timestamps. %1 samples from %2 writers, maximum latency %3 ms. Lost counts the samples lost or rejected by the reader.</translation>
+    </message>
+    <message id="listener.reader.filter">
+        <translation>Filter samples</translation>
+    </message>
+    <message id="listener.reader.filter.placeholder">
+        <translation>e.g. id == 42 &amp;&amp; name == "a", Enter applies, empty removes</translation>
+    </message>
+    <message id="listener.reader.filter.active">
+        <translation>Filter %1 · %2 of %3 dropped</translation>
+    </message>
     <message id="listener.readers.delete.all">
         <translation>Delete all readers</translation>
     </message>
@@ -401,6 +416,39 @@
     <message id="listener.readers.stop.all">
         <translation>Stop all readers</translation>
     </message>
+    <message id="listener.retained.evicted">
+        <translation>%1 retained, %2 evicted</translation>
+    </message>
+    <message id="listener.search.placeholder">
+        <translation>Search messages: term, prefix*, field:value</translation>
+    </message>
+    <message id="listener.search.matches">
+        <translation>%1 matches</translation>
+    </message>
+    <message id="listener.recording.start">
+        <translation>Start recording</translation>
+    </message>
+    <message id="listener.recording.stop">
+        <translation>Stop recording</translation>
+    </message>
+    <message id="listener.recording.active">
+        <translation>Recording</translation>
+    </message>
+    <message id="listener.recording.replay">
+        <translation>Replay recording</translation>
+    </message>
+    <message id="listener.recording.publish">
+        <translation>Publish recording</translation>
+    </message>
+    <message id="listener.recording.speed">
+        <translation>Replay speed</translation>
+    </message>
+    <message id="listener.recording.speed.max">
+        <translation>As fast as possible</translation>
+    </message>
+    <message id="listener.recording.replay.stop">
+        <translation>Stop replay</translation>
+    </message>
     <message id="listener.sample.export">
         <translation>Export Sample Log</translation>
     </message>
@@ -446,6 +494,36 @@
     </message>
 
     <!-- participant -->
+    <message id="participant.debug.monitor">
+        <translation>Debug monitor</translation>
+    </message>
+    <message id="participant.debug.monitor.details.failing">
+        <translation>%1 failures: %2</translation>
+    </message>
+    <message id="participant.debug.monitor.details.healthy">
+        <translation>%1 ms, %2 KiB, every %3 s</translation>
+    </message>
+    <message id="participant.debug.monitor.details.unreachable">
+        <translation>%1 failures, next probe at %2: %3</translation>
+    </message>
+    <message id="participant.debug.monitor.failing">
+        <translation>Failing</translation>
+    </message>
+    <message id="participant.debug.monitor.healthy">
+        <translation>Reachable</translation>
+    </message>
+    <message id="participant.debug.monitor.idle">
+        <translation>Not polled</translation>
+    </message>
+    <message id="participant.debug.monitor.none">
+        <translation>Not enabled</translation>
+    </message>
+    <message id="participant.debug.monitor.probing">
+        <translation>Probing</translation>
+    </message>
+    <message id="participant.debug.monitor.unreachable">
+        <translation>Unreachable</translation>
+    </message>
     <message id="participant.domain">
         <translation>Domain</translation>
     </message>
@@ -796,6 +874,33 @@
     <message id="statistics.aggregate">
         <translation>Aggregate by:</translation>
     </message>
+    <message id="statistics.focus">
+        <translation>Poll at full rate:</translation>
+    </message>
+    <message id="statistics.focus.all">
+        <translation>Everything</translation>
+    </message>
+    <message id="statistics.focus.placeholder">
+        <translation>Comma separated names</translation>
+    </message>
+    <message id="statistics.focus.tooltip">
+        <translation>Only the debug monitors of these names are polled at full rate while the statistics are shown, the others are refreshed in the background.</translation>
+    </message>
+    <message id="statistics.alert.firing">
+        <translation>firing</translation>
+    </message>
+    <message id="statistics.alert.resolved">
+        <translation>resolved</translation>
+    </message>
+    <message id="statistics.alerts">
+        <translation>Alerts</translation>
+    </message>
+    <message id="statistics.alerts.suppressed">
+        <translation>suppressed</translation>
+    </message>
+    <message id="statistics.mode">
+        <translation>Show values as:</translation>
+    </message>
     <message id="statistics.csv.export">
         <translation>Export CSV</translation>
     </message>
@@ -823,6 +928,15 @@
     <message id="statistics.stop">
         <translation>Stop Statistics</translation>
     </message>
+    <message id="statistics.top.talkers">
+        <translation>Top talkers</translation>
+    </message>
+    <message id="statistics.top.topics.rexmit">
+        <translation>Topics by retransmitted bytes/s</translation>
+    </message>
+    <message id="statistics.top.writers.sent">
+        <translation>Writers by sent bytes/s</translation>
+    </message>
     <message id="statistics.update.interval">
         <translation>Update Interval:</translation>
     </message>
@@ -937,6 +1051,15 @@
     <message id="tester.text.placeholder">
         <translation>Enter text</translation>
     </message>
+    <message id="tester.write.queue">
+        <translation>Write queue %1 (max %2) · p99 %3 ms</translation>
+    </message>
+    <message id="tester.write.queue.dropped">
+        <translation> · %1 dropped</translation>
+    </message>
+    <message id="tester.write.queue.tooltip">
+        <translation>Writes, disposes and unregisters waiting for the writer thread, at most 10000, more are dropped. %1 executed, %2 failed. Time in the queue p50 %3 ms, p99.9 %4 ms.</translation>
+    </message>
 
     <!-- topic -->
     <message id="topic.domain.id">
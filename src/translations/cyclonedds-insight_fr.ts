@@ -386,6 +386,21 @@
     <message id="listener.reader.stop">
         <translation>Arrêter le Reader</translation>
     </message>
+    <message id="listener.reader.timings">
+        <translation>Latence %1 / %2 / %3 ms · Intervalle %4 / %5 / %6 ms · Perdus %7</translation>
+    </message>
+    <message id="listener.reader.timings.tooltip">
+        <translation>p50 / p99 / p99.9 de la latence entre l'horodatage source et la réception et du temps entre deux échantillons du même writer, d'après leurs horodatages source. %1 échantillons de %2 writers, latence maximale %3 ms. Perdus compte les échantillons perdus ou rejetés par le reader.</translation>
+    </message>
+    <message id="listener.reader.filter">
+        <translation>Filtrer les échantillons</translation>
+    </message>
+    <message id="listener.reader.filter.placeholder">
+        <translation>p. ex. id == 42 &amp;&amp; name == "a", Entrée applique, vide supprime</translation>
+    </message>
+    <message id="listener.reader.filter.active">
+        <translation>Filtre %1 · %2 sur %3 ignorés</translation>
+    </message>
     <message id="listener.readers.delete.all">
         <translation>Supprimer tous les Readers</translation>
     </message>
@@ -401,6 +416,39 @@
     <message id="listener.readers.stop.all">
         <translation>Arrêter tous les Readers</translation>
     </message>
+    <message id="listener.retained.evicted">
+        <translation>%1 conservés, %2 évincés</translation>
+    </message>
+    <message id="listener.search.placeholder">
+        <translation>Rechercher des messages : terme, préfixe*, champ:valeur</translation>
+    </message>
+    <message id="listener.search.matches">
+        <translation>%1 résultats</translation>
+    </message>
+    <message id="listener.recording.start">
+        <translation>Démarrer l'enregistrement</translation>
+    </message>
+    <message id="listener.recording.stop">
+        <translation>Arrêter l'enregistrement</translation>
+    </message>
+    <message id="listener.recording.active">
+        <translation>Enregistrement</translation>
+    </message>
+    <message id="listener.recording.replay">
+        <translation>Rejouer l'enregistrement</translation>
+    </message>
+    <message id="listener.recording.publish">
+        <translation>Publier l'enregistrement</translation>
+    </message>
+    <message id="listener.recording.speed">
+        <translation>Vitesse de lecture</translation>
+    </message>
+    <message id="listener.recording.speed.max">
+        <translation>Aussi vite que possible</translation>
+    </message>
+    <message id="listener.recording.replay.stop">
+        <translation>Arrêter la lecture</translation>
+    </message>
     <message id="listener.sample.export">
         <translation>Exporter le journal des samples</translation>
     </message>
@@ -446,6 +494,36 @@
     </message>
 
     <!-- participant -->
+    <message id="participant.debug.monitor">
+        <translation>Moniteur de débogage</translation>
+    </message>
+    <message id="participant.debug.monitor.details.failing">
+        <translation>%1 échecs : %2</translation>
+    </message>
+    <message id="participant.debug.monitor.details.healthy">
+        <translation>%1 ms, %2 Kio, toutes les %3 s</translation>
+    </message>
+    <message id="participant.debug.monitor.details.unreachable">
+        <translation>%1 échecs, prochain essai à %2 : %3</translation>
+    </message>
+    <message id="participant.debug.monitor.failing">
+        <translation>En échec</translation>
+    </message>
+    <message id="participant.debug.monitor.healthy">
+        <translation>Accessible</translation>
+    </message>
+    <message id="participant.debug.monitor.idle">
+        <translation>Non interrogé</translation>
+    </message>
+    <message id="participant.debug.monitor.none">
+        <translation>Non activé</translation>
+    </message>
+    <message id="participant.debug.monitor.probing">
+        <translation>Test en cours</translation>
+    </message>
+    <message id="participant.debug.monitor.unreachable">
+        <translation>Injoignable</translation>
+    </message>
     <message id="participant.domain">
         <translation>Domain</translation>
     </message>
@@ -796,6 +874,33 @@
     <message id="statistics.aggregate">
         <translation>Regrouper par :</translation>
     </message>
+    <message id="statistics.focus">
+        <translation>Interrogation complète pour :</translation>
+    </message>
+    <message id="statistics.focus.all">
+        <translation>Tout</translation>
+    </message>
+    <message id="statistics.focus.placeholder">
+        <translation>Noms séparés par des virgules</translation>
+    </message>
+    <message id="statistics.focus.tooltip">
+        <translation>Seuls les moniteurs de débogage de ces noms sont interrogés à pleine cadence pendant l'affichage, les autres sont rafraîchis en arrière-plan.</translation>
+    </message>
+    <message id="statistics.alert.firing">
+        <translation>déclenchée</translation>
+    </message>
+    <message id="statistics.alert.resolved">
+        <translation>résolue</translation>
+    </message>
+    <message id="statistics.alerts">
+        <translation>Alertes</translation>
+    </message>
+    <message id="statistics.alerts.suppressed">
+        <translation>supprimées</translation>
+    </message>
+    <message id="statistics.mode">
+        <translation>Afficher les valeurs en :</translation>
+    </message>
     <message id="statistics.csv.export">
         <translation>Exporter en CSV</translation>
     </message>
@@ -823,6 +928,15 @@
     <message id="statistics.stop">
         <translation>Arrêter les statistiques</translation>
     </message>
+    <message id="statistics.top.talkers">
+        <translation>Plus gros émetteurs</translation>
+    </message>
+    <message id="statistics.top.topics.rexmit">
+        <translation>Topics par octets retransmis/s</translation>
+    </message>
+    <message id="statistics.top.writers.sent">
+        <translation>Writers par octets envoyés/s</translation>
+    </message>
     <message id="statistics.update.interval">
         <translation>Intervalle de mise à jour :</translation>
     </message>
@@ -937,6 +1051,15 @@
     <message id="tester.text.placeholder">
         <translation>Saisir du texte</translation>
     </message>
+    <message id="tester.write.queue">
+        <translation>File d'écriture %1 (max %2) · p99 %3 ms</translation>
+    </message>
+    <message id="tester.write.queue.dropped">
+        <translation> · %1 abandonnées</translation>
+    </message>
+    <message id="tester.write.queue.tooltip">
+        <translation>Écritures, disposes et unregisters en attente du thread d'écriture, 10000 au plus, les suivants sont abandonnés. %1 exécutés, %2 en échec. Temps dans la file p50 %3 ms, p99.9 %4 ms.</translation>
+    </message>
 
     <!-- topic -->
     <message id="topic.domain.id">
@@ -386,6 +386,21 @@
     <message id="listener.reader.stop">
         <translation>Reader を停止</translation>
     </message>
+    <message id="listener.reader.timings">
+        <translation>レイテンシ %1 / %2 / %3 ms · 間隔 %4 / %5 / %6 ms · 損失 %7</translation>
+    </message>
+    <message id="listener.reader.timings.tooltip">
+        <translation>送信元タイムスタンプから受信までのレイテンシと同じライターのサンプル間隔 (送信元タイムスタンプによる) の p50 / p99 / p99.9。%2 個のライターから %1 サンプル、最大レイテンシ %3 ms。損失はリーダーが失った、または拒否したサンプル数です。</translation>
+    </message>
+    <message id="listener.reader.filter">
+        <translation>サンプルをフィルター</translation>
+    </message>
+    <message id="listener.reader.filter.placeholder">
+        <translation>例: id == 42 &amp;&amp; name == "a"、Enter で適用、空で解除</translation>
+    </message>
+    <message id="listener.reader.filter.active">
+        <translation>フィルター %1 · %3 件中 %2 件を破棄</translation>
+    </message>
     <message id="listener.readers.delete.all">
         <translation>すべての Reader を削除</translation>
     </message>
@@ -401,6 +416,39 @@
     <message id="listener.readers.stop.all">
         <translation>すべての Reader を停止</translation>
     </message>
+    <message id="listener.retained.evicted">
+        <translation>保持 %1 件、退避 %2 件</translation>
+    </message>
+    <message id="listener.search.placeholder">
+        <translation>メッセージを検索: 語句、接頭辞*、フィールド:値</translation>
+    </message>
+    <message id="listener.search.matches">
+        <translation>%1 件一致</translation>
+    </message>
+    <message id="listener.recording.start">
+        <translation>記録を開始</translation>
+    </message>
+    <message id="listener.recording.stop">
+        <translation>記録を停止</translation>
+    </message>
+    <message id="listener.recording.active">
+        <translation>記録中</translation>
+    </message>
+    <message id="listener.recording.replay">
+        <translation>記録を再生</translation>
+    </message>
+    <message id="listener.recording.publish">
+        <translation>記録をパブリッシュ</translation>
+    </message>
+    <message id="listener.recording.speed">
+        <translation>再生速度</translation>
+    </message>
+    <message id="listener.recording.speed.max">
+        <translation>最高速度</translation>
+    </message>
+    <message id="listener.recording.replay.stop">
+        <translation>再生を停止</translation>
+    </message>
     <message id="listener.sample.export">
         <translation>Sample ログをエクスポート</translation>
     </message>
@@ -446,6 +494,36 @@
     </message>
 
     <!-- participant -->
+    <message id="participant.debug.monitor">
+        <translation>デバッグモニター</translation>
+    </message>
+    <message id="participant.debug.monitor.details.failing">
+        <translation>%1 回失敗: %2</translation>
+    </message>
+    <message id="participant.debug.monitor.details.healthy">
+        <translation>%1 ms、%2 KiB、%3 秒ごと</translation>
+    </message>
+    <message id="participant.debug.monitor.details.unreachable">
+        <translation>%1 回失敗、次の確認 %2: %3</translation>
+    </message>
+    <message id="participant.debug.monitor.failing">
+        <translation>失敗中</translation>
+    </message>
+    <message id="participant.debug.monitor.healthy">
+        <translation>到達可能</translation>
+    </message>
+    <message id="participant.debug.monitor.idle">
+        <translation>未取得</translation>
+    </message>
+    <message id="participant.debug.monitor.none">
+        <translation>無効</translation>
+    </message>
+    <message id="participant.debug.monitor.probing">
+        <translation>確認中</translation>
+    </message>
+    <message id="participant.debug.monitor.unreachable">
+        <translation>到達不能</translation>
+    </message>
     <message id="participant.domain">
         <translation>Domain</translation>
     </message>
@@ -796,6 +874,33 @@
     <message id="statistics.aggregate">
         <translation>集計単位:</translation>
     </message>
+    <message id="statistics.focus">
+        <translation>フルレートでポーリング:</translation>
+    </message>
+    <message id="statistics.focus.all">
+        <translation>すべて</translation>
+    </message>
+    <message id="statistics.focus.placeholder">
+        <translation>カンマ区切りの名前</translation>
+    </message>
+    <message id="statistics.focus.tooltip">
+        <translation>統計の表示中はこれらの名前のデバッグモニターのみフルレートでポーリングされ、その他はバックグラウンドで更新されます。</translation>
+    </message>
+    <message id="statistics.alert.firing">
+        <translation>発生中</translation>
+    </message>
+    <message id="statistics.alert.resolved">
+        <translation>解決</translation>
+    </message>
+    <message id="statistics.alerts">
+        <translation>アラート</translation>
+    </message>
+    <message id="statistics.alerts.suppressed">
+        <translation>抑制</translation>
+    </message>
+    <message id="statistics.mode">
+        <translation>値の表示:</translation>
+    </message>
     <message id="statistics.csv.export">
         <translation>CSV をエクスポート</translation>
     </message>
@@ -823,6 +928,15 @@
     <message id="statistics.stop">
         <translation>統計を停止</translation>
     </message>
+    <message id="statistics.top.talkers">
+        <translation>上位の送信元</translation>
+    </message>
+    <message id="statistics.top.topics.rexmit">
+        <translation>再送バイト/秒順のトピック</translation>
+    </message>
+    <message id="statistics.top.writers.sent">
+        <translation>送信バイト/秒順のライター</translation>
+    </message>
     <message id="statistics.update.interval">
         <translation>更新間隔:</translation>
     </message>
@@ -937,6 +1051,15 @@
     <message id="tester.text.placeholder">
         <translation>テキストを入力</translation>
     </message>
+    <message id="tester.write.queue">
+        <translation>書き込みキュー %1 (最大 %2) · p99 %3 ms</translation>
+    </message>
+    <message id="tester.write.queue.dropped">
+        <translation> · 破棄 %1</translation>
+    </message>
+    <message id="tester.write.queue.tooltip">
+        <translation>ライタースレッドを待っている書き込み、dispose、unregister (最大 10000、超えた分は破棄)。実行 %1、失敗 %2。キュー内の時間 p50 %3 ms、p99.9 %4 ms。</translation>
+    </message>
 
     <!-- topic -->
     <message id="topic.domain.id">
@@ -386,6 +386,21 @@
     <message id="listener.reader.stop">
         <translation>Reader stoppen</translation>
     </message>
+    <message id="listener.reader.timings">
+        <translation>Latentie %1 / %2 / %3 ms · Interval %4 / %5 / %6 ms · Verloren %7</translation>
+    </message>
+    <message id="listener.reader.timings.tooltip">
+        <translation>p50 / p99 / p99.9 van de latentie van de brontijdstempel tot de ontvangst en van de tijd tussen twee samples van dezelfde writer, volgens hun brontijdstempels. %1 samples van %2 writers, maximale latentie %3 ms. Verloren telt de samples die de reader verloor of weigerde.</translation>
+    </message>
+    <message id="listener.reader.filter">
+        <translation>Samples filteren</translation>
+    </message>
+    <message id="listener.reader.filter.placeholder">
+        <translation>bijv. id == 42 &amp;&amp; name == "a", Enter past toe, leeg verwijdert</translation>
+    </message>
+    <message id="listener.reader.filter.active">
+        <translation>Filter %1 · %2 van %3 verworpen</translation>
+    </message>
     <message id="listener.readers.delete.all">
         <translation>Alle readers verwijderen</translation>
     </message>
@@ -401,6 +416,39 @@
     <message id="listener.readers.stop.all">
         <translation>Alle readers stoppen</translation>
     </message>
+    <message id="listener.retained.evicted">
+        <translation>%1 bewaard, %2 verwijderd</translation>
+    </message>
+    <message id="listener.search.placeholder">
+        <translation>Berichten zoeken: term, prefix*, veld:waarde</translation>
+    </message>
+    <message id="listener.search.matches">
+        <translation>%1 resultaten</translation>
+    </message>
+    <message id="listener.recording.start">
+        <translation>Opname starten</translation>
+    </message>
+    <message id="listener.recording.stop">
+        <translation>Opname stoppen</translation>
+    </message>
+    <message id="listener.recording.active">
+        <translation>Opname</translation>
+    </message>
+    <message id="listener.recording.replay">
+        <translation>Opname afspelen</translation>
+    </message>
+    <message id="listener.recording.publish">
+        <translation>Opname publiceren</translation>
+    </message>
+    <message id="listener.recording.speed">
+        <translation>Afspeelsnelheid</translation>
+    </message>
+    <message id="listener.recording.speed.max">
+        <translation>Zo snel mogelijk</translation>
+    </message>
+    <message id="listener.recording.replay.stop">
+        <translation>Afspelen stoppen</translation>
+    </message>
     <message id="listener.sample.export">
         <translation>Samplelog exporteren</translation>
     </message>
@@ -446,6 +494,36 @@
     </message>
 
     <!-- participant -->
+    <message id="participant.debug.monitor">
+        <translation>Debugmonitor</translation>
+    </message>
+    <message id="participant.debug.monitor.details.failing">
+        <translation>%1 mislukkingen: %2</translation>
+    </message>
+    <message id="participant.debug.monitor.details.healthy">
+        <translation>%1 ms, %2 KiB, elke %3 s</translation>
+    </message>
+    <message id="participant.debug.monitor.details.unreachable">
+        <translation>%1 mislukkingen, volgende poging om %2: %3</translation>
+    </message>
+    <message id="participant.debug.monitor.failing">
+        <translation>Mislukt</translation>
+    </message>
+    <message id="participant.debug.monitor.healthy">
+        <translation>Bereikbaar</translation>
+    </message>
+    <message id="participant.debug.monitor.idle">
+        <translation>Niet opgevraagd</translation>
+    </message>
+    <message id="participant.debug.monitor.none">
+        <translation>Niet ingeschakeld</translation>
+    </message>
+    <message id="participant.debug.monitor.probing">
+        <translation>Wordt getest</translation>
+    </message>
+    <message id="participant.debug.monitor.unreachable">
+        <translation>Onbereikbaar</translation>
+    </message>
     <message id="participant.domain">
         <translation>Domain</translation>
     </message>
@@ -796,6 +874,33 @@
     <message id="statistics.aggregate">
         <translation>Groeperen op:</translation>
     </message>
+    <message id="statistics.focus">
+        <translation>Volledige pollfrequentie voor:</translation>
+    </message>
+    <message id="statistics.focus.all">
+        <translation>Alles</translation>
+    </message>
+    <message id="statistics.focus.placeholder">
+        <translation>Namen, gescheiden door komma's</translation>
+    </message>
+    <message id="statistics.focus.tooltip">
+        <translation>Alleen de debugmonitors met deze namen worden tijdens het tonen op volle snelheid opgevraagd, de andere worden op de achtergrond ververst.</translation>
+    </message>
+    <message id="statistics.alert.firing">
+        <translation>actief</translation>
+    </message>
+    <message id="statistics.alert.resolved">
+        <translation>opgelost</translation>
+    </message>
+    <message id="statistics.alerts">
+        <translation>Meldingen</translation>
+    </message>
+    <message id="statistics.alerts.suppressed">
+        <translation>onderdrukt</translation>
+    </message>
+    <message id="statistics.mode">
+        <translation>Waarden tonen als:</translation>
+    </message>
     <message id="statistics.csv.export">
         <translation>CSV exporteren</translation>
     </message>
@@ -823,6 +928,15 @@
     <message id="statistics.stop">
         <translation>Statistieken stoppen</translation>
     </message>
+    <message id="statistics.top.talkers">
+        <translation>Grootste zenders</translation>
+    </message>
+    <message id="statistics.top.topics.rexmit">
+        <translation>Topics op opnieuw verzonden bytes/s</translation>
+    </message>
+    <message id="statistics.top.writers.sent">
+        <translation>Writers op verzonden bytes/s</translation>
+    </message>
     <message id="statistics.update.interval">
         <translation>Update-interval:</translation>
     </message>
@@ -937,6 +1051,15 @@
     <message id="tester.text.placeholder">
         <translation>Tekst invoeren</translation>
     </message>
+    <message id="tester.write.queue">
+        <translation>Schrijfwachtrij %1 (max %2) · p99 %3 ms</translation>
+    </message>
+    <message id="tester.write.queue.dropped">
+        <translation> · %1 verworpen</translation>
+    </message>
+    <message id="tester.write.queue.tooltip">
+        <translation>Writes, disposes en unregisters die op de writer-thread wachten, hoogstens 10000, meer worden verworpen. %1 uitgevoerd, %2 mislukt. Tijd in de wachtrij p50 %3 ms, p99.9 %4 ms.</translation>
+    </message>
 
     <!-- topic -->
     <message id="topic.domain.id">
@@ -0,0 +1,220 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Deque, Dict, Hashable, List, Optional, Tuple
+import json
+import time
+
+from utils.statistics_table import EntityRow
+
+
+DISCOVERY_METRICS = ("participants", "topics", "readers", "writers")
+CONDITIONS = (">", "<", "drop")
+VALUES = ("rate", "ewma", "value")
+
+# notifications over all rules, the rest is only counted
+MAX_NOTIFICATIONS_PER_MINUTE = 30
+DEFAULT_COOLDOWN_SECONDS = 60.0
+
+FIRING = "firing"
+RESOLVED = "resolved"
+
+
+@dataclass
+class AlertRule:
+    # ">" and "<" compare the value against the threshold and fire once the
+    # condition held for forSeconds. "drop" fires if the value is more than
+    # threshold below its maximum of the last forSeconds. An alert resolves
+    # once the value is back on the other side of clearThreshold.
+    name: str
+    metric: str
+    condition: str = ">"
+    threshold: float = 0.0
+    clearThreshold: Optional[float] = None
+    forSeconds: float = 0.0
+    value: str = "rate"
+    kind: Optional[str] = None
+    topic: Optional[str] = None
+    domain: Optional[str] = None
+    cooldownSeconds: float = DEFAULT_COOLDOWN_SECONDS
+
+    def __post_init__(self):
+        if self.condition not in CONDITIONS:
+            raise ValueError(f"Rule {self.name}: condition must be one of {CONDITIONS}")
+        if self.value not in VALUES:
+            raise ValueError(f"Rule {self.name}: value must be one of {VALUES}")
+        if self.clearThreshold is None:
+            self.clearThreshold = self.threshold
+        if self.domain is not None:
+            self.domain = str(self.domain)
+
+    def isDiscovery(self) -> bool:
+        return self.metric in DISCOVERY_METRICS
+
+    def matches(self, row: EntityRow) -> bool:
+        if self.kind is not None and row.kind != self.kind:
+            return False
+        if self.domain is not None and row.domain != self.domain:
+            return False
+        if self.topic is not None and not fnmatchcase(row.topic, self.topic):
+            return False
+        return True
+
+
+@dataclass
+class AlertEvent:
+    timestamp: float # wall clock
+    rule: str
+    series: str
+    state: str
+    value: float
+
+
+@dataclass
+class SeriesState:
+    description: str
+    lastSeen: float = 0.0
+    since: Optional[float] = None
+    active: bool = False
+    notified: bool = False
+    lastNotified: Optional[float] = None
+    # (time, value, until) with decreasing values, the front is the window
+    # maximum. A value is held until the next one arrives.
+    window: Deque[Tuple[float, float, float]] = field(default_factory=deque)
+
+
+def loadRules(path: str) -> List[AlertRule]:
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [AlertRule(**entry) for entry in entries]
+
+
+class AlertEngine:
+    # Evaluates rules against every poll and, periodically, against the
+    # discovery counts which hold until they change. Each series keeps only
+    # its condition state and, for drop rules, the window maximum as a
+    # monotonic queue, so a sample costs O(1) amortized and no history is
+    # rescanned. Timestamps must be monotonic seconds.
+
+    def __init__(self, rules: List[AlertRule], maxPerMinute: int = MAX_NOTIFICATIONS_PER_MINUTE):
+        self.rules = rules
+        self.statisticRules = [r for r in rules if not r.isDiscovery()]
+        self.discoveryRules = [r for r in rules if r.isDiscovery()]
+        self.series: Dict[Tuple[str, Hashable], SeriesState] = {}
+        self.maxPerMinute = maxPerMinute
+        self.tokens = float(maxPerMinute)
+        self.lastRefill = None
+        self.suppressed = 0
+
+    def evaluateRows(self, rows: List[EntityRow], now: float) -> List[AlertEvent]:
+        events = []
+        for rule in self.statisticRules:
+            for row in rows:
+                if rule.metric not in row.values or not rule.matches(row):
+                    continue
+                if rule.value != "value" and rule.metric in row.rates:
+                    sample = row.rates[rule.metric]
+                    value = sample.ewma if rule.value == "ewma" else sample.rate
+                else:
+                    value = row.values[rule.metric]
+                description = f"{row.kind} {row.guid} ({row.topic}, {row.process}@{row.host})"
+                self.update(rule, row.guid, description, value, now, events)
+        self.expire(self.statisticRules, now, events)
+        return events
+
+    def evaluateDiscovery(self, counts: Dict[int, Dict[str, int]], now: float) -> List[AlertEvent]:
+        events = []
+        for rule in self.discoveryRules:
+            for domainId, domainCounts in counts.items():
+                if rule.domain is not None and str(domainId) != rule.domain:
+                    continue
+                self.update(rule, domainId, f"domain {domainId}", domainCounts.get(rule.metric, 0), now, events)
+        self.expire(self.discoveryRules, now, events)
+        return events
+
+    def update(self, rule: AlertRule, key: Hashable, description: str, value: float, now: float, events: List[AlertEvent]):
+        seriesKey = (rule.name, key)
+        state = self.series.get(seriesKey)
+        if state is None:
+            state = SeriesState(description)
+            self.series[seriesKey] = state
+        state.lastSeen = now
+
+        if rule.condition == "drop":
+            window = state.window
+            if window:
+                # the newest value was held until now
+                window[-1] = (window[-1][0], window[-1][1], now)
+            while window and window[-1][1] <= value:
+                window.pop()
+            window.append((now, value, float("inf")))
+            # a value is in the window as long as it was held after its start
+            while window[0][2] <= now - rule.forSeconds:
+                window.popleft()
+            measured = window[0][1] - value
+            breached = measured > rule.threshold
+            cleared = measured <= rule.clearThreshold
+        else:
+            measured = value
+            if rule.condition == ">":
+                breached = value > rule.threshold
+                cleared = value <= rule.clearThreshold
+            else:
+                breached = value < rule.threshold
+                cleared = value >= rule.clearThreshold
+
+        if state.active:
+            if cleared:
+                state.active = False
+                state.since = None
+                if state.notified:
+                    state.notified = False
+                    self.notify(rule, state, RESOLVED, measured, now, events)
+            return
+
+        if not breached:
+            state.since = None
+            return
+
+        if state.since is None:
+            state.since = now
+        if rule.condition == "drop" or now - state.since >= rule.forSeconds:
+            state.active = True
+            # a flapping series is only announced once per cooldown
+            if state.lastNotified is None or now - state.lastNotified >= rule.cooldownSeconds:
+                state.notified = self.notify(rule, state, FIRING, measured, now, events)
+                if state.notified:
+                    state.lastNotified = now
+
+    def expire(self, rules: List[AlertRule], now: float, events: List[AlertEvent]):
+        # series which weren't part of this evaluation are gone
+        names = set([r.name for r in rules])
+        for seriesKey in [k for k, s in self.series.items() if k[0] in names and s.lastSeen < now]:
+            state = self.series.pop(seriesKey)
+            if state.active and state.notified:
+                rule = next(r for r in rules if r.name == seriesKey[0])
+                self.notify(rule, state, RESOLVED, 0.0, now, events)
+
+    def notify(self, rule: AlertRule, state: SeriesState, alertState: str, value: float, now: float, events: List[AlertEvent]) -> bool:
+        # token bucket, refilled with maxPerMinute per minute
+        if self.lastRefill is not None:
+            self.tokens = min(float(self.maxPerMinute), self.tokens + max(0.0, now - self.lastRefill) * self.maxPerMinute / 60.0)
+        self.lastRefill = now
+        if self.tokens < 1.0:
+            self.suppressed += 1
+            return False
+        self.tokens -= 1.0
+        events.append(AlertEvent(time.time(), rule.name, state.description, alertState, value))
+        return True
@@ -0,0 +1,310 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+import math
+
+
+REPULSION = 2000.0
+SPRING = 0.02
+HOST_ATTRACTION = 0.01
+EDGE_LENGTH = 110.0
+HOST_RADIUS = 100.0
+TIME_STEP = 0.05
+DAMPING = 0.85
+
+# nodes further apart don't repel each other, the force is shifted down
+# by REPULSION / REPULSION_RADIUS^2 = 0.05 so that it fades out smoothly
+REPULSION_RADIUS = 200.0
+
+# the layout is stable after this many steps without a node moving faster
+STABLE_SPEED = 0.05
+STABLE_STEPS = 30
+
+# a node moves at most this far per step, the limit shrinks by COOLING every
+# step after a change so that crowded graphs settle as well
+MAX_STEP = 20.0
+COOLING = 0.99
+
+# the pull of a host group grows with its members up to this many
+MAX_HOST_PULL = 10
+
+# positions are only reported once a node moved this far
+REPORT_DISTANCE = 0.5
+
+
+class ForceLayout:
+    # Force directed layout of the node view: nodes repel each other, edges
+    # are springs and nodes of the same host are pulled together. Repulsion
+    # only looks at nodes in the neighbouring cells of a grid with the size
+    # of REPULSION_RADIUS and every pair is visited once, so a step is linear
+    # in the number of nodes for a bounded density instead of quadratic.
+    # Positions are the top left corner of a node, like in qml.
+    #
+    # It is plain Python: a few hundred nodes settle within seconds at
+    # display rate, a thousand take about a minute and with thousands of
+    # crowded nodes a step takes up to seconds (benchmarks/force_layout_bench.py).
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.hosts: List[str] = []
+        self.x: List[float] = []
+        self.y: List[float] = []
+        self.vx: List[float] = []
+        self.vy: List[float] = []
+        self.pinned: List[bool] = []
+        self.reportedX: List[float] = []
+        self.reportedY: List[float] = []
+        self.edges: Set[Tuple[str, str]] = set()
+        self.nodeEdges: Dict[str, Set[Tuple[str, str]]] = {}
+        # edges as node indexes, rebuilt after a change
+        self.edgeIndexes: Optional[List[Tuple[int, int]]] = None
+        self.width = 0.0
+        self.height = 0.0
+        self.nodeSize = 30.0
+        self.scale = 1.0
+        self.calmSteps = 0
+        self.temperature = MAX_STEP
+
+    def __len__(self):
+        return len(self.keys)
+
+    def wake(self):
+        self.calmSteps = 0
+        self.temperature = MAX_STEP
+
+    def isStable(self) -> bool:
+        return self.calmSteps >= STABLE_STEPS or self.temperature < STABLE_SPEED
+
+    def addNode(self, key: str, hostName: str, x: float, y: float):
+        if key in self.index:
+            return
+        self.index[key] = len(self.keys)
+        self.keys.append(key)
+        self.hosts.append(hostName)
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(0.0)
+        self.vy.append(0.0)
+        self.pinned.append(False)
+        # nan never equals, the first step reports the node
+        self.reportedX.append(math.nan)
+        self.reportedY.append(math.nan)
+        self.nodeEdges[key] = set()
+        self.wake()
+
+    def removeNode(self, key: str):
+        i = self.index.pop(key, None)
+        if i is None:
+            return
+        for edge in list(self.nodeEdges.get(key, ())):
+            self.removeEdge(*edge)
+        del self.nodeEdges[key]
+
+        # move the last node into the gap
+        last = len(self.keys) - 1
+        for values in (self.keys, self.hosts, self.x, self.y, self.vx, self.vy, self.pinned, self.reportedX, self.reportedY):
+            values[i] = values[last]
+            values.pop()
+        if i < last:
+            self.index[self.keys[i]] = i
+        self.edgeIndexes = None
+        self.wake()
+
+    def addEdge(self, a: str, b: str):
+        if a not in self.index or b not in self.index or (a, b) in self.edges:
+            return
+        self.edges.add((a, b))
+        self.nodeEdges[a].add((a, b))
+        self.nodeEdges[b].add((a, b))
+        self.edgeIndexes = None
+        self.wake()
+
+    def removeEdge(self, a: str, b: str):
+        if (a, b) not in self.edges:
+            return
+        self.edges.discard((a, b))
+        self.nodeEdges[a].discard((a, b))
+        self.nodeEdges[b].discard((a, b))
+        self.edgeIndexes = None
+        self.wake()
+
+    def setArea(self, width: float, height: float, nodeSize: float, scale: float):
+        self.width = width
+        self.height = height
+        self.nodeSize = nodeSize
+        self.scale = scale
+        self.wake()
+
+    def move(self, key: str, x: float, y: float, pinned: bool):
+        # a node dragged in the view keeps its position while pinned
+        i = self.index.get(key)
+        if i is None:
+            return
+        self.x[i] = self.reportedX[i] = x
+        self.y[i] = self.reportedY[i] = y
+        self.vx[i] = self.vy[i] = 0.0
+        self.pinned[i] = pinned
+        self.wake()
+
+    def step(self) -> List[list]:
+        # one integration step, returns [key, x, y] of the nodes which moved noticeably
+        n = len(self.keys)
+        if n == 0:
+            self.calmSteps = STABLE_STEPS
+            return []
+
+        xs = self.x
+        ys = self.y
+        fx = [0.0] * n
+        fy = [0.0] * n
+
+        self.repulse(fx, fy)
+
+        # edge springs
+        edgeLength = EDGE_LENGTH * self.scale
+        if self.edgeIndexes is None:
+            self.edgeIndexes = [(self.index[a], self.index[b]) for (a, b) in self.edges]
+        for (i, j) in self.edgeIndexes:
+            dx = xs[j] - xs[i]
+            dy = ys[j] - ys[i]
+            dist = math.sqrt(dx * dx + dy * dy) or 0.01
+            f = (dist - edgeLength) * SPRING / dist
+            fx[i] += dx * f
+            fy[i] += dy * f
+            fx[j] -= dx * f
+            fy[j] -= dy * f
+
+        self.attractHosts(fx, fy)
+
+        maxX = max(0.0, self.width - self.nodeSize)
+        maxY = max(0.0, self.height - self.nodeSize)
+        vxs = self.vx
+        vys = self.vy
+        reportedX = self.reportedX
+        reportedY = self.reportedY
+        pinned = self.pinned
+        temperature = self.temperature * self.scale
+        temperatureSq = temperature * temperature
+        maxSpeedSq = 0.0
+        moved = []
+        for i in range(n):
+            if pinned[i]:
+                continue
+            vx = (vxs[i] + fx[i] * TIME_STEP) * DAMPING
+            vy = (vys[i] + fy[i] * TIME_STEP) * DAMPING
+            speedSq = vx * vx + vy * vy
+            if speedSq > temperatureSq:
+                f = temperature / math.sqrt(speedSq)
+                vx *= f
+                vy *= f
+            x = xs[i] + vx
+            y = ys[i] + vy
+            # a node pushed against the border doesn't keep its speed
+            if x < 0.0 or x > maxX:
+                x = 0.0 if x < 0.0 else maxX
+                vx = x - xs[i]
+            if y < 0.0 or y > maxY:
+                y = 0.0 if y < 0.0 else maxY
+                vy = y - ys[i]
+            vxs[i] = vx
+            vys[i] = vy
+            xs[i] = x
+            ys[i] = y
+            speedSq = vx * vx + vy * vy
+            if speedSq > maxSpeedSq:
+                maxSpeedSq = speedSq
+            if not (-REPORT_DISTANCE < x - reportedX[i] < REPORT_DISTANCE and -REPORT_DISTANCE < y - reportedY[i] < REPORT_DISTANCE):
+                reportedX[i] = x
+                reportedY[i] = y
+                moved.append([self.keys[i], x, y])
+
+        self.temperature *= COOLING
+        if maxSpeedSq < STABLE_SPEED * STABLE_SPEED:
+            self.calmSteps += 1
+        else:
+            self.calmSteps = 0
+        return moved
+
+    def repulse(self, fx: List[float], fy: List[float]):
+        xs = self.x
+        ys = self.y
+        cellSize = REPULSION_RADIUS * self.scale
+        radiusSq = cellSize * cellSize
+        cutoff = REPULSION / radiusSq
+
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(len(xs)):
+            cells.setdefault((int(xs[i] // cellSize), int(ys[i] // cellSize)), []).append(i)
+
+        for ((cx, cy), members) in cells.items():
+            # pairs inside the cell, then with half of the neighbours so
+            # that every pair of cells is visited once
+            others = []
+            for (ox, oy) in ((1, 0), (-1, 1), (0, 1), (1, 1)):
+                neighbour = cells.get((cx + ox, cy + oy))
+                if neighbour is not None:
+                    others.extend(neighbour)
+
+            count = len(members)
+            for k in range(count):
+                i = members[k]
+                xi = xs[i]
+                yi = ys[i]
+                fxi = 0.0
+                fyi = 0.0
+                for j in (members[k + 1:] + others if k + 1 < count else others):
+                    dx = xi - xs[j]
+                    dy = yi - ys[j]
+                    distSq = dx * dx + dy * dy + 0.01
+                    if distSq > radiusSq:
+                        continue
+                    if distSq == 0.01 and dx == 0.0 and dy == 0.0:
+                        # nodes on top of each other, any direction apart
+                        dx = math.cos(i + 2 * j) * 0.01
+                        dy = math.sin(i + 2 * j) * 0.01
+                    f = (REPULSION / distSq - cutoff) * distSq ** -0.5
+                    dx *= f
+                    dy *= f
+                    fxi += dx
+                    fyi += dy
+                    fx[j] -= dx
+                    fy[j] -= dy
+                fx[i] += fxi
+                fy[i] += fyi
+
+    def attractHosts(self, fx: List[float], fy: List[float]):
+        # towards the center of the host group instead of every member,
+        # nodes closer than HOST_RADIUS aren't pulled
+        sums: Dict[str, List[float]] = {}
+        for (i, host) in enumerate(self.hosts):
+            if host:
+                s = sums.setdefault(host, [0.0, 0.0, 0])
+                s[0] += self.x[i]
+                s[1] += self.y[i]
+                s[2] += 1
+
+        hostRadius = HOST_RADIUS * self.scale
+        for (i, host) in enumerate(self.hosts):
+            if not host:
+                continue
+            (sx, sy, count) = sums[host]
+            if count < 2:
+                continue
+            dx = sx / count - self.x[i]
+            dy = sy / count - self.y[i]
+            dist = math.sqrt(dx * dx + dy * dy)
+            if dist > hostRadius:
+                f = min(count - 1, MAX_HOST_PULL) * (dist - hostRadius) * HOST_ATTRACTION / dist
+                fx[i] += dx * f
+                fy[i] += dy * f
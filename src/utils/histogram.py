@@ -0,0 +1,140 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+
+# sub buckets per power of two, values are kept with an error below 1 %
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# largest value which is told apart, about 1.2 hours in microseconds
+MAX_VALUE_BITS = 32
+
+BUCKETS = SUB_BUCKETS * (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1)
+MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+
+def bucketIndex(value: int) -> int:
+    # values below 2 * SUB_BUCKETS have a bucket of their own, above that a
+    # bucket covers 2^shift values
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucketValue(index: int) -> int:
+    # highest value of a bucket
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    if shift <= 0:
+        return index
+    return ((index - (shift << SUB_BUCKET_BITS) + 1) << shift) - 1
+
+
+class Histogram:
+    # HDR style histogram of non-negative integers, log-linear buckets in a
+    # fixed size array. Larger values are counted as MAX_VALUE.
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.max = 0
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        elif value > MAX_VALUE:
+            value = MAX_VALUE
+        self.counts[bucketIndex(value)] += 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentiles(self, percents: Sequence[float]) -> List[Optional[int]]:
+        # values at the given ascending percentiles, None while empty
+        if self.count == 0:
+            return [None] * len(percents)
+
+        ranks = [max(1, -(-self.count * p // 100)) for p in percents]
+        values = []
+        seen = 0
+        for (index, count) in enumerate(self.counts):
+            if count == 0:
+                continue
+            seen += count
+            while len(values) < len(ranks) and seen >= ranks[len(values)]:
+                values.append(min(bucketValue(index), self.max))
+            if len(values) == len(ranks):
+                break
+        return values
+
+    def percentile(self, percent: float) -> Optional[int]:
+        return self.percentiles([percent])[0]
+
+    def reset(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.max = 0
+
+
+class ReaderTimings:
+    # Latency from the source timestamp to the reception and the time
+    # between two samples of the same writer, in microseconds. The samples
+    # of a take share one reception time, the interval is taken from the
+    # source timestamps, which are all of the clock of the writer.
+
+    PERCENTS = (50.0, 99.0, 99.9)
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.interArrival = Histogram()
+        self.samples = 0
+        self.writers: Dict[str, int] = {} # writer guid -> samples
+        self.lastSource: Dict[str, float] = {} # writer guid -> source timestamp
+        self.lost = 0
+        self.rejected = 0
+        self.changed = False
+
+    def record(self, reception: float, sourceTimestamp: float, writerGuid: str):
+        if sourceTimestamp > 0:
+            # negative with clocks of different hosts apart, counted as 0
+            self.latency.record(int((reception - sourceTimestamp) * 1e6))
+            last = self.lastSource.get(writerGuid)
+            if last is not None:
+                self.interArrival.record(int((sourceTimestamp - last) * 1e6))
+            self.lastSource[writerGuid] = sourceTimestamp
+        self.samples += 1
+        self.writers[writerGuid] = self.writers.get(writerGuid, 0) + 1
+        self.changed = True
+
+    def setLost(self, lost: int, rejected: int):
+        if lost != self.lost or rejected != self.rejected:
+            self.lost = lost
+            self.rejected = rejected
+            self.changed = True
+
+    def summary(self) -> dict:
+        # percentiles in milliseconds, -1 while there is no value
+        def millis(values):
+            return [-1.0 if v is None else v / 1000.0 for v in values]
+
+        self.changed = False
+        return {
+            "samples": self.samples,
+            "latency": millis(self.latency.percentiles(self.PERCENTS)),
+            "latencyMax": self.latency.max / 1000.0,
+            "interArrival": millis(self.interArrival.percentiles(self.PERCENTS)),
+            "writers": len(self.writers),
+            "lost": self.lost,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,193 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import codecs
+import json
+import re
+
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+SCALAR = re.compile(r"[^,:\[\]{}\s]+")
+# everything up to the next bracket which is not inside a string, stops
+# in front of a string which isn't complete yet
+SKIP = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+
+
+class JsonStreamError(ValueError):
+    pass
+
+
+class JsonStreamExtractor:
+    # Extracts parts of a json document while its bytes arrive. Only the
+    # current value and the unread rest of the last chunk are kept, the
+    # parts not selected by the spec are skipped without being decoded.
+    #
+    # The spec describes what to keep:
+    #   True             keep the value as is
+    #   {key: spec}      walk the object, keep only these keys
+    #   [spec]           walk the array, apply spec to every item
+    #   frozenset(keys)  decode the object at once, keep only these keys
+    #
+    # A value which doesn't have the shape of its spec is kept as is.
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.done = False
+        self.result = None
+        self.textDecoder = codecs.getincrementaldecoder("utf-8")()
+        self.jsonDecoder = json.JSONDecoder()
+        self.parser = self.parseDocument()
+
+    def feed(self, data: bytes):
+        self.append(self.textDecoder.decode(data))
+
+    def close(self):
+        self.eof = True
+        self.append(self.textDecoder.decode(b"", final=True))
+        if not self.done:
+            raise JsonStreamError("Incomplete json document")
+        return self.result
+
+    def append(self, text: str):
+        # drop what is already consumed, positions are relative to the buffer start
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        if self.done:
+            return
+        try:
+            next(self.parser)
+        except StopIteration as stop:
+            self.done = True
+            self.result = stop.value
+
+    def needMore(self):
+        if self.eof:
+            raise JsonStreamError("Unexpected end of json document")
+        yield
+
+    def peek(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            yield from self.needMore()
+
+    def expect(self, chars: str):
+        c = yield from self.peek()
+        if c not in chars:
+            raise JsonStreamError(f"Expected one of '{chars}' but got '{c}'")
+        self.pos += 1
+        return c
+
+    def readString(self):
+        c = yield from self.peek()
+        if c != "\"":
+            raise JsonStreamError(f"Expected a string but got '{c}'")
+        while True:
+            match = STRING.match(self.buffer, self.pos)
+            if match:
+                self.pos = match.end()
+                text = match.group()
+                return json.loads(text) if "\\" in text else text[1:-1]
+            yield from self.needMore()
+
+    def readValue(self):
+        c = yield from self.peek()
+        while True:
+            if c in "{[\"":
+                try:
+                    (value, self.pos) = self.jsonDecoder.raw_decode(self.buffer, self.pos)
+                    return value
+                except json.JSONDecodeError as e:
+                    if self.eof:
+                        raise JsonStreamError(str(e))
+            else:
+                match = SCALAR.match(self.buffer, self.pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if match and (match.end() < len(self.buffer) or self.eof):
+                    self.pos = match.end()
+                    try:
+                        return json.loads(match.group())
+                    except json.JSONDecodeError as e:
+                        raise JsonStreamError(str(e))
+            yield from self.needMore()
+
+    def skipValue(self):
+        c = yield from self.peek()
+        if c not in "{[":
+            yield from self.readValue()
+            return
+
+        depth = 0
+        while True:
+            self.pos = SKIP.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer) or self.buffer[self.pos] == "\"":
+                yield from self.needMore()
+                continue
+            c = self.buffer[self.pos]
+            self.pos += 1
+            if c in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def walkObject(self, spec: dict):
+        result = {}
+        yield from self.expect("{")
+        c = yield from self.peek()
+        if c == "}":
+            self.pos += 1
+            return result
+
+        while True:
+            key = yield from self.readString()
+            yield from self.expect(":")
+            if key in spec:
+                result[key] = yield from self.extract(spec[key])
+            else:
+                yield from self.skipValue()
+            if (yield from self.expect(",}")) == "}":
+                return result
+
+    def walkArray(self, itemSpec):
+        result = []
+        yield from self.expect("[")
+        c = yield from self.peek()
+        if c == "]":
+            self.pos += 1
+            return result
+
+        while True:
+            result.append((yield from self.extract(itemSpec)))
+            if (yield from self.expect(",]")) == "]":
+                return result
+
+    def extract(self, spec):
+        c = yield from self.peek()
+        if isinstance(spec, dict) and c == "{":
+            return (yield from self.walkObject(spec))
+        if isinstance(spec, list) and c == "[":
+            return (yield from self.walkArray(spec[0]))
+
+        value = yield from self.readValue()
+        if isinstance(spec, frozenset) and isinstance(value, dict):
+            return {key: value[key] for key in value.keys() if key in spec}
+        return value
+
+    def parseDocument(self):
+        return (yield from self.extract(self.spec))
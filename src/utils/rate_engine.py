@@ -0,0 +1,85 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+import math
+
+
+COUNTER_MAX = 2 ** 64
+# a decrease from above this value is taken as a wrap, below as a reset
+WRAP_THRESHOLD = 2 ** 63
+DEFAULT_EWMA_SECONDS = 10.0
+
+
+@dataclass
+class CounterState:
+    value: int
+    timestamp: float
+    rate: float
+    ewma: Optional[float]
+
+
+@dataclass
+class RateSample:
+    rate: float
+    ewma: float
+
+
+class RateEngine:
+    # Per second rates of monotonic counters, keyed by anything hashable.
+    # Timestamps must be monotonic seconds. Keys should identify a single
+    # entity (e.g. the writer guid), a restarted process then shows up as a
+    # new key instead of a jump in an existing one.
+
+    def __init__(self, ewmaSeconds: float = DEFAULT_EWMA_SECONDS):
+        self.ewmaSeconds = ewmaSeconds
+        self.counters: Dict[Hashable, CounterState] = {}
+
+    def update(self, key: Hashable, value: int, timestamp: float) -> Optional[RateSample]:
+        if key not in self.counters:
+            self.counters[key] = CounterState(value, timestamp, 0.0, None)
+            return None # first sample, no rate yet
+
+        state = self.counters[key]
+        elapsed = timestamp - state.timestamp
+        if elapsed <= 0:
+            return RateSample(state.rate, state.ewma if state.ewma is not None else state.rate)
+
+        delta = value - state.value
+        if delta < 0:
+            if state.value >= WRAP_THRESHOLD:
+                delta += COUNTER_MAX
+            else:
+                # counter reset, start over from the new value
+                state.value = value
+                state.timestamp = timestamp
+                return None
+
+        rate = delta / elapsed
+        if state.ewma is None:
+            state.ewma = rate
+        else:
+            alpha = 1.0 - math.exp(-elapsed / self.ewmaSeconds)
+            state.ewma += alpha * (rate - state.ewma)
+
+        state.value = value
+        state.timestamp = timestamp
+        state.rate = rate
+        return RateSample(rate, state.ewma)
+
+    def expire(self, olderThan: float):
+        for key in [k for k, state in self.counters.items() if state.timestamp < olderThan]:
+            del self.counters[key]
+
+    def clear(self):
+        self.counters.clear()
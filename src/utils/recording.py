@@ -0,0 +1,339 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from loguru import logger as logging
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+import base64
+import json
+import mmap
+import os
+import struct
+import sys
+import uuid
+
+from cyclonedds.idl._xt_builder import XTBuilder, XTInterpreter
+from cyclonedds.idl._typesupport.DDS import XTypes as xt
+
+from dds_access.received_sample import ReceivedSample, packInvalidSample, unpackInvalidSample
+
+
+# A recording is a header, followed by topic and sample records in the order
+# they were received, followed by the index and the trailer. A recording
+# without trailer, e.g. after a crash, is indexed again when it is opened.
+MAGIC = b"INSIGHTR"
+INDEX_MAGIC = b"INSIGHTI"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sI")
+# kind, topic id, reception and source timestamp in ns, writer guid, payload length
+RECORD_HEADER = struct.Struct("<BHqq16sI")
+# the index is the file offset and reception timestamp in ns of the first
+# sample of every block and the topics in the block, as little endian arrays
+# of blocks, blocks, blocks + 1 and topic ids entries
+INDEX_HEADER = struct.Struct("<QQ") # blocks, topic ids
+# index offset, topics offset, samples, magic
+TRAILER = struct.Struct("<QQQ8s")
+
+SAMPLE = 0
+INVALID_SAMPLE = 1 # payload is the SampleInfo and the serialized key, see packInvalidSample
+TOPIC = 2 # payload is the json of a RecordedTopic
+
+# samples per index entry
+BLOCK_SAMPLES = 256
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+NO_GUID = bytes(16)
+
+
+class RecordedTopic(NamedTuple):
+    domainId: int
+    topicName: str
+    typeName: str
+    typeId: bytes # serialized XTypes TypeIdentifier, empty if unknown
+    typeMapping: bytes # serialized XTypes TypeMapping
+
+    def toJson(self) -> dict:
+        return {
+            "domain_id": self.domainId,
+            "topic_name": self.topicName,
+            "topic_type": self.typeName,
+            "type_id": base64.b64encode(self.typeId).decode("ascii"),
+            "type_mapping": base64.b64encode(self.typeMapping).decode("ascii")
+        }
+
+    @staticmethod
+    def fromJson(entry: dict) -> "RecordedTopic":
+        return RecordedTopic(entry["domain_id"], entry["topic_name"], entry["topic_type"],
+                             base64.b64decode(entry["type_id"]), base64.b64decode(entry["type_mapping"]))
+
+
+def typeInformation(dataType) -> Tuple[bytes, bytes]:
+    # the type as XTypes, so that a recording can be decoded without the idl
+    try:
+        (info, mapping) = XTBuilder.process_type(dataType)
+        return (info.complete.typeid_with_size.type_id.serialize(), mapping.serialize())
+    except Exception as e:
+        logging.warning(f"Type of {dataType} not recorded: {e}")
+        return (b"", b"")
+
+
+class RecordingWriter:
+    # Appends samples to a new recording. Records are buffered and written
+    # in chunks of WRITE_BUFFER_BYTES, the index is kept in memory and
+    # written by close().
+
+    def __init__(self, path: str):
+        self.file = open(path, "wb")
+        self.offset = 0
+        self.buffer = []
+        self.bufferBytes = 0
+        self.topics: List[RecordedTopic] = []
+        self.count = 0
+        self.blockOffsets = array("Q")
+        self.blockTimes = array("q")
+        self.blockTopicStarts = array("Q", [0])
+        self.blockTopicIds = array("H")
+        self.topicsInBlock: Set[int] = set()
+        self.guids: Dict[str, bytes] = {"": NO_GUID}
+        self.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, data: bytes):
+        self.buffer.append(data)
+        self.bufferBytes += len(data)
+
+    def flush(self):
+        if self.bufferBytes > 0:
+            self.file.write(b"".join(self.buffer))
+            self.offset += self.bufferBytes
+            self.buffer = []
+            self.bufferBytes = 0
+
+    def addTopic(self, domainId: int, topicName: str, typeName: str, dataType) -> int:
+        (typeId, typeMapping) = typeInformation(dataType)
+        topicId = len(self.topics)
+        self.topics.append(RecordedTopic(domainId, topicName, typeName, typeId, typeMapping))
+        payload = json.dumps(self.topics[-1].toJson()).encode("utf-8")
+        self.write(RECORD_HEADER.pack(TOPIC, topicId, 0, 0, NO_GUID, len(payload)))
+        self.write(payload)
+        return topicId
+
+    def append(self, topicId: int, samples: List[ReceivedSample]):
+        for sample in samples:
+            if self.count % BLOCK_SAMPLES == 0:
+                self.endBlock()
+                self.blockOffsets.append(self.offset + self.bufferBytes)
+                self.blockTimes.append(int(sample.timestamp * 1e9))
+            self.topicsInBlock.add(topicId)
+
+            guid = self.guids.get(sample.writerGuid)
+            if guid is None:
+                try:
+                    guid = uuid.UUID(sample.writerGuid).bytes
+                except ValueError:
+                    guid = NO_GUID
+                self.guids[sample.writerGuid] = guid
+
+            if sample.info is None:
+                kind = SAMPLE
+                payload = sample.data
+            else:
+                kind = INVALID_SAMPLE
+                payload = packInvalidSample(sample.data, sample.info)
+            self.write(RECORD_HEADER.pack(kind, topicId, int(sample.timestamp * 1e9), int(sample.sourceTimestamp * 1e9), guid, len(payload)))
+            self.write(payload)
+            self.count += 1
+
+        if self.bufferBytes >= WRITE_BUFFER_BYTES:
+            self.flush()
+
+    def endBlock(self):
+        if len(self.topicsInBlock) > 0:
+            self.blockTopicIds.extend(sorted(self.topicsInBlock))
+            self.blockTopicStarts.append(len(self.blockTopicIds))
+            self.topicsInBlock.clear()
+
+    def close(self):
+        self.endBlock()
+        self.flush()
+        indexOffset = self.offset
+        self.write(INDEX_HEADER.pack(len(self.blockOffsets), len(self.blockTopicIds)))
+        for values in (self.blockOffsets, self.blockTimes, self.blockTopicStarts, self.blockTopicIds):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            self.write(values.tobytes())
+        self.flush()
+        topicsOffset = self.offset
+        self.write(json.dumps([t.toJson() for t in self.topics]).encode("utf-8"))
+        self.write(TRAILER.pack(indexOffset, topicsOffset, self.count, INDEX_MAGIC))
+        self.flush()
+        self.file.close()
+
+
+class Recording:
+    # Read access to a recording through mmap. Only the index is read when
+    # it is opened, samples are located with the index, BLOCK_SAMPLES
+    # samples per entry, and read on demand.
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size < FILE_HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a recording")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version) = FILE_HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version > VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a recording")
+
+        self.topics: List[RecordedTopic] = []
+        self.dataTypes: Dict[int, object] = {}
+        self.count = 0
+        self.end = len(self.map) # end of the records
+        self.blockOffsets = array("Q")
+        self.blockTimes = array("q")
+        self.blockTopicStarts = array("Q") # range of each block in blockTopicIds
+        self.blockTopicIds = array("H")
+        self.guids: Dict[bytes, str] = {NO_GUID: ""}
+
+        if not self.readIndex():
+            logging.info(f"Recording {path} has no index, indexing it")
+            self.scan()
+
+        # the reader id replayed samples are shown with
+        self.readerIds = [f"recording/{t.domainId}/{t.topicName}" for t in self.topics]
+
+    def __len__(self):
+        return self.count
+
+    def readIndex(self) -> bool:
+        if len(self.map) < FILE_HEADER.size + TRAILER.size:
+            return False
+        (indexOffset, topicsOffset, count, magic) = TRAILER.unpack_from(self.map, len(self.map) - TRAILER.size)
+        if magic != INDEX_MAGIC or not indexOffset <= topicsOffset <= len(self.map) - TRAILER.size:
+            return False
+
+        self.topics = [RecordedTopic.fromJson(e) for e in json.loads(self.map[topicsOffset:len(self.map) - TRAILER.size])]
+        self.count = count
+        self.end = indexOffset
+        (blocks, topicIds) = INDEX_HEADER.unpack_from(self.map, indexOffset)
+        pos = indexOffset + INDEX_HEADER.size
+        for (values, size) in ((self.blockOffsets, blocks), (self.blockTimes, blocks),
+                               (self.blockTopicStarts, blocks + 1), (self.blockTopicIds, topicIds)):
+            values.frombytes(self.map[pos:pos + size * values.itemsize])
+            if sys.byteorder == "big":
+                values.byteswap()
+            pos += size * values.itemsize
+        return True
+
+    def scan(self):
+        # rebuilds the index from the records, a record cut off at the end is ignored
+        pos = FILE_HEADER.size
+        topics = set()
+        self.blockTopicStarts.append(0)
+        while pos + RECORD_HEADER.size <= len(self.map):
+            (kind, topicId, timestamp, _, _, length) = RECORD_HEADER.unpack_from(self.map, pos)
+            end = pos + RECORD_HEADER.size + length
+            if end > len(self.map):
+                break
+            if kind == TOPIC:
+                self.topics.append(RecordedTopic.fromJson(json.loads(self.map[pos + RECORD_HEADER.size:end])))
+            else:
+                if self.count % BLOCK_SAMPLES == 0:
+                    if self.count > 0:
+                        self.addBlockTopics(topics)
+                    self.blockOffsets.append(pos)
+                    self.blockTimes.append(timestamp)
+                topics.add(topicId)
+                self.count += 1
+            pos = end
+        if self.count > 0:
+            self.addBlockTopics(topics)
+        self.end = pos
+
+    def addBlockTopics(self, topics: Set[int]):
+        self.blockTopicIds.extend(sorted(topics))
+        self.blockTopicStarts.append(len(self.blockTopicIds))
+        topics.clear()
+
+    def dataType(self, topicId: int):
+        # the recorded type, built once
+        if topicId not in self.dataTypes:
+            topic = self.topics[topicId]
+            dataType = None
+            if len(topic.typeId) > 0:
+                try:
+                    mapping = xt.TypeMapping.deserialize(topic.typeMapping)
+                    typeMap = {p.type_identifier: p.type_object for p in mapping.identifier_object_pair_complete}
+                    typeMap.update({p.type_identifier: p.type_object for p in mapping.identifier_object_pair_minimal})
+                    (dataType, _) = XTInterpreter.xt_to_class(xt.TypeIdentifier.deserialize(topic.typeId), typeMap)
+                except Exception as e:
+                    logging.error(f"Failed to rebuild type {topic.typeName}: {e}")
+            self.dataTypes[topicId] = dataType
+        return self.dataTypes[topicId]
+
+    def findTime(self, timestamp: float) -> int:
+        # number of the first sample received at or after timestamp
+        ns = int(timestamp * 1e9)
+        block = max(0, bisect_right(self.blockTimes, ns) - 1)
+        number = block * BLOCK_SAMPLES
+        for (_, _, pos) in self.records(number):
+            if RECORD_HEADER.unpack_from(self.map, pos)[2] >= ns:
+                return number
+            number += 1
+        return number
+
+    def records(self, start: int = 0, topicIds: Optional[Set[int]] = None) -> Iterator[Tuple[int, int, int]]:
+        # (sample number, topic id, offset) of the samples from start on,
+        # blocks without one of the topics are skipped
+        for block in range(start // BLOCK_SAMPLES, len(self.blockOffsets)):
+            if topicIds is not None:
+                blockTopics = self.blockTopicIds[self.blockTopicStarts[block]:self.blockTopicStarts[block + 1]]
+                if not any(t in topicIds for t in blockTopics):
+                    continue
+            number = block * BLOCK_SAMPLES
+            last = min(number + BLOCK_SAMPLES, self.count)
+            pos = self.blockOffsets[block]
+            while number < last:
+                (kind, topicId, _, _, _, length) = RECORD_HEADER.unpack_from(self.map, pos)
+                if kind != TOPIC:
+                    if number >= start and (topicIds is None or topicId in topicIds):
+                        yield (number, topicId, pos)
+                    number += 1
+                pos += RECORD_HEADER.size + length
+
+    def sample(self, pos: int) -> ReceivedSample:
+        (kind, topicId, timestamp, sourceTimestamp, guid, length) = RECORD_HEADER.unpack_from(self.map, pos)
+        payload = self.map[pos + RECORD_HEADER.size:pos + RECORD_HEADER.size + length]
+        info = None
+        if kind == INVALID_SAMPLE:
+            (payload, info) = unpackInvalidSample(payload)
+        writerGuid = self.guids.get(guid)
+        if writerGuid is None:
+            writerGuid = str(uuid.UUID(bytes=guid))
+            self.guids[guid] = writerGuid
+        return ReceivedSample(self.readerIds[topicId], timestamp / 1e9, self.dataType(topicId), payload, info,
+                              sourceTimestamp / 1e9, writerGuid)
+
+    def samples(self, start: int = 0, topicIds: Optional[Set[int]] = None) -> Iterator[Tuple[int, ReceivedSample]]:
+        for (_, topicId, pos) in self.records(start, topicIds):
+            yield (topicId, self.sample(pos))
+
+    def get(self, number: int) -> ReceivedSample:
+        for (_, _, pos) in self.records(number):
+            return self.sample(pos)
+        raise IndexError(number)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
@@ -0,0 +1,168 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from loguru import logger as logging
+from enum import Enum
+from typing import Callable, Optional
+import ast
+import operator
+import re
+
+
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b
+}
+
+STRING = re.compile(r"(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*')")
+# the C and SQL like spellings, outside of strings
+SPELLINGS = (
+    (re.compile(r"&&"), " and "),
+    (re.compile(r"\|\|"), " or "),
+    (re.compile(r"!(?!=)"), " not "),
+    (re.compile(r"<>"), "!="),
+    (re.compile(r"(?<![=!<>])=(?!=)"), "=="),
+    (re.compile(r"\b(and|or|not|in|true|false)\b", re.IGNORECASE), lambda m: m.group(1).lower()),
+    (re.compile(r"\btrue\b"), "True"),
+    (re.compile(r"\bfalse\b"), "False")
+)
+
+
+class Word(str):
+    # a name compared with a field which isn't a field itself, the name
+    # of an enum value
+    pass
+
+
+class SampleFilter:
+    # A filter expression of a reader compiled to a predicate over the
+    # decoded sample. Invalid samples only have their key fields set.
+
+    def __init__(self, text: str, predicate: Callable):
+        self.text = text
+        self.predicate = predicate
+        self.passed = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def copy(self) -> "SampleFilter":
+        # the same compiled expression with counts of its own
+        return SampleFilter(self.text, self.predicate)
+
+    def matches(self, dataType, data: bytes, validData: bool) -> bool:
+        try:
+            sample = dataType.deserialize(data) if validData else dataType.deserialize_key(data)
+            if self.predicate(sample):
+                self.passed += 1
+                return True
+        except Exception as e:
+            # a sample the expression doesn't apply to is dropped
+            if self.errors == 0:
+                logging.warning(f"Filter \"{self.text}\" failed: {e}")
+            self.errors += 1
+        self.dropped += 1
+        return False
+
+
+def compileFilter(text: str) -> Optional[SampleFilter]:
+    # None for an empty expression, raises ValueError if it can't be parsed
+    text = text.strip()
+    if not text:
+        return None
+
+    parts = STRING.split(text)
+    for i in range(0, len(parts), 2):
+        for (pattern, replacement) in SPELLINGS:
+            parts[i] = pattern.sub(replacement, parts[i])
+    try:
+        tree = ast.parse("".join(parts).strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter: {e.msg}")
+    return SampleFilter(text, compileNode(tree.body))
+
+
+def comparable(a, b):
+    # enum fields compare with their name or their value
+    if isinstance(a, Enum) and not isinstance(b, Enum):
+        if isinstance(b, (list, tuple)):
+            b = b[0] if len(b) > 0 else None
+        return a.name if isinstance(b, str) else a.value
+    return a
+
+
+def compileNode(node, words: bool = False) -> Callable:
+    if isinstance(node, ast.BoolOp):
+        values = [compileNode(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda s: all(v(s) for v in values)
+        return lambda s: any(v(s) for v in values)
+
+    if isinstance(node, ast.UnaryOp):
+        operand = compileNode(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda s: not operand(s)
+        if isinstance(node.op, ast.USub):
+            return lambda s: -operand(s)
+
+    if isinstance(node, ast.Compare):
+        left = compileNode(node.left, True)
+        comparisons = []
+        for (op, comparator) in zip(node.ops, node.comparators):
+            if type(op) not in COMPARISONS:
+                raise ValueError("Unsupported comparison in filter")
+            comparisons.append((COMPARISONS[type(op)], compileNode(comparator, True)))
+
+        def compare(s):
+            a = left(s)
+            for (comparison, right) in comparisons:
+                b = right(s)
+                for (x, y) in ((a, b), (b, a)):
+                    if isinstance(x, Word) and not isinstance(y, Enum):
+                        raise AttributeError(f"Unknown field {x}")
+                if not comparison(comparable(a, b), comparable(b, a)):
+                    return False
+                a = b
+            return True
+        return compare
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if words:
+            word = Word(name)
+            return lambda s: getattr(s, name, word)
+        return lambda s: getattr(s, name)
+
+    if isinstance(node, ast.Attribute):
+        value = compileNode(node.value)
+        attr = node.attr
+        return lambda s: getattr(value(s), attr)
+
+    if isinstance(node, ast.Subscript):
+        value = compileNode(node.value)
+        index = compileNode(node.slice)
+        return lambda s: value(s)[index(s)]
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+        constant = node.value
+        return lambda s: constant
+
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        items = [compileNode(item, words) for item in node.elts]
+        return lambda s: tuple(item(s) for item in items)
+
+    raise ValueError(f"Unsupported expression in filter: {ast.unparse(node)}")
@@ -0,0 +1,196 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Set
+import html
+import re
+
+
+# samples per segment, memory is released a whole segment at a time
+SEGMENT_SIZE = 16384
+# newest matches returned by a search
+MAX_RESULTS = 100000
+# nested values below this depth are indexed as text only
+MAX_DEPTH = 8
+
+TOKEN = re.compile(r"\w+(?:[.\-]\w+)*")
+
+
+class Term(NamedTuple):
+    text: str # "value" or "field:value", lower case
+    prefix: bool
+
+    def value(self) -> str:
+        return self.text.rpartition(":")[2]
+
+
+def parseQuery(text: str) -> List[Term]:
+    # whitespace separated terms which all have to match, a trailing *
+    # matches a prefix and field:value only matches values of that field
+    terms = []
+    for word in text.lower().split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        (field, _, value) = word.rpartition(":")
+        tokens = TOKEN.findall(value)
+        if len(tokens) == 0:
+            continue
+        if len(tokens) > 1:
+            # "a-b c" is split into terms like the indexed text
+            terms.extend(Term(f"{field}:{t}" if field else t, False) for t in tokens[:-1])
+        terms.append(Term(f"{field}:{tokens[-1]}" if field else tokens[-1], prefix))
+    return terms
+
+
+def sampleTerms(value) -> Set[str]:
+    # tokens of all values, each also as field:token for its field name
+    # and for the dotted path of nested fields
+    terms = set()
+    addTerms(value, "", "", terms, 0)
+    return terms
+
+
+def addTerms(value, name: str, path: str, terms: Set[str], depth: int):
+    if depth < MAX_DEPTH:
+        if is_dataclass(value) and not isinstance(value, type):
+            for f in fields(value):
+                addTerms(getattr(value, f.name, None), f.name.lower(), f"{path}.{f.name.lower()}" if path else f.name.lower(), terms, depth + 1)
+            return
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                addTerms(item, name, path, terms, depth + 1)
+            return
+
+    text = value.name if isinstance(value, Enum) else str(value)
+    for token in TOKEN.findall(text.lower()):
+        terms.add(token)
+        if name:
+            terms.add(f"{name}:{token}")
+            if path != name:
+                terms.add(f"{path}:{token}")
+
+
+def highlight(text: str, terms: List[Term], color: str) -> str:
+    # html of the text with the tokens matching the value of a term marked,
+    # the field of a field:value term isn't checked
+    values = [(t.value(), t.prefix) for t in terms]
+    parts = []
+    pos = 0
+    for match in TOKEN.finditer(text):
+        token = match.group(0).lower()
+        if any(token.startswith(v) if prefix else token == v for (v, prefix) in values):
+            parts.append(html.escape(text[pos:match.start()]))
+            parts.append(f"<span style=\"background-color:{color}\">{html.escape(match.group(0))}</span>")
+            pos = match.end()
+    parts.append(html.escape(text[pos:]))
+    return "".join(parts)
+
+
+class IndexSegment:
+    # Postings of SEGMENT_SIZE consecutive samples, positions are stored
+    # relative to the first sample of the segment.
+
+    def __init__(self, start: int):
+        self.start = start
+        self.end = start
+        self.postings: Dict[str, array] = {}
+        self.sortedTerms: Optional[List[str]] = None # for prefix lookups, built on demand
+
+    def add(self, seq: int, terms: Set[str]):
+        position = seq - self.start
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = array("I")
+                self.postings[term] = postings
+                self.sortedTerms = None
+            postings.append(position)
+        self.end = seq + 1
+
+    def lookup(self, term: Term) -> Set[int]:
+        if not term.prefix:
+            return set(self.postings.get(term.text, ()))
+
+        if self.sortedTerms is None:
+            self.sortedTerms = sorted(self.postings.keys())
+        positions = set()
+        i = bisect_left(self.sortedTerms, term.text)
+        while i < len(self.sortedTerms) and self.sortedTerms[i].startswith(term.text):
+            positions.update(self.postings[self.sortedTerms[i]])
+            i += 1
+        return positions
+
+    def search(self, terms: List[Term]) -> List[int]:
+        positions = None
+        for term in terms:
+            found = self.lookup(term)
+            positions = found if positions is None else positions & found
+            if not positions:
+                return []
+        return [self.start + p for p in sorted(positions)]
+
+
+class SearchIndex:
+    # Inverted index of samples numbered in the order they arrived. Samples
+    # are added in order and dropped from the front a segment at a time,
+    # so the index only grows with the samples which are kept.
+
+    def __init__(self):
+        self.segments: List[IndexSegment] = []
+
+    def __len__(self):
+        if len(self.segments) == 0:
+            return 0
+        return self.segments[-1].end - self.segments[0].start
+
+    def add(self, seq: int, terms: Set[str]):
+        if len(self.segments) == 0 or seq - self.segments[-1].start >= SEGMENT_SIZE:
+            self.segments.append(IndexSegment(seq))
+        self.segments[-1].add(seq, terms)
+
+    def dropBefore(self, seq: int):
+        # segments which only hold samples before seq
+        while len(self.segments) > 0 and self.segments[0].end <= seq:
+            self.segments.pop(0)
+
+    def search(self, terms: List[Term], first: int = 0) -> List[int]:
+        # matching samples from first on, at most the MAX_RESULTS newest
+        results = []
+        count = 0
+        for segment in reversed(self.segments):
+            if segment.end <= first:
+                break
+            found = [s for s in segment.search(terms) if s >= first]
+            results.append(found)
+            count += len(found)
+            if count >= MAX_RESULTS:
+                break
+        merged = [s for found in reversed(results) for s in found]
+        return merged[-MAX_RESULTS:]
+
+    def clear(self):
+        self.segments.clear()
+
+
+def matchesTerms(terms: List[Term], sampleTerms: Set[str]) -> bool:
+    # a single sample, without an index
+    for term in terms:
+        if term.prefix:
+            if not any(t.startswith(term.text) for t in sampleTerms):
+                return False
+        elif term.text not in sampleTerms:
+            return False
+    return True
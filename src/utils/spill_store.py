@@ -0,0 +1,194 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List
+import os
+import shutil
+import struct
+import tempfile
+
+from dds_access.received_sample import ReceivedSample, packInvalidSample, unpackInvalidSample
+
+
+# timestamp, source timestamp, reader index, type index, writer index,
+# invalid flag, payload length
+RECORD_HEADER = struct.Struct("<ddIHIBI")
+# start, end and reader index of a run of samples of the same reader
+RUN_RECORD = struct.Struct("<qqI")
+PAGE_SIZE = 1024
+SEGMENT_BYTES = 64 * 1024 * 1024
+CACHED_PAGES = 8
+OPEN_SEGMENTS = 4
+
+
+class SpillStore:
+    # Append-only storage of samples which no longer fit into memory. Samples
+    # are numbered from 0 in the order they were appended and read back one
+    # page at a time, only the file offset of every page is kept in memory.
+    # A segment file is started once the current one reached SEGMENT_BYTES,
+    # always at a page boundary, so a page is never split across files.
+    # The runs of samples of the same reader go to a file of their own, so
+    # the ranges of a reader are found without reading the samples.
+
+    def __init__(self, directory: str):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="insight-listener-", dir=directory)
+        self.readerIds: List[str] = []
+        self.readerIndex: Dict[str, int] = {}
+        self.dataTypes: List[object] = []
+        self.typeIndex: Dict[int, int] = {} # id(dataType) -> index
+        self.writerGuids: List[str] = []
+        self.writerIndex: Dict[str, int] = {}
+        self.pageSegments = array("I")
+        self.pageOffsets = array("Q")
+        self.pageCache: "OrderedDict[int, List[ReceivedSample]]" = OrderedDict()
+        self.count = 0
+        self.segment = -1
+        self.writer = None
+        self.readers = {}
+        self.runWriter = open(os.path.join(self.directory, "runs.bin"), "ab")
+        self.runReader = -1 # reader index of the last run, it is still open
+        self.runStart = 0
+
+    def __len__(self):
+        return self.count
+
+    def segmentPath(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.bin")
+
+    def intern(self, sample: ReceivedSample):
+        if sample.readerId not in self.readerIndex:
+            self.readerIndex[sample.readerId] = len(self.readerIds)
+            self.readerIds.append(sample.readerId)
+        if id(sample.dataType) not in self.typeIndex:
+            self.typeIndex[id(sample.dataType)] = len(self.dataTypes)
+            self.dataTypes.append(sample.dataType)
+        if sample.writerGuid not in self.writerIndex:
+            self.writerIndex[sample.writerGuid] = len(self.writerGuids)
+            self.writerGuids.append(sample.writerGuid)
+        return (self.readerIndex[sample.readerId], self.typeIndex[id(sample.dataType)], self.writerIndex[sample.writerGuid])
+
+    def append(self, samples: List[ReceivedSample]):
+        chunks = []
+        runs = []
+        for sample in samples:
+            if self.count % PAGE_SIZE == 0:
+                chunks = self.startPage(chunks)
+            (readerIndex, typeIndex, writerIndex) = self.intern(sample)
+            if readerIndex != self.runReader:
+                if self.runReader >= 0:
+                    runs.append(RUN_RECORD.pack(self.runStart, self.count, self.runReader))
+                self.runReader = readerIndex
+                self.runStart = self.count
+            if sample.info is None:
+                payload = sample.data
+            else:
+                payload = packInvalidSample(sample.data, sample.info)
+            chunks.append(RECORD_HEADER.pack(sample.timestamp, sample.sourceTimestamp, readerIndex, typeIndex, writerIndex,
+                                             sample.info is not None, len(payload)))
+            chunks.append(payload)
+            self.count += 1
+        self.writer.write(b"".join(chunks))
+        self.writer.flush()
+        if len(runs) > 0:
+            self.runWriter.write(b"".join(runs))
+            self.runWriter.flush()
+
+        # the last page may have grown
+        self.pageCache.pop((self.count - 1) // PAGE_SIZE, None)
+
+    def startPage(self, chunks):
+        if self.writer is not None:
+            self.writer.write(b"".join(chunks))
+            chunks = []
+        if self.writer is None or self.writer.tell() >= SEGMENT_BYTES:
+            if self.writer is not None:
+                self.writer.close()
+            self.segment += 1
+            self.writer = open(self.segmentPath(self.segment), "ab")
+        self.pageSegments.append(self.segment)
+        self.pageOffsets.append(self.writer.tell())
+        return chunks
+
+    def get(self, index: int) -> ReceivedSample:
+        (page, offset) = divmod(index, PAGE_SIZE)
+        samples = self.pageCache.get(page)
+        if samples is None:
+            samples = self.readPage(page)
+            self.pageCache[page] = samples
+            if len(self.pageCache) > CACHED_PAGES:
+                self.pageCache.popitem(last=False)
+        else:
+            self.pageCache.move_to_end(page)
+        return samples[offset]
+
+    def readerRuns(self, readerId: str):
+        # (start, end) of the sample ranges of a reader, in order
+        readerIndex = self.readerIndex.get(readerId)
+        if readerIndex is None:
+            return
+        with open(os.path.join(self.directory, "runs.bin"), "rb") as f:
+            while True:
+                data = f.read(RUN_RECORD.size * 4096)
+                if len(data) == 0:
+                    break
+                for (start, end, index) in RUN_RECORD.iter_unpack(data):
+                    if index == readerIndex:
+                        yield (start, end)
+        if self.runReader == readerIndex:
+            yield (self.runStart, self.count)
+
+    def readPage(self, page: int) -> List[ReceivedSample]:
+        segment = self.pageSegments[page]
+        start = self.pageOffsets[page]
+        if page + 1 < len(self.pageSegments) and self.pageSegments[page + 1] == segment:
+            size = self.pageOffsets[page + 1] - start
+        else:
+            size = -1 # the page ends with its segment
+
+        f = self.readers.pop(segment, None)
+        if f is None:
+            f = open(self.segmentPath(segment), "rb")
+            if len(self.readers) >= OPEN_SEGMENTS:
+                self.readers.pop(next(iter(self.readers))).close()
+        self.readers[segment] = f # most recently used last
+        f.seek(start)
+        data = f.read(size)
+
+        samples = []
+        pos = 0
+        count = min(PAGE_SIZE, self.count - page * PAGE_SIZE)
+        while len(samples) < count:
+            (timestamp, sourceTimestamp, readerIndex, typeIndex, writerIndex, invalid, length) = RECORD_HEADER.unpack_from(data, pos)
+            pos += RECORD_HEADER.size
+            payload = data[pos:pos + length]
+            pos += length
+            info = None
+            if invalid:
+                (payload, info) = unpackInvalidSample(payload)
+            samples.append(ReceivedSample(self.readerIds[readerIndex], timestamp, self.dataTypes[typeIndex], payload, info,
+                                          sourceTimestamp, self.writerGuids[writerIndex]))
+        return samples
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.runWriter.close()
+        for f in self.readers.values():
+            f.close()
+        self.readers.clear()
+        self.pageCache.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,128 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.rate_engine import RateSample
+
+
+DIMENSIONS = ("domain", "host", "process", "participant", "topic", "writer", "reader")
+
+
+@dataclass
+class EntityRow:
+    kind: str # "writer" or "reader"
+    guid: str
+    domain: str
+    host: str
+    process: str
+    participant: str
+    topic: str
+    values: Dict[str, float] = field(default_factory=dict)
+    rates: Dict[str, RateSample] = field(default_factory=dict)
+
+    def dimension(self, dimension: str) -> str:
+        if dimension == "writer" or dimension == "reader":
+            return self.guid
+        return getattr(self, dimension)
+
+
+class InterestSet:
+    # What a view displays: per dimension the keys it is limited to and the
+    # keys it hides. Endpoints without any matching row are not displayed
+    # and only need a background refresh.
+
+    def __init__(self):
+        self.included: Dict[str, Set[str]] = {}
+        self.hidden: Dict[str, Set[str]] = {}
+
+    def setIncluded(self, dimension: str, keys: Optional[Set[str]]):
+        if keys is None:
+            self.included.pop(dimension, None)
+        else:
+            self.included[dimension] = set(keys)
+
+    def setHidden(self, dimension: str, key: str, hidden: bool):
+        if hidden:
+            self.hidden.setdefault(dimension, set()).add(key)
+        elif dimension in self.hidden:
+            self.hidden[dimension].discard(key)
+
+    def clearHidden(self):
+        self.hidden.clear()
+
+    def isEverything(self) -> bool:
+        return len(self.included) == 0 and all([len(keys) == 0 for keys in self.hidden.values()])
+
+    def matches(self, row: EntityRow) -> bool:
+        for dimension, keys in self.included.items():
+            if row.dimension(dimension) not in keys:
+                return False
+        for dimension, keys in self.hidden.items():
+            if row.dimension(dimension) in keys:
+                return False
+        return True
+
+    def mayMatch(self, known: Dict[str, str]) -> bool:
+        # for endpoints without rows yet, only the known dimensions can be checked
+        for dimension, keys in self.included.items():
+            if dimension in known and known[dimension] not in keys:
+                return False
+        return True
+
+
+class StatisticsTable:
+    # Raw per writer/reader counters of the latest poll. Aggregations are only
+    # computed when asked for and are cached until the next poll replaces the
+    # rows, so switching the aggregation doesn't need a new poll and the ones
+    # nobody looks at cost nothing.
+
+    def __init__(self):
+        self.generation = 0
+        self.rows: List[EntityRow] = []
+        self.cache: Dict[Tuple[str, str], Dict[str, Dict[str, float]]] = {}
+
+    def replace(self, rows: List[EntityRow]):
+        self.rows = rows
+        self.generation += 1
+        self.cache.clear()
+
+    def clear(self):
+        self.replace([])
+
+    def aggregate(self, dimension: str, mode: str) -> Dict[str, Dict[str, float]]:
+        cacheKey = (dimension, mode)
+        if cacheKey in self.cache:
+            return self.cache[cacheKey]
+
+        aggregated: Dict[str, Dict[str, float]] = {}
+        for row in self.rows:
+            # per writer only shows writer metrics, per reader only reader metrics
+            if dimension in ("writer", "reader") and row.kind != dimension:
+                continue
+
+            aggkey = row.dimension(dimension)
+            for metric, value in row.values.items():
+                if mode != "cumulative" and metric in row.rates:
+                    sample = row.rates[metric]
+                    value = sample.ewma if mode == "ewma" else sample.rate
+
+                if metric not in aggregated:
+                    aggregated[metric] = {}
+                if aggkey in aggregated[metric]:
+                    aggregated[metric][aggkey] += value
+                else:
+                    aggregated[metric][aggkey] = value
+
+        self.cache[cacheKey] = aggregated
+        return aggregated
@@ -0,0 +1,190 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from array import array
+from typing import Dict, List, Tuple
+
+
+# (bucket seconds, capacity): 15 minutes at 1 s, 3 hours at 10 s, 24 hours at 1 min
+DEFAULT_TIERS = ((1, 900), (10, 1080), (60, 1440))
+DEFAULT_MAX_SERIES = 1000
+
+
+class RingBuffer:
+    # Bounded columns of doubles, the first column is the timestamp and must
+    # be appended in ascending order. The columns grow with the values
+    # appended until they reach the capacity, then the oldest is overwritten.
+
+    def __init__(self, capacity: int, columns: int):
+        self.capacity = capacity
+        self.columns = [array("d") for _ in range(columns)]
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, *values):
+        if self.count < self.capacity:
+            # not wrapped yet, the head is the end of the columns
+            for column, value in zip(self.columns, values):
+                column.append(value)
+            self.count += 1
+        else:
+            for column, value in zip(self.columns, values):
+                column[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+
+    def clear(self):
+        self.columns = [array("d") for _ in self.columns]
+        self.head = 0
+        self.count = 0
+
+    def physical(self, logical: int) -> int:
+        return (self.head - self.count + logical) % self.capacity
+
+    def time(self, logical: int) -> float:
+        return self.columns[0][self.physical(logical)]
+
+    def oldestTime(self):
+        return self.time(0) if self.count > 0 else None
+
+    def lowerBound(self, t: float) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.time(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def rows(self, fromTime: float, toTime: float) -> List[Tuple[float, ...]]:
+        result = []
+        for logical in range(self.lowerBound(fromTime), self.count):
+            idx = self.physical(logical)
+            if self.columns[0][idx] > toTime:
+                break
+            result.append(tuple(column[idx] for column in self.columns))
+        return result
+
+
+class DownsampleTier:
+    # Collapses all values of a bucket into (start, min, max, avg).
+
+    def __init__(self, bucketSeconds: float, capacity: int):
+        self.bucketSeconds = bucketSeconds
+        self.points = RingBuffer(capacity, 4)
+        self.bucketStart = None
+        self.resetBucket()
+
+    def resetBucket(self):
+        self.bucketMin = 0.0
+        self.bucketMax = 0.0
+        self.bucketSum = 0.0
+        self.bucketCount = 0
+
+    def add(self, t: float, value: float):
+        bucketStart = t - (t % self.bucketSeconds)
+        if self.bucketCount > 0 and bucketStart != self.bucketStart:
+            self.flush()
+        if self.bucketCount == 0:
+            self.bucketStart = bucketStart
+            self.bucketMin = value
+            self.bucketMax = value
+        else:
+            self.bucketMin = min(self.bucketMin, value)
+            self.bucketMax = max(self.bucketMax, value)
+        self.bucketSum += value
+        self.bucketCount += 1
+
+    def flush(self):
+        if self.bucketCount > 0:
+            self.points.append(self.bucketStart, self.bucketMin, self.bucketMax, self.bucketSum / self.bucketCount)
+            self.resetBucket()
+
+    def covers(self, t: float) -> bool:
+        oldest = self.points.oldestTime()
+        if oldest is None:
+            return self.bucketCount == 0 or self.bucketStart <= t
+        # as long as the ring isn't full, it holds the whole history
+        return len(self.points) < self.points.capacity or oldest <= t
+
+    def query(self, fromTime: float, toTime: float):
+        rows = self.points.rows(fromTime, toTime)
+        if self.bucketCount > 0 and fromTime <= self.bucketStart <= toTime:
+            rows.append((self.bucketStart, self.bucketMin, self.bucketMax, self.bucketSum / self.bucketCount))
+        return rows
+
+    def clear(self):
+        self.points.clear()
+        self.resetBucket()
+
+
+class TimeSeries:
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = [DownsampleTier(seconds, capacity) for (seconds, capacity) in tiers]
+        self.lastTime = 0.0
+
+    def add(self, t: float, value: float):
+        self.lastTime = t
+        for tier in self.tiers:
+            tier.add(t, value)
+
+    def query(self, fromTime: float, toTime: float, maxPoints: int):
+        # finest tier which has the whole range and fits into maxPoints
+        for tier in self.tiers:
+            if (toTime - fromTime) / tier.bucketSeconds <= maxPoints and tier.covers(fromTime):
+                return tier.query(fromTime, toTime)
+
+        rows = self.tiers[-1].query(fromTime, toTime)
+        if len(rows) > maxPoints > 0:
+            step = len(rows) / maxPoints
+            rows = [rows[int(i * step)] for i in range(maxPoints)]
+        return rows
+
+
+class TimeSeriesStore:
+    # Bounded history of (metric, key) series, the memory used does not grow
+    # with the capture duration. The least recently updated series is dropped
+    # if more than maxSeries exist.
+
+    def __init__(self, tiers=DEFAULT_TIERS, maxSeries: int = DEFAULT_MAX_SERIES):
+        self.tiers = tiers
+        self.maxSeries = maxSeries
+        self.series: Dict[Tuple[str, str], TimeSeries] = {}
+
+    def add(self, metric: str, key: str, t: float, value: float):
+        seriesKey = (metric, key)
+        if seriesKey not in self.series:
+            if len(self.series) >= self.maxSeries:
+                oldest = min(self.series.keys(), key=lambda k: self.series[k].lastTime)
+                del self.series[oldest]
+            self.series[seriesKey] = TimeSeries(self.tiers)
+        self.series[seriesKey].add(t, value)
+
+    def query(self, metric: str, key: str, fromTime: float, toTime: float, maxPoints: int):
+        seriesKey = (metric, key)
+        if seriesKey not in self.series:
+            return []
+        return self.series[seriesKey].query(fromTime, toTime, maxPoints)
+
+    def keys(self, metric: str) -> List[str]:
+        return [k for (m, k) in self.series.keys() if m == metric]
+
+    def remove(self, metric: str, key: str):
+        if (metric, key) in self.series:
+            del self.series[(metric, key)]
+
+    def clear(self):
+        self.series.clear()
@@ -0,0 +1,136 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from typing import Dict, Hashable, List, Set, Tuple
+import heapq
+import itertools
+
+
+# the heap is rebuilt once it holds this many entries per key
+COMPACT_FACTOR = 4
+
+
+class TopN:
+    # Largest values of many keys. Every change pushes a new heap entry and
+    # outdated entries are dropped when they surface, so the top entries are
+    # found without looking at all keys.
+
+    def __init__(self):
+        self.values: Dict[Hashable, float] = {}
+        self.heap: List[Tuple[float, int, Hashable]] = [] # (-value, sequence, key)
+        self.sequence = itertools.count() # tie breaker, keys are never compared
+
+    def __len__(self):
+        return len(self.values)
+
+    def set(self, key: Hashable, value: float):
+        if self.values.get(key) == value:
+            return
+        self.values[key] = value
+        heapq.heappush(self.heap, (-value, next(self.sequence), key))
+        if len(self.heap) > COMPACT_FACTOR * len(self.values) + 64:
+            self.compact()
+
+    def remove(self, key: Hashable):
+        self.values.pop(key, None)
+
+    def compact(self):
+        self.heap = [(-value, next(self.sequence), key) for key, value in self.values.items()]
+        heapq.heapify(self.heap)
+
+    def top(self, n: int) -> List[Tuple[Hashable, float]]:
+        result = []
+        current = []
+        seen = set()
+        while self.heap and len(result) < n:
+            entry = heapq.heappop(self.heap)
+            (negValue, _, key) = entry
+            if key in seen or self.values.get(key) != -negValue:
+                continue # outdated
+            seen.add(key)
+            current.append(entry)
+            result.append((key, -negValue))
+        for entry in current:
+            heapq.heappush(self.heap, entry)
+        return result
+
+    def clear(self):
+        self.values.clear()
+        self.heap.clear()
+
+
+class TopTalkers:
+    # Top keys of a dimension (writer, topic, process, ...) by the summed up
+    # values of their entities. Only the difference of an entity's value to
+    # its previous one is applied, entities missing in a poll are removed.
+    # The ranking is updated once per poll for the keys which changed.
+
+    def __init__(self):
+        self.totals = TopN()
+        self.sums: Dict[str, float] = {}
+        self.members: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+        self.contributions: Dict[str, Tuple[str, float]] = {} # entity -> (key, value)
+        self.updated: Set[str] = set()
+        self.changed: Set[str] = set()
+
+    def update(self, entity: str, key: str, value: float, label: str = ""):
+        self.updated.add(entity)
+        self.labels[key] = label
+        previous = self.contributions.get(entity)
+        if previous is not None:
+            (previousKey, previousValue) = previous
+            if previousKey == key:
+                if previousValue != value:
+                    self.sums[key] += value - previousValue
+                    self.changed.add(key)
+                    self.contributions[entity] = (key, value)
+                return
+            self.removeContribution(previousKey, previousValue)
+
+        self.contributions[entity] = (key, value)
+        self.members[key] = self.members.get(key, 0) + 1
+        self.sums[key] = self.sums.get(key, 0.0) + value
+        self.changed.add(key)
+
+    def removeContribution(self, key: str, value: float):
+        self.members[key] -= 1
+        self.sums[key] -= value
+        self.changed.add(key)
+
+    def endPoll(self):
+        for entity in [e for e in self.contributions.keys() if e not in self.updated]:
+            (key, value) = self.contributions.pop(entity)
+            self.removeContribution(key, value)
+        self.updated.clear()
+
+        for key in self.changed:
+            if self.members.get(key, 0) == 0:
+                self.members.pop(key, None)
+                self.sums.pop(key, None)
+                self.labels.pop(key, None)
+                self.totals.remove(key)
+            else:
+                self.totals.set(key, self.sums[key])
+        self.changed.clear()
+
+    def top(self, n: int) -> List[Tuple[str, str, float]]:
+        return [(key, self.labels.get(key, ""), value) for (key, value) in self.totals.top(n)]
+
+    def clear(self):
+        self.totals.clear()
+        self.sums.clear()
+        self.members.clear()
+        self.labels.clear()
+        self.contributions.clear()
+        self.updated.clear()
+        self.changed.clear()
@@ -28,9 +28,33 @@ Rectangle {
     property bool started: true
     property bool autoScrollEnabled: true
     property bool manageReadersVisible: false
+    property int retainedCount: 0
+    property int evictedCount: 0
+    property bool searchActive: false
+    property bool recording: false
+    property bool replaying: false
+    property real replaySpeed: 1.0
     readonly property color surfaceColor: Constants.cardBackgroundColor(rootWindow.isDarkMode)
     readonly property color borderColor: Constants.designBorderColor(rootWindow.isDarkMode)
 
+    Connections {
+        target: receiverModel
+        function onCountsChanged(retained, evicted) {
+            listenerTabId.retainedCount = retained;
+            listenerTabId.evictedCount = evicted;
+        }
+    }
+
+    Connections {
+        target: recordingModel
+        function onRecordingChanged(active) {
+            listenerTabId.recording = active;
+        }
+        function onReplayingChanged(active) {
+            listenerTabId.replaying = active;
+        }
+    }
+
     Connections {
         target: receiverProxyModel
         function onRowsInserted(parent, first, last) {
@@ -91,7 +115,38 @@ Rectangle {
 
             Button {
                 text: qsTrId("general.clear")
-                onClicked: receiverModel.clear()
+                onClicked: {
+                    messageSearchField.text = "";
+                    listenerTabId.searchActive = false;
+                    receiverModel.clear();
+                }
+            }
+
+            Label {
+                text: qsTrId("listener.retained.evicted").arg(listenerTabId.retainedCount).arg(listenerTabId.evictedCount)
+                visible: listenerTabId.evictedCount > 0
+            }
+
+            TextField {
+                id: messageSearchField
+                Layout.preferredWidth: 300
+                placeholderText: qsTrId("listener.search.placeholder")
+                onAccepted: {
+                    listenerTabId.searchActive = text.trim() !== "";
+                    receiverModel.search(text, Constants.selectionBackgroundColor(rootWindow.isDarkMode).toString());
+                }
+            }
+
+            Label {
+                text: qsTrId("listener.search.matches").arg(listView.count)
+                visible: listenerTabId.searchActive
+            }
+
+            Label {
+                text: qsTrId("listener.recording.active")
+                color: Constants.errorColor
+                font.bold: true
+                visible: listenerTabId.recording
             }
 
             Item {
@@ -125,6 +180,39 @@ Rectangle {
                         text: qsTrId("listener.preset.import")
                         onClicked: importListenerPresetDialog.open()
                     }
+                    MenuItem {
+                        text: qsTrId("listener.recording.replay")
+                        enabled: !listenerTabId.replaying
+                        onClicked: {
+                            replayRecordingDialog.publish = false;
+                            replayRecordingDialog.open();
+                        }
+                    }
+                    MenuItem {
+                        text: qsTrId("listener.recording.publish")
+                        enabled: !listenerTabId.replaying
+                        onClicked: {
+                            replayRecordingDialog.publish = true;
+                            replayRecordingDialog.open();
+                        }
+                    }
+                    Menu {
+                        title: qsTrId("listener.recording.speed")
+                        Repeater {
+                            model: [0.5, 1.0, 2.0, 10.0, 0.0]
+                            MenuItem {
+                                text: modelData > 0 ? modelData + "x" : qsTrId("listener.recording.speed.max")
+                                checkable: true
+                                checked: listenerTabId.replaySpeed === modelData
+                                onTriggered: listenerTabId.replaySpeed = modelData
+                            }
+                        }
+                    }
+                    MenuItem {
+                        text: qsTrId("listener.recording.replay.stop")
+                        enabled: listenerTabId.replaying
+                        onClicked: recordingModel.stopReplay()
+                    }
                 }
             }
             Button {
@@ -145,6 +233,16 @@ Rectangle {
                         text: qsTrId("listener.sample.export")
                         onClicked: exportSampleLogFileDialog.open()
                     }
+                    MenuItem {
+                        text: listenerTabId.recording ? qsTrId("listener.recording.stop") : qsTrId("listener.recording.start")
+                        onClicked: {
+                            if (listenerTabId.recording) {
+                                recordingModel.stopRecording();
+                            } else {
+                                startRecordingDialog.open();
+                            }
+                        }
+                    }
                 }
             }
         }
@@ -192,7 +290,8 @@ Rectangle {
                         }
 
                         TextEdit {
-                            text: model.receivedMsg
+                            text: listenerTabId.searchActive ? model.highlightedMsg : model.receivedMsg
+                            textFormat: listenerTabId.searchActive ? TextEdit.RichText : TextEdit.PlainText
                             readOnly: true
                             color: rootWindow.isDarkMode ? "white" : "black"
                             wrapMode: Text.Wrap
@@ -284,6 +383,31 @@ Rectangle {
         }
     }
 
+    FileDialog {
+        id: startRecordingDialog
+        currentFolder: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0]
+        fileMode: FileDialog.SaveFile
+        defaultSuffix: "insightrec"
+        title: qsTrId("listener.recording.start")
+        nameFilters: ["Recordings (*.insightrec)"]
+        selectedFile: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0] + "/samples.insightrec"
+        onAccepted: {
+            recordingModel.startRecording(qmlUtils.toLocalFile(selectedFile));
+        }
+    }
+
+    FileDialog {
+        id: replayRecordingDialog
+        currentFolder: StandardPaths.standardLocations(StandardPaths.HomeLocation)[0]
+        fileMode: FileDialog.OpenFile
+        title: publish ? qsTrId("listener.recording.publish") : qsTrId("listener.recording.replay")
+        nameFilters: ["Recordings (*.insightrec)"]
+        property bool publish: false
+        onAccepted: {
+            recordingModel.startReplay(qmlUtils.toLocalFile(selectedFile), listenerTabId.replaySpeed, publish);
+        }
+    }
+
     Component {
         id: manageReadersPanelComponent
 
@@ -384,11 +508,17 @@ Rectangle {
                     delegate: Item {
                         id: delegateRoot
                         width: listViewSelectReaders.width
-                        height: 44
+                        height: Math.max(44, readerColumn.implicitHeight + 12)
 
                         required property int index
                         required property var model
 
+                        property bool editingFilter: false
+
+                        function millis(value) {
+                            return value < 0 ? "-" : value < 10 ? value.toFixed(2) : value.toFixed(0)
+                        }
+
                         RowLayout {
                             anchors.fill: parent
                             anchors.leftMargin: 8
@@ -407,6 +537,7 @@ Rectangle {
                             }
 
                             ColumnLayout {
+                                id: readerColumn
                                 Layout.fillWidth: true
                                 spacing: 0
 
@@ -423,6 +554,88 @@ Rectangle {
                                     elide: Text.ElideRight
                                     Layout.fillWidth: true
                                 }
+
+                                Label {
+                                    visible: model.timings.samples ? true : false
+                                    text: visible ? qsTrId("listener.reader.timings")
+                                                    .arg(delegateRoot.millis(model.timings.latency[0]))
+                                                    .arg(delegateRoot.millis(model.timings.latency[1]))
+                                                    .arg(delegateRoot.millis(model.timings.latency[2]))
+                                                    .arg(delegateRoot.millis(model.timings.interArrival[0]))
+                                                    .arg(delegateRoot.millis(model.timings.interArrival[1]))
+                                                    .arg(delegateRoot.millis(model.timings.interArrival[2]))
+                                                    .arg(model.timings.lost + model.timings.rejected)
+                                                  : ""
+                                    color: "#666"
+                                    font.pixelSize: 11
+                                    elide: Text.ElideRight
+                                    Layout.fillWidth: true
+
+                                    ToolTip.visible: timingsMouseArea.containsMouse
+                                    ToolTip.delay: 500
+                                    ToolTip.text: qsTrId("listener.reader.timings.tooltip")
+                                                  .arg(model.timings.samples)
+                                                  .arg(model.timings.writers)
+                                                  .arg(delegateRoot.millis(model.timings.latencyMax))
+
+                                    MouseArea {
+                                        id: timingsMouseArea
+                                        anchors.fill: parent
+                                        hoverEnabled: true
+                                        acceptedButtons: Qt.NoButton
+                                    }
+                                }
+
+                                Label {
+                                    visible: model.readerFilter !== "" && !delegateRoot.editingFilter
+                                    text: qsTrId("listener.reader.filter.active")
+                                          .arg(model.readerFilter)
+                                          .arg(model.timings.dropped ? model.timings.dropped : 0)
+                                          .arg(model.timings.samples ? model.timings.samples : 0)
+                                    color: model.timings.filterErrors ? "#c62828" : "#666"
+                                    font.pixelSize: 11
+                                    elide: Text.ElideRight
+                                    Layout.fillWidth: true
+                                }
+
+                                TextField {
+                                    id: filterField
+                                    visible: delegateRoot.editingFilter
+                                    placeholderText: qsTrId("listener.reader.filter.placeholder")
+                                    selectByMouse: true
+                                    Layout.fillWidth: true
+                                    Layout.topMargin: 4
+
+                                    onAccepted: {
+                                        filterError.text = listenerModel.setFilter(model.readerId, text);
+                                        if (filterError.text === "") {
+                                            delegateRoot.editingFilter = false;
+                                        }
+                                    }
+                                    Keys.onEscapePressed: delegateRoot.editingFilter = false
+                                }
+
+                                Label {
+                                    id: filterError
+                                    visible: delegateRoot.editingFilter && text !== ""
+                                    color: "#c62828"
+                                    font.pixelSize: 11
+                                    elide: Text.ElideRight
+                                    Layout.fillWidth: true
+                                }
+                            }
+
+                            IconActionButton {
+                                icon: "filter"
+                                tooltipText: qsTrId("listener.reader.filter")
+                                onClicked: {
+                                    delegateRoot.editingFilter = !delegateRoot.editingFilter;
+                                    if (delegateRoot.editingFilter) {
+                                        filterField.text = model.readerFilter;
+                                        filterError.text = "";
+                                        filterField.forceActiveFocus();
+                                    }
+                                }
                             }
 
                             IconActionButton {
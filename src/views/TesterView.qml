@@ -84,6 +84,33 @@ Rectangle {
                 font.bold: true
             }
 
+            Label {
+                readonly property var queue: testerModel.writeQueue
+                visible: queue.executed > 0 || queue.depth > 0 || queue.dropped > 0
+                text: qsTrId("tester.write.queue")
+                      .arg(queue.depth)
+                      .arg(queue.maxDepth)
+                      .arg(queue.queued[1] < 0 ? "-" : queue.queued[1].toFixed(2))
+                      + (queue.dropped > 0 ? qsTrId("tester.write.queue.dropped").arg(queue.dropped) : "")
+                color: queue.dropped > 0 ? Constants.warningColor : "#666"
+                Layout.leftMargin: 8
+
+                ToolTip.visible: writeQueueMouseArea.containsMouse
+                ToolTip.delay: 500
+                ToolTip.text: qsTrId("tester.write.queue.tooltip")
+                              .arg(queue.executed)
+                              .arg(queue.failed)
+                              .arg(queue.queued[0] < 0 ? "-" : queue.queued[0].toFixed(2))
+                              .arg(queue.queued[2] < 0 ? "-" : queue.queued[2].toFixed(2))
+
+                MouseArea {
+                    id: writeQueueMouseArea
+                    anchors.fill: parent
+                    hoverEnabled: true
+                    acceptedButtons: Qt.NoButton
+                }
+            }
+
             Item {
                 implicitHeight: 1
                 Layout.fillWidth: true
@@ -173,6 +173,16 @@ Rectangle {
                 context.lineTo(2.5, 12)
                 context.lineTo(4, 11.5)
                 context.stroke()
+            } else if (iconActionButton.icon === "filter") {
+                context.beginPath()
+                context.moveTo(2, 3)
+                context.lineTo(12, 3)
+                context.lineTo(8, 7.5)
+                context.lineTo(8, 11.5)
+                context.lineTo(6, 10.5)
+                context.lineTo(6, 7.5)
+                context.closePath()
+                context.stroke()
             } else if (iconActionButton.icon === "close") {
                 context.beginPath()
                 context.moveTo(3, 3)
@@ -20,6 +20,7 @@ import "qrc:/src/views"
 
 
 Rectangle {
+    id: nodeId
     x: 400
     y: 200
     property real nodeScale: 1.0
@@ -34,6 +35,10 @@ Rectangle {
     property string vendorShortName: ""
     property string iconSource: ""
     property bool isDomain: false
+    property bool dragging: dragArea.drag.active
+
+    // the layout keeps a dragged node where it is until it is released
+    signal dragged(string key, real x, real y, bool active)
 
     border.color: "gray"
     border.width: 1
@@ -95,5 +100,11 @@ Rectangle {
         drag.maximumX: root.width - parent.width
         drag.minimumY: 0
         drag.maximumY: root.height - parent.height
+
+        onPositionChanged: {
+            if (drag.active)
+                nodeId.dragged(nodeId.nodeKey, nodeId.x, nodeId.y, true)
+        }
+        onReleased: nodeId.dragged(nodeId.nodeKey, nodeId.x, nodeId.y, false)
     }
 }
\ No newline at end of file
@@ -33,23 +33,24 @@ Rectangle {
     property string currentSpeedUnit
 
     property var nodesMap
-    property var edges: []            // array of { source: Item, target: Item }
     property var edgesMap: ({})       // map edgeId -> edgeItem (for quick duplicate-check + removal)
-    property var velocities: ({})
+    property var nodeEdges: ({})      // nodeKey -> { edgeId: true }
     property var hostsMap: ({})       // hostName -> [nodes]
-    property int idealLength: 110
     property real nodeScale: 1.0
     property var hostColors: ({})
 
     Component.onCompleted: {
         nodesMap = {};
-        edges = [];
         edgesMap = {};
-        velocities = {};
+        nodeEdges = {};
         hostsMap = {};
+        updateLayoutArea();
         graphModel.setDomainId(domainId, hideSelf, speedEnabled);
     }
 
+    // speeds of a graph which isn't shown are only refreshed in the background
+    onVisibleChanged: graphModel.setOnScreen(visible)
+
     GraphModel {
         id: graphModel
     }
@@ -59,200 +60,176 @@ Rectangle {
     Connections {
         target: graphModel
 
-        function onNewNodeSignal(key, name, edgeName, hostName, vendorShortName, vendorPicture) {
-            if (!nodesMap) nodesMap = {};
-            if (!hostsMap) hostsMap = {};
-            if (!velocities) velocities = {};
-            if (!edges) edges = [];
-            if (!edgesMap) edgesMap = {};
-
-            var nodeInstance;
-
-            if (nodesMap[key]) {
-                // reuse existing node
-                nodeInstance = nodesMap[key];
-
-                // update host membership if a non-empty hostName is given
-                if (hostName && hostName !== "") {
-                    // if the node had a different host before, remove from that host list
-                    var prevHost = (typeof nodeInstance.hostName !== "undefined") ? nodeInstance.hostName : "";
-                    if (prevHost !== hostName) {
-                        if (prevHost && hostsMap[prevHost]) {
-                            hostsMap[prevHost] = hostsMap[prevHost].filter(function(n) { return n.nodeKey !== key; });
-                            if (hostsMap[prevHost].length === 0)
-                                delete hostsMap[prevHost];
-                        }
-                        // register under new host
-                        if (!hostsMap[hostName]) hostsMap[hostName] = [];
-                        // avoid duplicate entries
-                        var already = false;
-                        for (var i = 0; i < hostsMap[hostName].length; ++i) {
-                            if (hostsMap[hostName][i].nodeKey === key) { already = true; break; }
-                        }
-                        if (!already) hostsMap[hostName].push(nodeInstance);
-                        nodeInstance.hostName = hostName;
-                    }
-                }
-                nodeInstance.vendorShortName = vendorShortName || "";
-                nodeInstance.iconSource = vendorPicture || "";
-            } else {
-                // create new node
-                var nodeComponent = Qt.createComponent("qrc:/src/views/nodes/Node.qml");
-                if (nodeComponent.status !== Component.Ready) {
-                    console.error("Failed to load Node.qml:", nodeComponent.errorString());
-                    return;
-                }
+        // one call per frame, applied in this order so a node is never
+        // referenced after it was removed
+        function onGraphDelta(removedEdges, removedNodes, addedNodes, addedEdges, edgeSpeeds) {
+            var i;
+            for (i = 0; i < removedEdges.length; i++)
+                removeEdge(removedEdges[i][0], removedEdges[i][1]);
+            for (i = 0; i < removedNodes.length; i++)
+                removeNode(removedNodes[i]);
+            for (i = 0; i < addedNodes.length; i++) {
+                var n = addedNodes[i];
+                addOrUpdateNode(n[0], n[1], n[2], n[3], n[4], n[5], n[6]);
+            }
+            for (i = 0; i < addedEdges.length; i++)
+                addEdge(addedEdges[i][0], addedEdges[i][1]);
+            for (i = 0; i < edgeSpeeds.length; i++) {
+                var s = edgeSpeeds[i];
+                updateEdge(s[0], s[1], s[2], s[3]);
+            }
+            if (removedNodes.length > 0 || addedNodes.length > 0)
+                hostBackground.requestPaint();
+        }
 
-                var randomX = Math.random() * root.width;
-                var randomY = Math.random() * root.height;
-
-                nodeInstance = nodeComponent.createObject(root, {
-                    x: randomX,
-                    y: randomY,
-                    text: name,
-                    isDomain: !(hostName && hostName !== ""),
-                    nodeName: name,
-                    hostName: hostName || "",
-                    nodeKey: key,
-                    vendorShortName: vendorShortName || "",
-                    iconSource: vendorPicture || "",
-                    nodeScale: nodeDetailViewId.nodeScale
-                });
-
-                if (!nodeInstance) {
-                    console.error("Failed to instantiate Node.qml for", key);
-                    return;
+        // layout steps of the model, only nodes which moved
+        function onNodePositions(positions) {
+            for (var i = 0; i < positions.length; i++) {
+                var node = nodesMap[positions[i][0]];
+                if (node && !node.dragging) {
+                    node.x = positions[i][1];
+                    node.y = positions[i][2];
                 }
+            }
+            hostBackground.requestPaint();
+        }
+    }
 
-                nodesMap[key] = nodeInstance;
-                if (!velocities[key]) velocities[key] = { vx: 0, vy: 0 };
+    function edgeIdOf(a, b) {
+        return (a < b) ? (a + "::" + b) : (b + "::" + a);
+    }
 
-                // add to hostsMap (if host is non-empty)
-                if (hostName && hostName !== "") {
-                    if (!hostsMap[hostName]) hostsMap[hostName] = [];
-                    hostsMap[hostName].push(nodeInstance);
-                }
+    function addOrUpdateNode(key, name, hostName, vendorShortName, vendorPicture, x, y) {
+        var nodeInstance = nodesMap[key];
+
+        if (nodeInstance) {
+            // update host membership if a non-empty hostName is given
+            var prevHost = nodeInstance.hostName || "";
+            if (hostName && hostName !== prevHost) {
+                removeFromHost(prevHost, key);
+                if (!hostsMap[hostName]) hostsMap[hostName] = [];
+                hostsMap[hostName].push(nodeInstance);
+                nodeInstance.hostName = hostName;
             }
+            nodeInstance.vendorShortName = vendorShortName || "";
+            nodeInstance.iconSource = vendorPicture || "";
+            return;
+        }
 
-            // If edgeName is provided and that node exists, create edge (but don't duplicate)
-            if (edgeName) {
-                if (!nodesMap[edgeName]) {
-                    // other node isn't present yet — skip edge creation.
-                    // This is intentional: only create edges when both endpoints exist.
-                } else {
-                    var a = key;
-                    var b = edgeName;
-                    var edgeId = (a < b) ? (a + "::" + b) : (b + "::" + a);
-
-                    if (!edgesMap[edgeId]) {
-                        var edgeComponent = Qt.createComponent("qrc:/src/views/nodes/Edge.qml");
-                        if (edgeComponent.status !== Component.Ready) {
-                            console.error("Failed to load Edge.qml:", edgeComponent.errorString());
-                            return;
-                        }
-
-                        // create the Edge visual
-                        var edgeInstance = edgeComponent.createObject(root, {
-                            node1: nodesMap[edgeName],
-                            node2: nodeInstance,
-                            z: -1,
-                            speedEnabled: speedEnabled,
-                            currentUnit: currentSpeedUnit
-                        });
-                        if (!edgeInstance) {
-                            console.error("Failed to instantiate Edge.qml for", edgeId);
-                            return;
-                        }
-
-                        edges.push({
-                            source: nodesMap[edgeName],
-                            target: nodeInstance
-                        });
-                        edgesMap[edgeId] = edgeInstance;
-                    }
-                }
-            }
+        var nodeComponent = Qt.createComponent("qrc:/src/views/nodes/Node.qml");
+        if (nodeComponent.status !== Component.Ready) {
+            console.error("Failed to load Node.qml:", nodeComponent.errorString());
+            return;
         }
 
-        function onRemoveEdgeBetweenNodes(nodeA, nodeB) {
-            if (!nodeA || !nodeB) return;
-            var a = nodeA;
-            var b = nodeB;
-            var edgeId = (a < b) ? (a + "::" + b) : (b + "::" + a);
+        nodeInstance = nodeComponent.createObject(root, {
+            x: x,
+            y: y,
+            text: name,
+            isDomain: !(hostName && hostName !== ""),
+            nodeName: name,
+            hostName: hostName || "",
+            nodeKey: key,
+            vendorShortName: vendorShortName || "",
+            iconSource: vendorPicture || "",
+            nodeScale: nodeDetailViewId.nodeScale
+        });
+
+        if (!nodeInstance) {
+            console.error("Failed to instantiate Node.qml for", key);
+            return;
+        }
 
-            if (edgesMap[edgeId]) {
-            try { edgesMap[edgeId].destroy(); } catch (e) { /* ignore */ }
-            delete edgesMap[edgeId];
-            }
+        nodesMap[key] = nodeInstance;
+        nodeEdges[key] = {};
+        nodeInstance.dragged.connect(function(nodeKey, nodeX, nodeY, active) {
+            graphModel.moveNode(nodeKey, nodeX, nodeY, active);
+            hostBackground.requestPaint();
+        });
+
+        // add to hostsMap (if host is non-empty)
+        if (hostName && hostName !== "") {
+            if (!hostsMap[hostName]) hostsMap[hostName] = [];
+            hostsMap[hostName].push(nodeInstance);
+        }
+    }
+
+    function removeFromHost(hostName, key) {
+        if (!hostName || !hostsMap[hostName]) return;
+        hostsMap[hostName] = hostsMap[hostName].filter(function(n) { return n.nodeKey !== key; });
+        if (hostsMap[hostName].length === 0)
+            delete hostsMap[hostName];
+    }
+
+    function removeNode(key) {
+        var nodeInstance = nodesMap[key];
+        if (!nodeInstance) return;
 
-            edges = edges.filter(function(e) {
-            return !(
-                (e.source && e.target) &&
-                ((e.source.nodeKey === a && e.target.nodeKey === b) ||
-                 (e.source.nodeKey === b && e.target.nodeKey === a))
-            );
-            });
+        // edges of this node, without looking at all other edges
+        for (var edgeId in nodeEdges[key]) {
+            if (nodeEdges[key].hasOwnProperty(edgeId))
+                destroyEdge(edgeId);
         }
+        delete nodeEdges[key];
 
-        function onRemoveNodeSignal(key, edgeName) {
-            var hostName = nodesMap[key] ? nodesMap[key].hostName : null;
+        removeFromHost(nodeInstance.hostName, key);
+        try { nodeInstance.destroy(); } catch (e) { /* ignore */ }
+        delete nodesMap[key];
+    }
 
-            // destroy the node
-            if (nodesMap[key]) {
-                try { nodesMap[key].destroy(); } catch (e) { /* ignore */ }
-                delete nodesMap[key];
-            }
-            if (velocities && velocities[key]) delete velocities[key];
-
-            // remove/destroy any edges that include this node (both from edges array and edgesMap)
-            // edgesMap keys are "a::b"
-            for (var id in edgesMap) {
-                if (!edgesMap.hasOwnProperty(id)) continue;
-                var parts = id.split("::");
-                if (parts.length !== 2) continue;
-                if (parts[0] === key || parts[1] === key) {
-                    try { edgesMap[id].destroy(); } catch (e) { /* ignore */ }
-                    delete edgesMap[id];
-                }
-            }
-            edges = edges.filter(function(e) {
-                return (e.source && e.source.nodeKey !== key) && (e.target && e.target.nodeKey !== key);
-            });
-
-            // clean up hosts map
-            if (hostName && hostsMap[hostName]) {
-                hostsMap[hostName] = hostsMap[hostName].filter(function(n) {
-                    return n.nodeKey !== key;
-                });
-                if (hostsMap[hostName].length === 0)
-                    delete hostsMap[hostName];
-            }
+    function addEdge(nodeKey, edgeName) {
+        // only create edges when both endpoints exist
+        if (!nodesMap[nodeKey] || !nodesMap[edgeName]) return;
 
-            // Also be safe: remove this node from all host lists (in case hostName was empty or unknown)
-            for (var h in hostsMap) {
-                if (!hostsMap.hasOwnProperty(h)) continue;
-                hostsMap[h] = hostsMap[h].filter(function(n) { return n.nodeKey !== key; });
-                if (hostsMap[h].length === 0) delete hostsMap[h];
-            }
+        var edgeId = edgeIdOf(nodeKey, edgeName);
+        if (edgesMap[edgeId]) return;
+
+        var edgeComponent = Qt.createComponent("qrc:/src/views/nodes/Edge.qml");
+        if (edgeComponent.status !== Component.Ready) {
+            console.error("Failed to load Edge.qml:", edgeComponent.errorString());
+            return;
         }
 
-        function onUpdateEdgeSignal(nodeKey, edgeName, t, bps) {
-            console.debug("Updating edge:", nodeKey, edgeName, t, bps);
-            if (!edgesMap || !nodesMap) return;
+        var edgeInstance = edgeComponent.createObject(root, {
+            node1: nodesMap[edgeName],
+            node2: nodesMap[nodeKey],
+            z: -1,
+            speedEnabled: speedEnabled,
+            currentUnit: currentSpeedUnit
+        });
+        if (!edgeInstance) {
+            console.error("Failed to instantiate Edge.qml for", edgeId);
+            return;
+        }
 
-            var a = nodeKey;
-            var b = edgeName;
-            var edgeId = (a < b) ? (a + "::" + b) : (b + "::" + a);
+        edgesMap[edgeId] = edgeInstance;
+        nodeEdges[nodeKey][edgeId] = true;
+        nodeEdges[edgeName][edgeId] = true;
+    }
 
-            if (edgesMap[edgeId]) {
-                if (t === "sent") {
-                    edgesMap[edgeId].updateUpBps(bps);
-                } else if (t === "recv") {
-                    edgesMap[edgeId].updateDownBps(bps);
-                }
-            } else {
-                console.warn("Tried to update non-existing edge:", edgeId);
-            }
+    function destroyEdge(edgeId) {
+        var edgeInstance = edgesMap[edgeId];
+        if (!edgeInstance) return;
+        if (edgeInstance.node1 && nodeEdges[edgeInstance.node1.nodeKey])
+            delete nodeEdges[edgeInstance.node1.nodeKey][edgeId];
+        if (edgeInstance.node2 && nodeEdges[edgeInstance.node2.nodeKey])
+            delete nodeEdges[edgeInstance.node2.nodeKey][edgeId];
+        try { edgeInstance.destroy(); } catch (e) { /* ignore */ }
+        delete edgesMap[edgeId];
+    }
+
+    function removeEdge(nodeA, nodeB) {
+        if (!nodeA || !nodeB) return;
+        destroyEdge(edgeIdOf(nodeA, nodeB));
+    }
+
+    function updateEdge(nodeKey, edgeName, t, bps) {
+        var edgeInstance = edgesMap[edgeIdOf(nodeKey, edgeName)];
+        if (!edgeInstance) return;
+        if (t === "sent") {
+            edgeInstance.updateUpBps(bps);
+        } else if (t === "recv") {
+            edgeInstance.updateDownBps(bps);
         }
     }
 
@@ -280,8 +257,13 @@ Rectangle {
         }
     }
 
+    function updateLayoutArea() {
+        graphModel.setLayoutArea(root.width, root.height, 30 * nodeDetailViewId.nodeScale, nodeDetailViewId.nodeScale);
+    }
+
     function setNodeScale(scale) {
         nodeDetailViewId.nodeScale = scale;
+        updateLayoutArea();
         if (!nodesMap) return;
         for (var key in nodesMap) {
             if (nodesMap.hasOwnProperty(key)) {
@@ -290,79 +272,6 @@ Rectangle {
         }
     }
 
-    function calculatePhysics() {
-        var nodeList = Object.values(nodesMap);
-
-        for (var i = 0; i < nodeList.length; i++) {
-            var b1 = nodeList[i];
-            var nodeKey = b1.nodeKey;
-            if (!velocities[nodeKey])
-                velocities[nodeKey] = { vx: 0, vy: 0 };
-            var vel = velocities[nodeKey];
-
-            var fx = 0, fy = 0;
-
-            // REPULSION between all nodes
-            for (var j = 0; j < nodeList.length; j++) {
-                if (i === j) continue;
-                var b2 = nodeList[j];
-                var dx = b1.x - b2.x;
-                var dy = b1.y - b2.y;
-                var distSq = dx*dx + dy*dy + 0.01;
-                var dist = Math.sqrt(distSq);
-                if (dist > 0) {
-                    var force = 2000 / distSq;
-                    fx += (dx / dist) * force;
-                    fy += (dy / dist) * force;
-                }
-            }
-
-            // EDGE SPRING
-            for (var e = 0; e < edges.length; e++) {
-                var edge = edges[e];
-                if (edge.source === b1 || edge.target === b1) {
-                    var other = (edge.source === b1) ? edge.target : edge.source;
-                    var dx2 = other.x - b1.x;
-                    var dy2 = other.y - b1.y;
-                    var dist2 = Math.sqrt(dx2 * dx2 + dy2 * dy2) || 0.01;
-                    var displacement = dist2 - (nodeDetailViewId.idealLength * nodeDetailViewId.nodeScale);
-                    fx += (dx2 / dist2) * displacement * 0.02;
-                    fy += (dy2 / dist2) * displacement * 0.02;
-                }
-            }
-
-            // HOST GROUP ATTRACTION (only for non-empty host names)
-            if (b1.hostName && b1.hostName !== "") {
-                var group = hostsMap[b1.hostName];
-                if (group) {
-                    for (var g = 0; g < group.length; g++) {
-                        var b2g = group[g];
-                        if (b2g === b1) continue;
-                        var dxh = b2g.x - b1.x;
-                        var dyh = b2g.y - b1.y;
-                        var distH = Math.sqrt(dxh * dxh + dyh * dyh) || 0.01;
-                        var hostIdeal = 100 * nodeDetailViewId.nodeScale;
-                        var displacementH = distH - hostIdeal;
-                        fx += (dxh / distH) * displacementH * 0.01;
-                        fy += (dyh / distH) * displacementH * 0.01;
-                    }
-                }
-            }
-
-            // Update velocity & position
-            vel.vx += fx * 0.05;
-            vel.vy += fy * 0.05;
-            vel.vx *= 0.85;
-            vel.vy *= 0.85;
-
-            b1.x += vel.vx;
-            b1.y += vel.vy;
-
-            b1.x = Math.max(0, Math.min(root.width - b1.width, b1.x));
-            b1.y = Math.max(0, Math.min(root.height - b1.height, b1.y));
-        }
-    }
-
     // Host background canvas (renders grouped rounded rects and hostname labels)
     Canvas {
         id: hostBackground
@@ -467,31 +376,19 @@ Rectangle {
         }
     }
 
-    // Physics Timer
-    Timer {
-        interval: 16
-        running: true
-        repeat: true
-        onTriggered: calculatePhysics()
-    }
-
-    // Timer for repainting host background
-    Timer {
-        interval: 33
-        running: true
-        repeat: true
-        onTriggered: hostBackground.requestPaint()
-    }
-
     // Root area for nodes and edges
     Item {
         id: root
         anchors.fill: parent
         z: 1
         clip: true
+
+        onWidthChanged: updateLayoutArea()
+        onHeightChanged: updateLayoutArea()
     }
 
     function stop() {
         graphModel.stop();
+        graphModel.stopLayout();
     }
 }
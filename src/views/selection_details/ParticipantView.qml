@@ -26,6 +26,8 @@ Rectangle {
     property string participantKey
     property string vendorName
     property bool qosLoaded: false
+    property string monitorState: "idle"
+    property var monitorHealth: ({})
 
     readonly property color surfaceColor: Constants.cardBackgroundColor(rootWindow.isDarkMode)
     readonly property color borderColor: Constants.designBorderColor(rootWindow.isDarkMode)
@@ -48,6 +50,49 @@ Rectangle {
                     : qos
             participantViewId.qosLoaded = true
         }
+
+        function onUpdateMonitorHealthSignal(health) {
+            participantViewId.monitorState = health.state
+            participantViewId.monitorHealth = health
+        }
+    }
+
+    function monitorStateText(state) {
+        switch (state) {
+        case "healthy": return qsTrId("participant.debug.monitor.healthy")
+        case "failing": return qsTrId("participant.debug.monitor.failing")
+        case "unreachable": return qsTrId("participant.debug.monitor.unreachable")
+        case "probing": return qsTrId("participant.debug.monitor.probing")
+        case "none": return qsTrId("participant.debug.monitor.none")
+        default: return qsTrId("participant.debug.monitor.idle")
+        }
+    }
+
+    function monitorDetailsText(health) {
+        switch (health.state) {
+        case "healthy":
+            if (health.latency < 0)
+                return ""
+            return qsTrId("participant.debug.monitor.details.healthy")
+                .arg(health.latency).arg(Math.round(health.size / 1024)).arg(health.interval)
+        case "unreachable":
+            return qsTrId("participant.debug.monitor.details.unreachable")
+                .arg(health.failures).arg(Qt.formatTime(new Date(health.nextProbe), "hh:mm:ss")).arg(health.error)
+        case "failing":
+            return qsTrId("participant.debug.monitor.details.failing")
+                .arg(health.failures).arg(health.error)
+        default: return ""
+        }
+    }
+
+    function monitorStateColor(state) {
+        switch (state) {
+        case "healthy": return Constants.successColor
+        case "failing":
+        case "probing": return Constants.warningColor
+        case "unreachable": return Constants.errorColor
+        default: return participantViewId.secondaryTextColor
+        }
     }
 
     ColumnLayout {
@@ -129,6 +174,36 @@ Rectangle {
                     verticalAlignment: Text.AlignVCenter
                 }
             }
+
+            RowLayout {
+                Layout.fillWidth: true
+                Layout.leftMargin: 14
+                spacing: 8
+
+                Label {
+                    text: qsTrId("participant.debug.monitor") + ":"
+                    color: participantViewId.secondaryTextColor
+                }
+
+                Rectangle {
+                    Layout.preferredWidth: 8
+                    Layout.preferredHeight: 8
+                    radius: 4
+                    color: participantViewId.monitorStateColor(participantViewId.monitorState)
+                }
+
+                Label {
+                    text: participantViewId.monitorStateText(participantViewId.monitorState)
+                    font.bold: true
+                }
+
+                Label {
+                    Layout.fillWidth: true
+                    text: participantViewId.monitorDetailsText(participantViewId.monitorHealth)
+                    color: participantViewId.secondaryTextColor
+                    elide: Text.ElideRight
+                }
+            }
         }
 
         Rectangle {
@@ -117,9 +117,42 @@ Rectangle {
                         }
                     }
 
+                    // History is kept downsampled in python, the series only
+                    // holds as many points as fit into the plot area.
+                    function refreshSeries(guid, now) {
+                        var line = currentStatUnitId.lineSeriesDict[guid];
+                        table_model_role.updateSeries(line, guid, now - keepHistoryMinutes * 60 * 1000, now, Math.max(1, Math.floor(myChart.plotArea.width)));
+                    }
+
+                    function addValue(guid, value, r, g, b, timestamp) {
+                        if (guid in currentStatUnitId.lineSeriesDict) {
+                            currentStatUnitId.refreshSeries(guid, timestamp);
+                            currentStatUnitId.lineSeriesDict[guid].color = Qt.rgba(r/255, g/255, b/255, 1);
+                        } else {
+                            var line = myChart.createSeries(ChartView.SeriesTypeLine, guid, axisX, axisY);
+                            line.color = Qt.rgba(r/255, g/255, b/255, 1);
+                            axisX.titleText = "time";
+                            axisY.titleText = name_role + " [" + unit_name_role + "]";
+                            line.append(timestamp, value);
+                            line.hovered.connect(function(point, state) {
+                                tooltip.visible = state;
+                                tooltip.text = line.name;
+                                tooltip.textColor = line.color;
+                                var pos = myChart.mapToPosition(point, line);
+                                tooltip.x = pos.x;
+                                tooltip.y = pos.y;
+                            });
+
+                            currentStatUnitId.lineSeriesDict[guid] = line;
+                        }
+
+                        axisY.max = Math.max(axisY.max, value + (value * 0.1));
+                    }
+
                     Connections {
                         target: table_model_role
-                        function onNewData(guid, value, r, g, b, clearOnNextData) {
+                        // items: [[guid, value, r, g, b], ...] of one poll
+                        function onNewData(items, clearOnNextData) {
 
                             if (lineSeriesDict === undefined) {
                                 lineSeriesDict = new Map();
@@ -132,35 +165,14 @@ Rectangle {
 
                             var timestamp = Date.now()
 
-                            if (guid in currentStatUnitId.lineSeriesDict) {
-                                if (currentStatUnitId.lineSeriesDict[guid].count >= (keepHistoryMinutes * 60)) {
-                                    currentStatUnitId.lineSeriesDict[guid].remove(0);
-                                }
-                                currentStatUnitId.lineSeriesDict[guid].append(timestamp, value);
-                                currentStatUnitId.lineSeriesDict[guid].color = Qt.rgba(r/255, g/255, b/255, 1);
-                            } else {
-                                var line = myChart.createSeries(ChartView.SeriesTypeLine, guid, axisX, axisY);
-                                line.color = Qt.rgba(r/255, g/255, b/255, 1);
-                                axisX.titleText = "time";
-                                axisY.titleText = name_role + " [" + unit_name_role + "]";
-                                line.append(timestamp, value); 
-                                line.hovered.connect(function(point, state) {
-                                    tooltip.visible = state;
-                                    tooltip.text = line.name;
-                                    tooltip.textColor = line.color;
-                                    var pos = myChart.mapToPosition(point, line);
-                                    tooltip.x = pos.x;
-                                    tooltip.y = pos.y;
-                                });
-
-                                currentStatUnitId.lineSeriesDict[guid] = line;
+                            axisY.min = 0
+                            for (var i = 0; i < items.length; i++) {
+                                var item = items[i];
+                                currentStatUnitId.addValue(item[0], item[1], item[2], item[3], item[4], timestamp);
                             }
 
                             axisX.min = new Date(Date.now() - keepHistoryMinutes * 60 * 1000)
                             axisX.max = new Date(Date.now())
-
-                            axisY.min = 0
-                            axisY.max = Math.max(axisY.max, value + (value * 0.1));
                         }
                     }
 
@@ -28,6 +28,21 @@ Rectangle {
     color: Constants.mainContentColor(rootWindow.isDarkMode)
     property bool statsRunning: false
     readonly property color secondaryTextColor: Constants.secondaryTextColor(rootWindow.isDarkMode)
+    property string focusDimension: ""
+
+    // only the names entered are polled at full rate, the dimension
+    // focused on before is released
+    function applyFocus() {
+        var dimension = focusDimensionComboBoxId.currentIndex > 0 ? focusDimensionComboBoxId.currentText : ""
+        if (focusDimension !== "" && focusDimension !== dimension) {
+            statisticModelId.setInterest(focusDimension, [])
+        }
+        focusDimension = dimension
+        if (dimension !== "") {
+            let keys = focusKeysFieldId.text.split(",").map(k => k.trim()).filter(k => k.length > 0)
+            statisticModelId.setInterest(dimension, keys)
+        }
+    }
 
     ColumnLayout {
         anchors.fill: parent
@@ -161,6 +176,56 @@ Rectangle {
                         }
                     }
 
+                    RowLayout {
+                        Layout.fillHeight: true
+                        Layout.fillWidth: true
+                        spacing: 0
+
+                        Label {
+                            text: qsTrId("statistics.focus")
+                        }
+
+                        ComboBox {
+                            id: focusDimensionComboBoxId
+                            Layout.preferredWidth: 150
+                            model: [qsTrId("statistics.focus.all"), "Domain", "Host", "Process", "Topic"]
+                            currentIndex: 0
+                            onCurrentIndexChanged: statisticsMainViewId.applyFocus()
+                        }
+
+                        TextField {
+                            id: focusKeysFieldId
+                            Layout.preferredWidth: 150
+                            visible: focusDimensionComboBoxId.currentIndex > 0
+                            placeholderText: qsTrId("statistics.focus.placeholder")
+                            onEditingFinished: statisticsMainViewId.applyFocus()
+                            ToolTip.visible: hovered
+                            ToolTip.delay: 500
+                            ToolTip.text: qsTrId("statistics.focus.tooltip")
+                        }
+                    }
+
+                    RowLayout {
+                        Layout.fillHeight: true
+                        Layout.fillWidth: true
+                        spacing: 0
+
+                        Label {
+                            text: qsTrId("statistics.mode")
+                        }
+
+                        ComboBox {
+                            id: modeComboBoxId
+                            Layout.preferredWidth: 150
+                            model: ["Cumulative", "Rate", "EWMA"]
+                            currentIndex: 0
+                            onCurrentTextChanged: {
+                                statisticsView.clearStatistics()
+                                statisticModelId.setMode(currentText)
+                            }
+                        }
+                    }
+
                     RowLayout {
                         Layout.fillHeight: true
                         Layout.fillWidth: true
@@ -270,6 +335,122 @@ Rectangle {
                 }
             }
 
+            GroupBox {
+                id: topTalkersGroupBox
+                title: qsTrId("statistics.top.talkers")
+                visible: statsRunning
+                Layout.preferredWidth: 420
+                Layout.preferredHeight: settingsGroubBox.height
+
+                RowLayout {
+                    anchors.fill: parent
+                    spacing: 10
+
+                    Repeater {
+                        model: [
+                            { name: "writers_by_sent_bytes", title: qsTrId("statistics.top.writers.sent") },
+                            { name: "topics_by_rexmit_bytes", title: qsTrId("statistics.top.topics.rexmit") }
+                        ]
+
+                        delegate: ColumnLayout {
+                            Layout.fillWidth: true
+                            Layout.fillHeight: true
+                            Layout.preferredWidth: 1
+                            spacing: 2
+
+                            Label {
+                                text: modelData.title
+                                font.bold: true
+                            }
+
+                            ListView {
+                                Layout.fillWidth: true
+                                Layout.fillHeight: true
+                                clip: true
+                                model: statisticModelId.topTalkers(modelData.name)
+                                ScrollBar.vertical: ScrollBar {}
+
+                                delegate: RowLayout {
+                                    width: ListView.view.width
+                                    spacing: 6
+
+                                    Label {
+                                        Layout.fillWidth: true
+                                        text: label.length > 0 ? label : key
+                                        elide: Text.ElideRight
+                                        ToolTip.visible: topTalkerMouseArea.containsMouse
+                                        ToolTip.text: key
+
+                                        MouseArea {
+                                            id: topTalkerMouseArea
+                                            anchors.fill: parent
+                                            hoverEnabled: true
+                                        }
+                                    }
+                                    Label {
+                                        text: value
+                                        color: statisticsMainViewId.secondaryTextColor
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+
+            GroupBox {
+                id: alertsGroupBox
+                title: alertsGroupBox.suppressed > 0
+                       ? qsTrId("statistics.alerts") + " (" + alertsGroupBox.suppressed + " " + qsTrId("statistics.alerts.suppressed") + ")"
+                       : qsTrId("statistics.alerts")
+                visible: alertModel.getRuleCount() > 0
+                Layout.fillWidth: true
+                Layout.preferredHeight: settingsGroubBox.height
+                property int suppressed: 0
+
+                Connections {
+                    target: alertModel
+                    function onSuppressedChanged(count) {
+                        alertsGroupBox.suppressed = count
+                    }
+                }
+
+                ListView {
+                    anchors.fill: parent
+                    clip: true
+                    model: alertModel
+                    ScrollBar.vertical: ScrollBar {}
+
+                    delegate: RowLayout {
+                        width: ListView.view.width
+                        spacing: 8
+
+                        Rectangle {
+                            Layout.preferredWidth: 8
+                            Layout.preferredHeight: 8
+                            radius: 4
+                            color: state === "firing" ? Constants.errorColor : Constants.successColor
+                        }
+                        Label {
+                            text: time
+                            color: statisticsMainViewId.secondaryTextColor
+                        }
+                        Label {
+                            text: rule
+                            font.bold: true
+                        }
+                        Label {
+                            text: state === "firing" ? qsTrId("statistics.alert.firing") : qsTrId("statistics.alert.resolved")
+                        }
+                        Label {
+                            Layout.fillWidth: true
+                            text: series + " = " + value
+                            elide: Text.ElideRight
+                        }
+                    }
+                }
+            }
+
             Rectangle {
                 id: statErrorWindow
                 color: "transparent"
@@ -0,0 +1,55 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from utils.alert_engine import AlertEngine, AlertRule, FIRING, RESOLVED
+
+
+def discovery(count: int):
+    return {0: {"participants": count, "topics": 0, "readers": 0, "writers": 0}}
+
+
+def states(events):
+    return [(e.rule, e.state, e.value) for e in events]
+
+
+def test_drop_of_held_count_fires():
+    engine = AlertEngine([AlertRule("lost", "participants", "drop", threshold=3, forSeconds=30)])
+    assert engine.evaluateDiscovery(discovery(10), 0.0) == []
+    # 10 was in force until the drop at 40
+    assert states(engine.evaluateDiscovery(discovery(4), 40.0)) == [("lost", FIRING, 6)]
+
+
+def test_drop_outside_the_window_does_not_fire():
+    engine = AlertEngine([AlertRule("lost", "participants", "drop", threshold=3, forSeconds=30)])
+    engine.evaluateDiscovery(discovery(10), 0.0)
+    engine.evaluateDiscovery(discovery(5), 20.0)
+    engine.evaluateDiscovery(discovery(7), 35.0)
+    # 10 was replaced at 20, the window of 30 s only saw 5 and 7
+    assert engine.evaluateDiscovery(discovery(4), 60.0) == []
+
+
+def test_drop_of_held_count_resolves():
+    engine = AlertEngine([AlertRule("lost", "participants", "drop", threshold=3, forSeconds=30)])
+    engine.evaluateDiscovery(discovery(10), 0.0)
+    engine.evaluateDiscovery(discovery(4), 40.0)
+    # the periodic evaluation of the held count lets the maximum age out
+    assert engine.evaluateDiscovery(discovery(4), 55.0) == []
+    assert states(engine.evaluateDiscovery(discovery(4), 70.0)) == [("lost", RESOLVED, 0)]
+
+
+def test_below_for_seconds_fires_on_held_count():
+    engine = AlertEngine([AlertRule("few", "participants", "<", threshold=2, forSeconds=30)])
+    assert engine.evaluateDiscovery(discovery(1), 0.0) == []
+    assert engine.evaluateDiscovery(discovery(1), 29.0) == []
+    # no discovery change since 0, the held count is below for 30 s
+    assert states(engine.evaluateDiscovery(discovery(1), 30.0)) == [("few", FIRING, 1)]
+    assert states(engine.evaluateDiscovery(discovery(2), 31.0)) == [("few", RESOLVED, 2)]
@@ -0,0 +1,81 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from cyclonedds import core
+from cyclonedds.core import InstanceState, SampleState, ViewState
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.idl import IdlStruct
+from cyclonedds.internal import dds_c_t
+from cyclonedds.pub import DataWriter
+from cyclonedds.sub import DataReader
+from cyclonedds.topic import Topic
+from cyclonedds.util import duration
+import pytest
+
+from dds_access.dispatcher import attachArgument, hasAttachArguments, waitTriggered
+
+
+DOMAIN_ID = 48
+
+
+@dataclass
+class Msg(IdlStruct, typename="test::Msg"):
+    id: int
+
+
+class PublicWaitSet:
+    # only the public members of WaitSet, as a binding without the private
+    # ones would have
+
+    def __init__(self, waitset):
+        self.waitset = waitset
+
+    def wait(self, timeout):
+        return self.waitset.wait(timeout)
+
+    def get_entities(self):
+        return self.waitset.get_entities()
+
+
+@pytest.fixture
+def readers():
+    participant = DomainParticipant(DOMAIN_ID)
+    waitset = core.WaitSet(participant)
+    guard = core.GuardCondition(participant)
+    waitset.attach(guard)
+    conditions = {}
+    writers = {}
+    for name in ("a", "b", "c"):
+        topic = Topic(participant, f"wait_{name}", Msg)
+        reader = DataReader(participant, topic)
+        conditions[name] = core.ReadCondition(reader, SampleState.Any | ViewState.Any | InstanceState.Any)
+        waitset.attach(conditions[name])
+        writers[name] = DataWriter(participant, topic)
+    yield (waitset, conditions, writers)
+    for condition in conditions.values():
+        waitset.detach(condition)
+    waitset.detach(guard)
+
+
+@pytest.mark.parametrize("public", [False, True])
+def test_only_triggered_readers(readers, public):
+    (waitset, conditions, writers) = readers
+    if public:
+        waitset = PublicWaitSet(waitset)
+    assert hasAttachArguments(waitset) != public
+    byAttach = {attachArgument(waitset, condition): name for (name, condition) in conditions.items()}
+
+    writers["b"].write(Msg(1))
+    xs = (dds_c_t.attach * 4)()
+    triggered = waitTriggered(waitset, duration(seconds=5), xs)
+    assert [byAttach[x] for x in triggered if x in byAttach] == ["b"]
@@ -0,0 +1,45 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from utils.histogram import Histogram, ReaderTimings
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    assert histogram.percentiles((50.0, 99.0)) == [None, None]
+    for value in range(1, 1001):
+        histogram.record(value)
+    (p50, p99) = histogram.percentiles((50.0, 99.0))
+    # within the 1 % error of the buckets
+    assert abs(p50 - 500) <= 5 and abs(p99 - 990) <= 10
+    assert histogram.max == 1000
+
+
+def test_interval_within_one_take():
+    # a take of 10 samples written every 10 ms, received together
+    timings = ReaderTimings()
+    for i in range(10):
+        timings.record(100.5, 100.0 + i * 0.01, "writer")
+    summary = timings.summary()
+    assert summary["samples"] == 10
+    assert summary["interArrival"][0] == 10.0
+
+
+def test_interval_per_writer():
+    # two writers at 20 ms, interleaved, with clocks 5 s apart
+    timings = ReaderTimings()
+    for i in range(10):
+        timings.record(200.0 + i * 0.01, 100.0 + i * 0.02, "a")
+        timings.record(200.0 + i * 0.01, 105.0 + i * 0.02, "b")
+    summary = timings.summary()
+    assert (summary["samples"], summary["writers"]) == (20, 2)
+    assert summary["interArrival"][0] == summary["interArrival"][2] == 20.0
@@ -0,0 +1,94 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+import json
+import pytest
+
+from utils.json_stream import JsonStreamExtractor, JsonStreamError
+
+
+ENTITY_FIELDS = frozenset(["guid", "topic", "sent_bytes"])
+SPEC = {
+    "participants": [{
+        "guid": True,
+        "writers": [ENTITY_FIELDS],
+        "readers": [ENTITY_FIELDS]
+    }]
+}
+
+DOCUMENT = {
+    "participants": [
+        {
+            "guid": "1.2.3.1c1",
+            "proxy": {"addresses": ["udp/1.2.3.4:7400", "udp/[::1]:7410"], "nested": [[{"a": "}]"}]]},
+            "writers": [
+                {"guid": "1.2.3.102", "topic": "Sq\"uare \\ ä中", "sent_bytes": 12345, "ignored": {"x": [1, 2]}},
+                {"guid": "1.2.3.202", "topic": "Circle", "sent_bytes": 0}
+            ],
+            "readers": []
+        },
+        {
+            "guid": "1.2.3.2c1",
+            "writers": [],
+            "readers": [{"guid": "1.2.3.307", "topic": "Tri{angle]", "received": 1.5e3, "flag": True, "none": None}]
+        }
+    ],
+    "proxy_participants": [{"guid": "x", "writers": [{"guid": "y"}]}]
+}
+
+EXPECTED = {
+    "participants": [
+        {
+            "guid": "1.2.3.1c1",
+            "writers": [
+                {"guid": "1.2.3.102", "topic": "Sq\"uare \\ ä中", "sent_bytes": 12345},
+                {"guid": "1.2.3.202", "topic": "Circle", "sent_bytes": 0}
+            ],
+            "readers": []
+        },
+        {
+            "guid": "1.2.3.2c1",
+            "writers": [],
+            "readers": [{"guid": "1.2.3.307", "topic": "Tri{angle]"}]
+        }
+    ]
+}
+
+
+def extract(data: bytes, chunkSize: int):
+    extractor = JsonStreamExtractor(SPEC)
+    for i in range(0, len(data), chunkSize):
+        extractor.feed(data[i:i + chunkSize])
+    return extractor.close()
+
+
+def test_whole_document():
+    assert extract(json.dumps(DOCUMENT).encode(), 1 << 16) == EXPECTED
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_every_chunk_size(indent):
+    # splits strings, escapes, numbers and multi byte characters
+    data = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode()
+    for chunkSize in range(1, 40):
+        assert extract(data, chunkSize) == EXPECTED
+
+
+def test_truncated_document():
+    data = json.dumps(DOCUMENT).encode()
+    for end in (1, len(data) // 2, len(data) - 1):
+        with pytest.raises(JsonStreamError):
+            extract(data[:end], 7)
+
+
+def test_unexpected_shape_is_kept():
+    assert extract(b'{"participants": null}', 3) == {"participants": None}
@@ -0,0 +1,92 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PySide6.QtCore import QCoreApplication
+import json
+import threading
+import time
+import urllib.request
+
+from dds_access import dds_data
+from models.metrics_exporter import MAX_LABEL_SETS, MetricsExporter, OPENMETRICS_CONTENT_TYPE, renderOpenMetrics
+from utils.statistics_table import EntityRow
+
+
+PARTICIPANT = "1.2.3.1c1"
+
+
+class DebugMonitorHandler(BaseHTTPRequestHandler):
+    # a debug monitor with one writer
+
+    def do_GET(self):
+        body = json.dumps({"participants": [{"guid": PARTICIPANT, "readers": [], "writers": [
+            {"guid": "1.2.3.102", "topic": "Square", "sent_bytes": 1000, "heartbeat": {"n_reliable_readers": 2}}]}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_metrics_endpoint():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    monitor = ThreadingHTTPServer(("127.0.0.1", 0), DebugMonitorHandler)
+    threading.Thread(target=monitor.serve_forever, daemon=True).start()
+
+    exporter = MetricsExporter(0)
+    exporter.pollingThread.setInterval(0.2)
+    exporter.discovery.dgbPorts[PARTICIPANT] = ("127.0.0.1", str(monitor.server_address[1]), "app", "host", 0)
+    exporter.start()
+    try:
+        deadline = time.monotonic() + 10.0
+        while len(exporter.statisticRows) == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        url = f"http://127.0.0.1:{exporter.server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            contentType = response.headers["Content-Type"]
+            text = response.read().decode("utf-8")
+    finally:
+        exporter.stop()
+        monitor.shutdown()
+        monitor.server_close()
+        # the discovery started the builtin receiver, as on application exit
+        dds_data.DdsData().join_observer()
+
+    assert contentType == OPENMETRICS_CONTENT_TYPE
+    lines = text.split("\n")
+    assert lines[-2:] == ["# EOF", ""]
+    assert "# TYPE cyclonedds_insight_sent_bytes counter" in lines
+    assert 'cyclonedds_insight_sent_bytes_total{domain="0",host="host",process="app",topic="Square"} 1000' in lines
+    assert "# TYPE cyclonedds_insight_n_reliable_readers gauge" in lines
+    assert 'cyclonedds_insight_n_reliable_readers{domain="0",host="host",process="app",topic="Square"} 2' in lines
+    assert "# TYPE cyclonedds_insight_participants gauge" in lines
+
+
+def test_label_sets_are_capped():
+    rows = []
+    for i in range(MAX_LABEL_SETS + 10):
+        row = EntityRow("writer", f"1.2.3.{i}", "0", "host", "app", PARTICIPANT, f"topic{i:04}")
+        row.values["sent_bytes"] = 1
+        rows.append(row)
+    lines = renderOpenMetrics(rows, {}).split("\n")
+
+    samples = [line for line in lines if line.startswith("cyclonedds_insight_sent_bytes_total{")]
+    assert len(samples) == MAX_LABEL_SETS
+    assert 'cyclonedds_insight_sent_bytes_total{domain="other",host="other",process="other",topic="other"} 11' in samples
+    # label values are escaped
+    row = EntityRow("writer", "1.2.3.1", "0", "host", "a \"b\"\\c", PARTICIPANT, "t")
+    row.values["sent_bytes"] = 1
+    assert 'process="a \\"b\\"\\\\c"' in renderOpenMetrics([row], {})
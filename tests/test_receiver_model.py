@@ -0,0 +1,97 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from cyclonedds.idl import IdlStruct
+import pytest
+
+from dds_access.received_sample import ReceivedSample
+from models.listener import receiver_model
+from models.listener.receiver_model import ReceiverModel
+from models.listener.receiver_proxy_model import ReceiverProxyModel
+
+
+@dataclass
+class Msg(IdlStruct, typename="test::Msg"):
+    id: int
+
+
+def samples(readerId: str, count: int):
+    return [ReceivedSample(readerId, 0.0, Msg, Msg(i).serialize()) for i in range(count)]
+
+
+@pytest.fixture
+def model():
+    model = ReceiverModel(100, "")
+    yield model
+    model.shutdown()
+
+
+def test_reader_indexes_are_reused(model):
+    # the indexes are bound by the readers with samples left, not by all
+    # readers seen
+    for i in range(200):
+        model.append(f"reader{i}", samples(f"reader{i}", 10))
+    assert model.rowCount() == 100
+    assert len(model._readerIds) <= 11
+    assert sorted(model.readerIds()) == sorted(f"reader{i}" for i in range(190, 200))
+    assert model.readerIdAt(model.firstSequence()) == "reader190"
+    assert model.readerIdAt(model.firstSequence() + 99) == "reader199"
+
+
+def test_reader_runs_after_reuse(model):
+    model.addReceivedMsgs("a", samples("a", 60))
+    model.addReceivedMsgs("b", samples("b", 60))
+    model.addReceivedMsgs("c", samples("c", 60))
+    # the samples of a are gone, c took its index
+    assert sorted(model.readerIds()) == ["b", "c"]
+    assert list(model.readerRuns("c")) == [(120, 180)]
+    assert model.readerIdAt(model.firstSequence()) == "b"
+    assert model.readerIdAt(179) == "c"
+
+
+def test_clear_forgets_the_readers(model):
+    model.addReceivedMsgs("a", samples("a", 10))
+    model.clear()
+    assert model.readerIds() == []
+    model.addReceivedMsgs("b", samples("b", 10))
+    assert model.readerIdAt(0) == "b"
+
+
+@pytest.fixture
+def spillModel(tmp_path):
+    model = ReceiverModel(100, str(tmp_path))
+    yield model
+    model.shutdown()
+
+
+def test_spilled_runs_are_trimmed(spillModel, monkeypatch):
+    monkeypatch.setattr(receiver_model, "TRIM_RUNS", 8)
+    # a run per append, all but the last 100 samples are spilled
+    for i in range(200):
+        readerId = "a" if i % 2 == 0 else "b"
+        spillModel.append(readerId, samples(readerId, 2))
+    assert spillModel.rowCount() == 400
+    assert len(spillModel._runStarts) <= 60
+    assert all(len(ends) <= 34 for ends in spillModel._readerRunEnds)
+
+    assert spillModel.readerIdAt(0) == "a"
+    assert spillModel.readerIdAt(2) == "b"
+    assert spillModel.readerIdAt(399) == "b"
+    assert list(spillModel.readerRuns("a")) == [(seq, seq + 2) for seq in range(0, 400, 4)]
+    assert list(spillModel.readerRuns("b")) == [(seq, seq + 2) for seq in range(2, 400, 4)]
+
+    proxy = ReceiverProxyModel()
+    proxy.setSourceModel(spillModel)
+    proxy.showReaderId("a", False)
+    assert proxy.rowCount() == 200
+    assert proxy.mapToSource(proxy.index(0, 0)).row() == 2
@@ -0,0 +1,87 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from cyclonedds.core import InstanceState, SampleState, ViewState
+from cyclonedds.idl import IdlStruct
+from cyclonedds.idl.annotations import key
+from cyclonedds.internal import SampleInfo
+
+from dds_access.received_sample import ReceivedSample
+from models.recording_model import RecorderThread, ReplayThread
+from utils.recording import Recording, RecordingWriter
+from utils.spill_store import SpillStore
+
+
+@dataclass
+class Msg(IdlStruct, typename="test::Msg"):
+    id: int
+    key("id")
+    text: str
+
+
+GUID = "6e0f1ae0-3ce7-4c55-9ea4-1a2b3c4d5e6f"
+DISPOSED = SampleInfo(SampleState.NotRead, ViewState.Old, InstanceState.NotAliveDisposed, False,
+                      1700000000123456789, 42, 7, 1, 0, 0, 0, 1)
+
+
+def recorded(readerId: str):
+    return [
+        ReceivedSample(readerId, 10.5, Msg, Msg(1, "one").serialize(), None, 10.25, GUID),
+        ReceivedSample(readerId, 11.5, Msg, Msg.serialize_key(Msg(1, "")), DISPOSED, 11.25, GUID)
+    ]
+
+
+def test_recording_keeps_invalid_samples(tmp_path):
+    path = str(tmp_path / "test.insightrec")
+    writer = RecordingWriter(path)
+    topicId = writer.addTopic(0, "Msgs", "test::Msg", Msg)
+    writer.append(topicId, recorded("r"))
+    writer.close()
+
+    recording = Recording(path)
+    samples = [sample for (_, sample) in recording.samples()]
+    recording.close()
+    # the type is built again from the recorded type information
+    assert samples[0].info is None
+    assert (samples[0].decode().id, samples[0].decode().text) == (1, "one")
+    assert samples[1].info == DISPOSED
+    assert samples[1].decode().key_sample.id == 1
+    assert (samples[1].timestamp, samples[1].sourceTimestamp, samples[1].writerGuid) == (11.5, 11.25, GUID)
+
+
+def test_spill_store_keeps_invalid_samples(tmp_path):
+    store = SpillStore(str(tmp_path))
+    store.append(recorded("r"))
+    assert store.get(0).decode() == Msg(1, "one")
+    assert store.get(1).info == DISPOSED
+    assert store.get(1).decode().key_sample.id == 1
+    store.close()
+
+
+def test_stop_right_after_start(tmp_path):
+    path = str(tmp_path / "test.insightrec")
+    recorder = RecorderThread(path)
+    recorder.start()
+    recorder.stop()
+    assert recorder.wait(5000)
+
+    # a replay as fast as possible of a recording which takes longer
+    writer = RecordingWriter(path)
+    topicId = writer.addTopic(0, "Msgs", "test::Msg", Msg)
+    for _ in range(20000):
+        writer.append(topicId, recorded("r"))
+    writer.close()
+    replay = ReplayThread(path, 0.0, False)
+    replay.start()
+    replay.stop()
+    assert replay.wait(5000)
@@ -0,0 +1,47 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from cyclonedds.idl import IdlStruct
+import pytest
+
+from utils.sample_filter import compileFilter
+
+
+@dataclass
+class Msg(IdlStruct, typename="test::Msg"):
+    id: int
+    text: str
+
+
+def data(id: int, text: str = "") -> bytes:
+    return Msg(id, text).serialize()
+
+
+def test_spellings():
+    sampleFilter = compileFilter("id > 2 && (text = 'a' || text <> 'b')")
+    assert sampleFilter.matches(Msg, data(3, "a"), True)
+    assert not sampleFilter.matches(Msg, data(1, "a"), True)
+    assert not sampleFilter.matches(Msg, data(3, "b"), True)
+    assert compileFilter("  ") is None
+    with pytest.raises(ValueError):
+        compileFilter("id >")
+
+
+def test_copy_counts_on_its_own():
+    sampleFilter = compileFilter("id < 10")
+    copy = sampleFilter.copy()
+    assert copy.text == sampleFilter.text
+    copy.matches(Msg, data(1), True)
+    copy.matches(Msg, data(11), True)
+    assert (copy.passed, copy.dropped) == (1, 1)
+    assert (sampleFilter.passed, sampleFilter.dropped) == (0, 0)
@@ -0,0 +1,140 @@
+"""
+ * Copyright(c) 2024 Sven Trittler
+ *
+ * This program and the accompanying materials are made available under the
+ * terms of the Eclipse Public License v. 2.0 which is available at
+ * http://www.eclipse.org/legal/epl-2.0, or the Eclipse Distribution License
+ * v. 1.0 which is available at
+ * http://www.eclipse.org/org/documents/edl-v10.php.
+ *
+ * SPDX-License-Identifier: EPL-2.0 OR BSD-3-Clause
+"""
+
+from dataclasses import dataclass
+from PySide6.QtCore import QCoreApplication, QEventLoop, Qt, QTimer
+from cyclonedds.core import Policy, Qos
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.idl import IdlStruct
+from cyclonedds.pub import DataWriter, Publisher
+from cyclonedds.sub import DataReader
+from cyclonedds.topic import Topic
+from cyclonedds.util import duration
+import threading
+import time
+
+from dds_access.datatypes.entity_type import EntityType
+from dds_access.dispatcher import DispatcherThread
+from dds_access.writer_executor import WriterExecutor, MAX_PENDING
+
+
+DOMAIN_ID = 47
+
+
+@dataclass
+class Msg(IdlStruct, typename="test::Msg"):
+    id: int
+
+
+def test_flood_is_bounded():
+    participant = DomainParticipant(DOMAIN_ID)
+    publisher = Publisher(participant)
+    writer = DataWriter(publisher, Topic(participant, "flood", Msg))
+
+    executor = WriterExecutor(DOMAIN_ID)
+    executor.addWriter("w1", publisher, writer, "flood")
+    executor.addWriter("w2", publisher, writer, "flood")
+    # flooded before the executor runs, the writer adds are queued as well
+    accepted = sum(executor.write("w1", Msg(i)) for i in range(MAX_PENDING + 500))
+    assert accepted == MAX_PENDING - 2
+    assert executor.depth() == MAX_PENDING
+    # deleting a writer still goes through
+    executor.deleteWriter("w1")
+    assert executor.depth() == MAX_PENDING + 1
+
+    executor.start()
+    deadline = time.monotonic() + 30.0
+    while executor.depth() > 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # once there is room, writes are queued again
+    assert executor.write("w2", Msg(0))
+    executor.stop()
+    executor.wait()
+
+    stats = executor.stats()
+    assert stats["executed"] == MAX_PENDING - 1
+    assert stats["dropped"] == 502
+    assert stats["maxDepth"] == MAX_PENDING + 1
+    del writer, publisher, participant
+
+
+def spin(ms: int):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def test_flood_both_directions():
+    # a reader of the dispatcher is flooded while the tester floods writes,
+    # neither direction may stall the other
+    app = QCoreApplication.instance() or QCoreApplication([])
+    qos = Qos(Policy.Reliability.Reliable(duration(seconds=1)), Policy.History.KeepAll)
+    dispatcher = DispatcherThread("r1", DOMAIN_ID, "flood_in", Msg, (None, qos, Qos(), qos), EntityType.READER)
+    received = [0]
+    dispatcher.onData.connect(lambda _id, samples: received.__setitem__(0, received[0] + len(samples)), Qt.ConnectionType.QueuedConnection)
+    dispatcher.start()
+    while not dispatcher.isSetUpDone():
+        time.sleep(0.01)
+    dispatcher.addEndpoint("w1", "flood_out", Msg, (None, qos, Qos(), qos), EntityType.WRITER)
+
+    participant = DomainParticipant(DOMAIN_ID)
+    inWriter = DataWriter(participant, Topic(participant, "flood_in", Msg), qos=qos)
+    outReader = DataReader(participant, Topic(participant, "flood_out", Msg), qos=qos)
+    spin(1000) # matched
+
+    flooding = threading.Event()
+    flooding.set()
+
+    def flood():
+        i = 0
+        while flooding.is_set():
+            inWriter.write(Msg(i))
+            i += 1
+
+    flooder = threading.Thread(target=flood)
+    flooder.start()
+    # per second of the flood: samples delivered by the reader and taken
+    # from the writer of the dispatcher
+    delivered = []
+    written = 0
+    taken = 0
+    for _ in range(3):
+        (receivedBefore, takenBefore) = (received[0], taken)
+        end = time.monotonic() + 1.0
+        while time.monotonic() < end:
+            # the events are handled every 10 ms, as the gui would
+            tick = time.monotonic() + 0.01
+            while time.monotonic() < tick:
+                if dispatcher.writerExecutor.depth() < MAX_PENDING // 2:
+                    dispatcher.write("w1", Msg(written))
+                    written += 1
+                else:
+                    time.sleep(0.001)
+            taken += len(outReader.take(N=10000))
+            spin(0)
+        delivered.append((received[0] - receivedBefore, taken - takenBefore))
+    flooding.clear()
+    flooder.join()
+
+    # the queued writes still go out
+    deadline = time.monotonic() + 10.0
+    while taken < written and time.monotonic() < deadline:
+        taken += len(outReader.take(N=10000))
+        spin(10)
+    dispatcher.stop()
+    dispatcher.wait()
+
+    for (samplesIn, samplesOut) in delivered:
+        assert samplesIn >= 1000 and samplesOut >= 1000, delivered
+    assert taken == written
+    assert dispatcher.writerExecutor.stats()["dropped"] == 0
+    del inWriter, outReader, participant